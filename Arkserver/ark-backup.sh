@@ -109,11 +109,12 @@ if [[ "$TYPE" == "fast" ]]; then
 
     # Rotation: garder 200 snapshots
     cd "$DEST" || exit 2
-    SNAPSHOTS=$(ls -1dt 20* 2>/dev/null | wc -l)
+    # Tri par nom (horodaté) : rsync -a conserve le mtime de Saved
+    SNAPSHOTS=$(ls -1d 20* 2>/dev/null | wc -l)
     if [[ $SNAPSHOTS -gt 200 ]]; then
         OLD_COUNT=$((SNAPSHOTS - 200))
         echo "[$(date +'%F %T')] [Backup] Rotation: suppression de $OLD_COUNT ancien(s) snapshot(s)."
-        ls -1dt 20* | tail -n +201 | xargs -r rm -rf
+        ls -1dr 20* | tail -n +201 | xargs -r rm -rf
     fi
 
     echo "[$(date +'%F %T')] [Backup] Backup fast terminé avec succès ($SNAPSHOTS snapshots total)."
@@ -13,6 +13,7 @@ LOG_DIR="${ARK_ROOT}/logs"
 CORE_LOG="${LOG_DIR}/core.log"
 UPDATE_CHECK="${CORE_DIR}/ark-update-check.sh"
 MODS_CHECK="${CORE_DIR}/ark-mods.sh"
+PREFLIGHT="${ARK_ROOT}/manager/preflight.py"
 
 mkdir -p "$LOG_DIR" "$CONFIG_DIR" "$CORE_DIR"
 
@@ -35,10 +36,23 @@ fi
 MAP_NAME=$(tr -d '[:space:]' < "$CURRENT_MAP_FILE")
 
 # Validation filesystem de la map
-MAP_DIR1="${ARK_ROOT}/ShooterGame/Content/Maps/${MAP_NAME}"
-MAP_DIR2="${ARK_ROOT}/ShooterGame/Content/Maps/${MAP_NAME}SubMaps"
+MAPS_DIR="${ARK_ROOT}/ShooterGame/Content/Maps"
+MAP_DIR1="${MAPS_DIR}/${MAP_NAME}"
+MAP_DIR2="${MAPS_DIR}/${MAP_NAME}SubMaps"
+MAP_INDEX="${CONFIG_DIR}/map_index"
+
+# Index écrit par le manager Python (source<TAB>nom), utilisé s'il est plus récent que Content/Maps
+# (modmap = niveau persistant fourni par un mod)
+MAP_FOUND=0
+if [ -f "$MAP_INDEX" ] && [ "$MAP_INDEX" -nt "$MAPS_DIR" ]; then
+    if awk -F'\t' -v map="$MAP_NAME" '($1 == "maps" || $1 == "submaps" || $1 == "modmap") && $2 == map { found = 1 } END { exit !found }' "$MAP_INDEX"; then
+        MAP_FOUND=1
+    fi
+elif [ -d "$MAP_DIR1" ] || [ -d "$MAP_DIR2" ]; then
+    MAP_FOUND=1
+fi
 
-if [ ! -d "$MAP_DIR1" ] && [ ! -d "$MAP_DIR2" ]; then
+if [ "$MAP_FOUND" -eq 0 ]; then
     echo "[$(date +'%F %T')] [Core] ERREUR: dossier de map introuvable pour '${MAP_NAME}'."
     echo "[$(date +'%F %T')] [Core] Map non valide. Le serveur ne sera pas lancé."
     exit 2
@@ -60,13 +74,16 @@ if [ "$CHECK_RC" -ne 0 ]; then
     exit 1
 fi
 
-# one-shot mods check
+# one-shot mods check (cache d'empreintes, ark-mods.sh en secours)
 echo "[$(date +'%F %T')] [Core] Vérification des mods (one-shot)..."
-if [ -x "$MODS_CHECK" ]; then
-    "$MODS_CHECK" --check
-    MODS_RC=$?
+if [ -f "$PREFLIGHT" ] && command -v python3 >/dev/null; then
+    MODS_RC=0
+    python3 "$PREFLIGHT" --mods || MODS_RC=$?
+elif [ -x "$MODS_CHECK" ]; then
+    MODS_RC=0
+    "$MODS_CHECK" --check || MODS_RC=$?
 else
-    echo "[$(date +'%F %T')] [Core] ark-mods.sh introuvable, on considère OK."
+    echo "[$(date +'%F %T')] [Core] preflight.py et ark-mods.sh introuvables, on considère OK."
     MODS_RC=0
 fi
 
@@ -77,6 +94,23 @@ elif [ "$MODS_RC" -eq 1 ]; then
     echo "[$(date +'%F %T')] [Core] Avertissement mods détecté, mais on continue le démarrage."
 fi
 
+# one-shot validation de la configuration (schéma typé, quelques ms)
+echo "[$(date +'%F %T')] [Core] Validation de la configuration (one-shot)..."
+if [ -f "$PREFLIGHT" ] && command -v python3 >/dev/null; then
+    PREFLIGHT_RC=0
+    python3 "$PREFLIGHT" || PREFLIGHT_RC=$?
+else
+    echo "[$(date +'%F %T')] [Core] preflight.py introuvable, on considère OK."
+    PREFLIGHT_RC=0
+fi
+
+if [ "$PREFLIGHT_RC" -eq 2 ]; then
+    echo "[$(date +'%F %T')] [Core] Configuration invalide. Le serveur NE SERA PAS lancé. (exit $PREFLIGHT_RC)"
+    exit 2
+elif [ "$PREFLIGHT_RC" -eq 1 ]; then
+    echo "[$(date +'%F %T')] [Core] Avertissements de configuration, mais on continue le démarrage."
+fi
+
 # protection anti-double-instance (strict)
 if pgrep -f "/ShooterGame/Binaries/Linux/ShooterGameServer" >/dev/null; then
     echo "[$(date +'%F %T')] [Core] ARK déjà en cours d'exécution. Arrêt."
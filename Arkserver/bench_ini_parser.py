@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark du parser INI ARK
+Mesure le coût d'insertions massives de nouvelles clés (set_value)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import tracemalloc
+
+# Ajouter le chemin du manager
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'manager'))
+
+from utils.ini_parser import ArkINIParser
+
+FILE_LINES = 100_000
+SECTIONS = 100
+INSERTS = 10_000
+LEGACY_INSERTS = 200  # l'ancien algorithme est extrapolé à partir d'un échantillon
+OVERRIDE_ENTRIES = 5_000
+MEMORY_LINES = 200_000  # fichier d'overrides de plusieurs Mo pour la mesure mémoire
+
+
+def generate_ini(path: str) -> None:
+    """Génère un fichier INI de FILE_LINES lignes réparties en SECTIONS sections"""
+    lines_per_section = FILE_LINES // SECTIONS - 1
+    with open(path, 'w', encoding='utf-8') as f:
+        for sec in range(SECTIONS):
+            f.write(f"[Section{sec}]\n")
+            for idx in range(lines_per_section):
+                f.write(f"ConfigOverrideKey{idx}=(Value={idx})\n")
+
+
+def legacy_inserts(lines: list, sections: dict, count: int) -> None:
+    """Reproduit l'ancien stockage : list.insert + réindexation de toutes les sections"""
+    for n in range(count):
+        section = f"Section{n % SECTIONS}"
+        insert_idx = sections[section][-1] + 1
+        lines.insert(insert_idx, f"NewKey{n}=1\n")
+        for name, indices in sections.items():
+            sections[name] = [idx + 1 if idx >= insert_idx else idx for idx in indices]
+        sections[section].append(insert_idx)
+
+
+def measure_memory(path: str, compact: bool) -> tuple:
+    """
+    Mesure la mémoire retenue par un parser après read()
+    
+    Returns:
+        (octets retenus par le parser, durée de read() en secondes)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    parser = ArkINIParser(path, compact=compact)
+    parser.read()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parser
+    return retained, elapsed
+
+
+def main() -> None:
+    print("=" * 60)
+    print(f"  BENCHMARK: {INSERTS} insertions dans un fichier de {FILE_LINES} lignes")
+    print("=" * 60)
+    print()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        generate_ini(ini_path)
+        
+        parser = ArkINIParser(ini_path)
+        
+        start = time.perf_counter()
+        parser.read()
+        read_time = time.perf_counter() - start
+        
+        # Stockage par blocs : insertions réparties sur toutes les sections
+        start = time.perf_counter()
+        for n in range(INSERTS):
+            parser.set_value(f"Section{n % SECTIONS}", f"NewKey{n}", "1")
+        insert_time = time.perf_counter() - start
+        
+        assert parser.get_value("Section0", "NewKey0") == "1"
+        assert len(parser.lines) == FILE_LINES + INSERTS
+        
+        # Mode lazy : repérage des en-têtes puis décodage d'une seule section
+        lazy_parser = ArkINIParser(ini_path, lazy=True)
+        start = time.perf_counter()
+        lazy_parser.read()
+        lazy_parser.get_value("Section0", "ConfigOverrideKey0")
+        lazy_time = time.perf_counter() - start
+        lazy_parser.close()
+        
+        # Régénération complète d'une liste d'overrides répétés
+        parser.set_all_values("Section1", "OverrideEngramEntries",
+                              [f"(EngramIndex={n})" for n in range(OVERRIDE_ENTRIES)])
+        start = time.perf_counter()
+        parser.set_all_values("Section1", "OverrideEngramEntries",
+                              [f"(EngramIndex={n},EngramHidden=True)" for n in range(OVERRIDE_ENTRIES)])
+        replace_time = time.perf_counter() - start
+        assert len(parser.get_all_values("Section1", "OverrideEngramEntries")) == OVERRIDE_ENTRIES
+        
+        # Ancien stockage (liste à plat), sur un échantillon
+        parser.read()
+        legacy_lines = parser.lines
+        legacy_sections = parser.sections
+        start = time.perf_counter()
+        legacy_inserts(legacy_lines, legacy_sections, LEGACY_INSERTS)
+        legacy_time = time.perf_counter() - start
+        legacy_estimate = legacy_time / LEGACY_INSERTS * INSERTS
+        
+        # Mémoire : liste de str par ligne vs buffer d'octets + offsets
+        overrides_path = os.path.join(tmp_dir, 'Overrides.ini')
+        with open(overrides_path, 'w', encoding='utf-8') as f:
+            f.write("[/script/shootergame.shootergamemode]\n")
+            for idx in range(MEMORY_LINES):
+                f.write(f'ConfigOverrideItemMaxQuantity=(ItemClassString="PrimalItem_{idx}_C",'
+                        f'Quantity=(MaxItemQuantity={idx},bIgnoreMultiplier=true))\n')
+        file_size = os.path.getsize(overrides_path)
+        list_memory, list_time = measure_memory(overrides_path, compact=False)
+        compact_memory, compact_time = measure_memory(overrides_path, compact=True)
+    
+    print(f"Lecture (read)              : {read_time * 1000:8.1f} ms")
+    print(f"Lecture lazy + 1 section    : {lazy_time * 1000:8.1f} ms")
+    print(f"Insertions (blocs)          : {insert_time * 1000:8.1f} ms "
+          f"({insert_time / INSERTS * 1e6:.2f} µs/insertion)")
+    print(f"Insertions (liste à plat)   : {legacy_estimate * 1000:8.1f} ms "
+          f"(extrapolé depuis {LEGACY_INSERTS} insertions)")
+    print(f"set_all_values ({OVERRIDE_ENTRIES} entrées) : {replace_time * 1000:8.1f} ms")
+    print()
+    print(f"Mémoire pour {MEMORY_LINES} lignes d'overrides ({file_size / 1e6:.1f} Mo sur disque) :")
+    print(f"  Liste de str (défaut)     : {list_memory / 1e6:8.1f} Mo  (read: {list_time * 1000:.0f} ms)")
+    print(f"  Buffer + offsets (compact): {compact_memory / 1e6:8.1f} Mo  (read: {compact_time * 1000:.0f} ms)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
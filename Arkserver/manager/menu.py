@@ -18,7 +18,9 @@ from modules.updates import UpdateManager
 from modules.diagnostics import DiagnosticsManager
 from modules.config.maps import MapsManager
 from modules.config.mods import ModsManager
+from modules.config.profiles import ProfilesManager
 from modules.config.settings import SettingsManager
+from modules.config.snapshot import config_operation
 
 
 class ArkServerMenu:
@@ -39,6 +41,10 @@ class ArkServerMenu:
         self.maps_manager = MapsManager()
         self.mods_manager = ModsManager()
         self.settings_manager = SettingsManager()
+        self.profiles_manager = ProfilesManager()
+        
+        # Index des cartes de mods mis à jour en arrière-plan pendant l'utilisation du menu
+        self.maps_manager.refresh_mod_maps()
         
     def clear_screen(self) -> None:
         """Efface l'écran du terminal"""
@@ -339,6 +345,7 @@ class ArkServerMenu:
             "2": "Modifier paramètres serveur",
             "3": "Gérer les mods (ajouter/supprimer)",
             "4": "Afficher configuration actuelle",
+            "5": "Appliquer un profil de paramètres",
             "b": "Retour"
         }
         
@@ -357,6 +364,9 @@ class ArkServerMenu:
         elif choice == "4":
             self._submenu_show_config()
             
+        elif choice == "5":
+            self._submenu_profiles()
+            
         elif choice == "b":
             self.menu_stack.pop()
             return
@@ -458,6 +468,53 @@ class ArkServerMenu:
         
         self.pause()
     
+    def _submenu_profiles(self) -> None:
+        """Sous-menu profils de paramètres (aperçu puis application)"""
+        print("")
+        result = self.profiles_manager.list_profiles()
+        
+        if not result["profiles"]:
+            print(f"❌ Aucun profil dans {paths.PROFILES_DIR}")
+            if result["error"]:
+                print(f"   Erreur: {result['error']}")
+            self.pause()
+            return
+        
+        print("Profils disponibles:")
+        for name in result["profiles"]:
+            print(f"  • {name}")
+        print("")
+        print("Entrez le nom du profil ou 'q' pour annuler")
+        name = input("\nProfil: ").strip()
+        
+        if name.lower() == 'q':
+            return
+        
+        if name not in result["profiles"]:
+            print(f"\n❌ Profil inconnu: {name}")
+            self.pause()
+            return
+        
+        print("")
+        print(self.profiles_manager.preview_profile(name))
+        print("")
+        confirm = input(f"⚠️  Appliquer le profil {name} ? (o/N): ").strip().lower()
+        
+        if confirm == 'o':
+            result = self.profiles_manager.apply_profile(name)
+            print("")
+            if result["success"]:
+                print(f"✅ {result['message']}")
+                print("⚠️  Redémarrez le serveur pour appliquer les changements")
+            else:
+                print(f"❌ {result['message']}")
+                if result["error"]:
+                    print(f"   Erreur: {result['error']}")
+        else:
+            print("\n❌ Application annulée")
+        
+        self.pause()
+    
     def _submenu_manage_mods(self) -> None:
         """Sous-menu gestion des mods"""
         while True:
@@ -525,13 +582,22 @@ class ArkServerMenu:
                 if result["success"]:
                     print(f"✅ Mods installés: {len(result['installed'])}")
                     for mod in result['installed']:
-                        print(f"   • {mod['name']} ({mod['id']})")
+                        warning = f" ⚠️  {', '.join(mod['issues'])}" if mod['issues'] else ""
+                        print(f"   • {mod['name']} ({mod['id']}){warning}")
                     
                     if result['missing']:
                         print(f"\n⚠️  Mods manquants: {len(result['missing'])}")
                         for mod in result['missing']:
                             print(f"   • {mod['name']} ({mod['id']})")
                         print("\n💡 Utilisez 'Mettre à jour les mods' pour les installer")
+                    
+                    if result['corrupt']:
+                        print(f"\n❌ Mods corrompus: {len(result['corrupt'])}")
+                        for mod in result['corrupt']:
+                            print(f"   • {mod['name']} ({mod['id']}): {', '.join(mod['issues'])}")
+                    
+                    if result['orphaned']:
+                        print(f"\nℹ️  Mods téléchargés mais non listés: {', '.join(result['orphaned'])}")
                 else:
                     print(f"❌ Erreur: {result['error']}")
                 
@@ -542,6 +608,14 @@ class ArkServerMenu:
     
     def _submenu_show_config(self) -> None:
         """Affiche la configuration complète"""
+        # Un seul chargement des fichiers de configuration pour tout l'écran
+        with config_operation(parallel=True):
+            self._print_config()
+        
+        self.pause()
+    
+    def _print_config(self) -> None:
+        """Affiche la configuration complète (appelé dans config_operation)"""
         print("")
         
         # Carte actuelle
@@ -580,8 +654,6 @@ class ArkServerMenu:
         
         print("")
         print("═" * 60)
-        
-        self.pause()
     
     def menu_diagnostics(self) -> None:
         """Menu diagnostics"""
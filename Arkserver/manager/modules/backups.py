@@ -12,6 +12,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import paths
+from utils.snapshots import latest_snapshot, snapshot_usage
 
 
 class BackupManager:
@@ -93,6 +94,10 @@ class BackupManager:
             
         Returns:
             Dict avec success, backups (dict), error
+            Les snapshots rsync (dossiers, backups fast) sont listés avec les
+            archives : size est leur taille apparente, incremental_size les octets
+            qui ne sont partagés avec aucun snapshot plus ancien. total_size
+            compte une seule fois les fichiers liés (espace disque réel).
         """
         backups_info = {}
         
@@ -109,13 +114,16 @@ class BackupManager:
                     "count": 0,
                     "files": [],
                     "total_size": 0,
+                    "apparent_size": 0,
                     "error": "Dossier inexistant"
                 }
                 continue
             
             try:
                 files = []
+                snapshots = []
                 total_size = 0
+                apparent_size = 0
                 
                 for entry in os.scandir(backup_dir):
                     if entry.is_file():
@@ -124,9 +132,33 @@ class BackupManager:
                             "name": entry.name,
                             "size": stat.st_size,
                             "mtime": datetime.fromtimestamp(stat.st_mtime),
-                            "path": entry.path
+                            "path": entry.path,
+                            "snapshot": False
                         })
                         total_size += stat.st_size
+                        apparent_size += stat.st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        snapshots.append(entry.path)
+                
+                if snapshots:
+                    # Noms horodatés : ordre alphabétique = ordre chronologique
+                    snapshots.sort()
+                    latest = latest_snapshot(backup_dir)
+                    # Plus récent que "latest" : rsync encore en cours
+                    in_progress = [path for path in snapshots if latest is not None and path > latest]
+                    usages, unique_size = snapshot_usage(snapshots, in_progress)
+                    for usage in usages:
+                        files.append({
+                            "name": os.path.basename(usage.path),
+                            "size": usage.apparent_size,
+                            "mtime": datetime.fromtimestamp(usage.created),
+                            "path": usage.path,
+                            "snapshot": True,
+                            "files": usage.files,
+                            "incremental_size": usage.incremental_size
+                        })
+                        apparent_size += usage.apparent_size
+                    total_size += unique_size
                 
                 # Trier par date (plus récent en premier)
                 files.sort(key=lambda x: x["mtime"], reverse=True)
@@ -135,6 +167,7 @@ class BackupManager:
                     "count": len(files),
                     "files": files,
                     "total_size": total_size,
+                    "apparent_size": apparent_size,
                     "error": None
                 }
                 
@@ -143,6 +176,7 @@ class BackupManager:
                     "count": 0,
                     "files": [],
                     "total_size": 0,
+                    "apparent_size": 0,
                     "error": str(e)
                 }
         
@@ -177,6 +211,9 @@ class BackupManager:
             output.append(f"📦 {btype.upper()}")
             output.append(f"   Nombre: {info['count']}")
             output.append(f"   Taille totale: {self.format_size(info['total_size'])}")
+            if info['apparent_size'] != info['total_size']:
+                # Snapshots à liens physiques : fichiers communs comptés une fois
+                output.append(f"   Taille apparente: {self.format_size(info['apparent_size'])}")
             
             if info['error']:
                 output.append(f"   ⚠️  Erreur: {info['error']}")
@@ -220,6 +257,9 @@ class BackupManager:
             for idx, file_info in enumerate(info['files'][:limit], 1):
                 output.append(f"[{idx}] {file_info['name']}")
                 output.append(f"    Taille: {self.format_size(file_info['size'])}")
+                if file_info['snapshot']:
+                    output.append(f"    Nouveaux octets: {self.format_size(file_info['incremental_size'])}"
+                                  f" ({file_info['files']} fichier(s))")
                 output.append(f"    Date: {file_info['mtime'].strftime('%Y-%m-%d %H:%M:%S')}")
                 output.append("")
             
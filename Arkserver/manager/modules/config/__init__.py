@@ -2,10 +2,12 @@
 
 from .maps import MapsManager
 from .mods import ModsManager
+from .profiles import ProfilesManager
 from .settings import SettingsManager
 
 __all__ = [
     "MapsManager",
     "ModsManager",
+    "ProfilesManager",
     "SettingsManager"
 ]
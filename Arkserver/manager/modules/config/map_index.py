@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Index des cartes installées
+Un os.scandir de Content/Maps, Content et Content/Mods, réutilisé tant que
+le mtime de ces dossiers n'a pas changé. L'index est aussi écrit dans
+config/map_index pour la validation de la carte par ark-core.sh.
+Les cartes fournies par les mods (.umap de niveau persistant) sont indexées
+à part, en tâche de fond, et l'index est conservé sur disque
+"""
+
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils import paths
+from utils.arkmod import read_mod_info
+from utils.fileio import atomic_write
+from utils.parse_cache import PARSE_CACHE, file_signature
+
+SUBMAPS_SUFFIX = "SubMaps"
+UMAP_SUFFIX = ".umap"
+# Suffixe des niveaux persistants ARK (ex: Valguero_P.umap), les autres .umap sont des sous-niveaux
+PERSISTENT_SUFFIX = "_P"
+
+# Dernier index construit : (signatures des dossiers, index)
+_last: Optional[Tuple[Tuple, 'MapIndex']] = None
+_last_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class MapIndex:
+    """Entrées des dossiers de cartes (immuable)"""
+    
+    maps: FrozenSet[str]        # Content/Maps/<nom>
+    submaps: FrozenSet[str]     # Content/Maps/<nom>SubMaps (nom sans le suffixe)
+    content: FrozenSet[str]     # Content/<nom>
+    mods: FrozenSet[str]        # Content/Mods/<nom>
+    
+    @property
+    def names(self) -> FrozenSet[str]:
+        """Tous les noms de carte acceptés par MapsManager.is_valid_map"""
+        return self.maps | self.submaps | self.content | self.mods
+    
+    def __contains__(self, map_name: str) -> bool:
+        return (map_name in self.maps or map_name in self.submaps
+                or map_name in self.content or map_name in self.mods)
+
+
+def _directories() -> Tuple[str, str, str]:
+    return (os.path.join(paths.CONTENT_DIR, "Maps"), paths.CONTENT_DIR, paths.MODS_DIR)
+
+
+def _signature(directory: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(directory)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def _scan(directory: str) -> FrozenSet[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
+def _write_index_file(index: MapIndex) -> None:
+    """
+    Écrit config/map_index pour ark-core.sh (lignes "source<TAB>nom")
+    
+    Meilleur effort : ark-core.sh revient à ses propres tests si le fichier
+    est absent ou plus ancien que Content/Maps.
+    """
+    lines = ["# Index des cartes (généré par le manager, lu par ark-core.sh)\n"]
+    for source, names in (("maps", index.maps), ("submaps", index.submaps),
+                          ("content", index.content), ("mods", index.mods),
+                          ("modmap", load_mod_maps_index().names())):
+        lines.extend(f"{source}\t{name}\n" for name in sorted(names))
+    
+    if not os.path.isdir(os.path.dirname(paths.MAP_INDEX_FILE)):
+        return
+    try:
+        atomic_write(paths.MAP_INDEX_FILE, "".join(lines))
+    except OSError:
+        pass
+
+
+def load_map_index() -> MapIndex:
+    """
+    Retourne l'index des cartes, reconstruit seulement si un des dossiers a changé
+    
+    Returns:
+        Index immuable (partagé)
+    """
+    global _last
+    
+    directories = _directories()
+    signatures = tuple((directory, _signature(directory)) for directory in directories)
+    
+    with _last_lock:
+        if _last is not None and _last[0] == signatures:
+            return _last[1]
+    
+    maps_dir, content_dir, mods_dir = directories
+    maps_entries = _scan(maps_dir)
+    index = MapIndex(
+        maps=maps_entries,
+        submaps=frozenset(name[:-len(SUBMAPS_SUFFIX)] for name in maps_entries
+                          if name.endswith(SUBMAPS_SUFFIX) and len(name) > len(SUBMAPS_SUFFIX)),
+        content=_scan(content_dir),
+        mods=_scan(mods_dir)
+    )
+    
+    with _last_lock:
+        _last = (signatures, index)
+    
+    _write_index_file(index)
+    return index
+
+
+@dataclass(frozen=True)
+class ModMap:
+    """Carte fournie par un mod"""
+    
+    name: str       # nom du niveau persistant (argument de carte du serveur)
+    mod_id: str
+    size: int       # taille du .umap en octets
+    path: str       # chemin relatif à Content/Mods
+
+
+class ModMapsIndex:
+    """
+    Niveaux persistants (.umap) des mods installés dans Content/Mods, persistés en JSON
+    
+    Pour chaque dossier parcouru, l'index garde son mtime, ses .umap et ses
+    sous-dossiers : un dossier dont le mtime n'a pas changé n'est pas relu.
+    Un .umap est retenu si son nom se termine par _P ou s'il fait partie des
+    cartes déclarées dans le mod.info du mod.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: Fichier JSON de l'index
+        """
+        self.file_path = file_path
+        self._mods: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'ModMapsIndex':
+        """
+        Charge l'index (vide si absent ou corrompu)
+        
+        Args:
+            file_path: Fichier JSON de l'index
+        
+        Returns:
+            Index
+        """
+        index = cls(file_path)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                index._mods = json.load(f).get("mods", {})
+        except (FileNotFoundError, ValueError, AttributeError):
+            pass
+        return index
+    
+    def maps(self) -> List[ModMap]:
+        """
+        Cartes connues, sans parcourir le disque
+        
+        Returns:
+            Liste de ModMap triée par nom
+        """
+        with self._lock:
+            mods = self._mods
+        found = [
+            ModMap(name, mod_id, size, path)
+            for mod_id, entry in mods.items()
+            for name, size, path in entry["maps"]
+        ]
+        return sorted(found, key=lambda mod_map: (mod_map.name.lower(), mod_map.mod_id))
+    
+    def names(self) -> FrozenSet[str]:
+        """Noms des cartes connues"""
+        return frozenset(mod_map.name for mod_map in self.maps())
+    
+    def _walk(self, path: str, rel: str, old: Dict[str, Any], new: Dict[str, Any],
+              umaps: List[Tuple[str, int, str]]) -> None:
+        """Collecte les .umap d'un dossier et de ses sous-dossiers (dossiers inchangés non relus)"""
+        st = os.stat(path)
+        cached = old.get(rel)
+        
+        if cached is not None and cached["mtime_ns"] == st.st_mtime_ns:
+            files, dirs = cached["umaps"], cached["dirs"]
+        else:
+            files = []
+            dirs = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.name.endswith(UMAP_SUFFIX) and entry.is_file():
+                        files.append([entry.name, entry.stat().st_size])
+            files.sort()
+            dirs.sort()
+        
+        new[rel] = {"mtime_ns": st.st_mtime_ns, "umaps": files, "dirs": dirs}
+        for name, size in files:
+            umaps.append((name[:-len(UMAP_SUFFIX)], size, f"{rel}/{name}" if rel else name))
+        for name in dirs:
+            try:
+                self._walk(os.path.join(path, name), f"{rel}/{name}" if rel else name, old, new, umaps)
+            except FileNotFoundError:
+                # Supprimé pendant le parcours
+                pass
+    
+    def _declared_maps(self, mod_dir: str, previous: Optional[Dict[str, Any]]) -> Tuple[Any, List[str]]:
+        """Cartes du mod.info (relu seulement si sa signature a changé)"""
+        mod_info = os.path.join(mod_dir, "mod.info")
+        signature = file_signature(mod_info)
+        signature = list(signature) if signature else None
+        if previous is not None and previous.get("mod_info") == signature:
+            return signature, previous["declared"]
+        try:
+            with open(mod_info, 'rb') as f:
+                return signature, read_mod_info(f.read())[1]
+        except (OSError, ValueError):
+            return signature, []
+    
+    def refresh(self) -> bool:
+        """
+        Met à jour l'index depuis Content/Mods (dossiers modifiés seulement) et le sauvegarde
+        
+        Returns:
+            True si l'index a changé
+        """
+        with self._lock:
+            current = self._mods
+        
+        try:
+            with os.scandir(paths.MODS_DIR) as entries:
+                mod_dirs = {entry.name: entry.path for entry in entries
+                            if entry.name.isdigit() and entry.is_dir()}
+        except FileNotFoundError:
+            mod_dirs = {}
+        
+        updated = {}
+        for mod_id, mod_dir in mod_dirs.items():
+            previous = current.get(mod_id)
+            tree: Dict[str, Any] = {}
+            umaps: List[Tuple[str, int, str]] = []
+            try:
+                self._walk(mod_dir, "", previous["dirs"] if previous else {}, tree, umaps)
+            except FileNotFoundError:
+                continue
+            mod_info, declared = self._declared_maps(mod_dir, previous)
+            
+            maps = [
+                [name, size, f"{mod_id}/{path}"] for name, size, path in umaps
+                if name.endswith(PERSISTENT_SUFFIX) or name in declared
+            ]
+            updated[mod_id] = {"mod_info": mod_info, "declared": declared, "dirs": tree, "maps": maps}
+        
+        if updated == current:
+            return False
+        
+        with self._lock:
+            self._mods = updated
+        
+        if os.path.isdir(os.path.dirname(os.path.abspath(self.file_path))):
+            atomic_write(self.file_path, json.dumps({"mods": updated}, separators=(',', ':')))
+            PARSE_CACHE.revalidate(self.file_path, self)
+        
+        # Les cartes de mods font partie du fichier lu par ark-core.sh
+        _write_index_file(load_map_index())
+        return True
+
+
+def load_mod_maps_index() -> ModMapsIndex:
+    """
+    Retourne l'index partagé des cartes de mods, tel que sauvegardé (sans parcours)
+    
+    Returns:
+        Index partagé (appeler refresh() pour le mettre à jour)
+    """
+    return PARSE_CACHE.get(paths.MOD_MAPS_INDEX, ModMapsIndex.from_file)
+
+
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def refresh_mod_maps(background: bool = True) -> Optional[threading.Thread]:
+    """
+    Met à jour l'index des cartes de mods
+    
+    Args:
+        background: Lancer le parcours dans un thread (un seul à la fois)
+    
+    Returns:
+        Le thread d'indexation en arrière-plan, ou None si exécuté immédiatement
+    """
+    global _refresh_thread
+    
+    if not background:
+        with _refresh_lock:
+            thread = _refresh_thread
+        if thread is not None:
+            thread.join()
+        load_mod_maps_index().refresh()
+        return None
+    
+    with _refresh_lock:
+        if _refresh_thread is None or not _refresh_thread.is_alive():
+            _refresh_thread = threading.Thread(
+                target=lambda: load_mod_maps_index().refresh(),
+                name="mod-maps-indexer",
+                daemon=True
+            )
+            _refresh_thread.start()
+        return _refresh_thread
@@ -5,11 +5,22 @@ Changement de carte, liste des maps disponibles
 """
 
 import os
-from typing import Dict, List
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import paths
+from modules.config.map_index import load_map_index, load_mod_maps_index, refresh_mod_maps
+from modules.config.snapshot import pinned_snapshot
+from modules.config.mods import load_mods_registry
+from modules.config.save_stats import load_save_stats
+from utils.prewarm import prewarm
+
+# Fichiers lus par le serveur au chargement d'une carte et des mods
+PREWARM_EXTENSIONS = (".umap", ".uasset", ".ubulk")
 
 
 class MapsManager:
@@ -39,11 +50,19 @@ class MapsManager:
     
     def get_current_map(self) -> Dict[str, any]:
         """
-        Récupère la carte actuellement configurée
+        Récupère la carte actuellement configurée (ou celle de l'instantané de l'opération en cours)
         
         Returns:
             Dict avec: success, map_name, error
         """
+        snapshot = pinned_snapshot()
+        if snapshot is not None and snapshot.loaded("current_map"):
+            return {
+                "success": True,
+                "map_name": snapshot.map_name,
+                "error": None
+            }
+        
         if not os.path.exists(paths.CURRENT_MAP_FILE):
             return {
                 "success": False,
@@ -89,6 +108,9 @@ class MapsManager:
             with open(paths.CURRENT_MAP_FILE, 'w') as f:
                 f.write(map_name)
             
+            # Précharger la nouvelle carte pendant que l'utilisateur continue
+            self.prewarm_assets(map_name, background=True)
+            
             return {
                 "success": True,
                 "message": f"Carte changée pour: {map_name}",
@@ -105,48 +127,57 @@ class MapsManager:
         """
         Vérifie si une carte est valide (existe dans le système de fichiers)
         
+        Recherche dans l'index des dossiers de cartes (rescanné seulement si
+        un des dossiers a changé).
+        
         Args:
             map_name: Nom de la carte
             
         Returns:
             True si la carte existe, False sinon
         """
-        # Vérifier dans Content/Maps/
-        map_dir1 = os.path.join(paths.CONTENT_DIR, "Maps", map_name)
-        # Vérifier dans Content/Maps/{MapName}SubMaps/
-        map_dir2 = os.path.join(paths.CONTENT_DIR, "Maps", f"{map_name}SubMaps")
-        # Vérifier directement dans Content/ (pour certaines maps)
-        map_dir3 = os.path.join(paths.CONTENT_DIR, map_name)
-        # Vérifier dans Content/Mods/ (maps communautaires intégrées)
-        map_dir4 = os.path.join(paths.MODS_DIR, map_name)
-        
-        return (os.path.exists(map_dir1) or 
-                os.path.exists(map_dir2) or 
-                os.path.exists(map_dir3) or
-                os.path.exists(map_dir4))
+        # Content/Maps/{MapName}, Content/Maps/{MapName}SubMaps, Content/{MapName}
+        # ou Content/Mods/{MapName} (maps communautaires intégrées)
+        if map_name in load_map_index():
+            return True
+        # Niveau persistant fourni par un mod installé
+        return map_name in load_mod_maps_index().names()
     
     def get_available_maps(self) -> Dict[str, any]:
         """
         Liste toutes les cartes disponibles (installées sur le serveur)
         
+        Les cartes de mods proviennent de l'index sauvegardé (voir refresh_mod_maps).
+        
         Returns:
             Dict avec: success, maps (dict par catégorie), error
+            La catégorie "mods" contient en plus: mod_id, size
         """
         available = {
             "base": [],
             "dlc_paid": [],
-            "free_expansion": []
+            "free_expansion": [],
+            "mods": []
         }
         
-        # Vérifier chaque carte officielle
+        # Vérifier chaque carte officielle dans un seul index
+        index = load_map_index()
         for category, maps in self.OFFICIAL_MAPS.items():
             for map_name, description in maps.items():
-                if self.is_valid_map(map_name):
+                if map_name in index:
                     available[category].append({
                         "name": map_name,
                         "description": description
                     })
         
+        for mod_map in load_mod_maps_index().maps():
+            available["mods"].append({
+                "name": mod_map.name,
+                "description": f"Mod {mod_map.mod_id} ({mod_map.size / 1024 / 1024:.0f} Mo)",
+                "mod_id": mod_map.mod_id,
+                "size": mod_map.size
+            })
+        
         return {
             "success": True,
             "maps": available,
@@ -201,6 +232,26 @@ class MapsManager:
                 output.append(f"     {map_info['description']}")
             output.append("")
         
+        # Cartes fournies par les mods
+        if maps["mods"]:
+            output.append("🧩 CARTES DE MODS")
+            for map_info in maps["mods"]:
+                current = " ⭐" if current_result["success"] and current_result["map_name"] == map_info["name"] else ""
+                output.append(f"   • {map_info['name']}{current}")
+                output.append(f"     {map_info['description']}")
+            output.append("")
+        
+        # Sauvegardes existantes (taille, joueurs, dernier enregistrement)
+        saves = self.get_save_stats()
+        if saves["success"] and saves["stats"]:
+            output.append("💾 SAUVEGARDES")
+            for stats in saves["stats"]:
+                output.append(f"   • {stats['name']} ({stats['directory']}): {stats['ark_size'] / 1024 / 1024:.1f} Mo, "
+                              f"{stats['profiles']} profil(s), {stats['tribes']} tribu(s)")
+                output.append(f"     Dernière sauvegarde: {stats['last_save'].strftime('%Y-%m-%d %H:%M:%S')}"
+                              f" - {stats['backups']} copie(s) ({stats['backups_size'] / 1024 / 1024:.1f} Mo)")
+            output.append("")
+        
         output.append("⭐ = Carte actuellement configurée")
         output.append("")
         output.append("═" * 60)
@@ -219,3 +270,141 @@ class MapsManager:
                 all_names.append(map_info["name"])
         
         return all_names
+    
+    def get_save_stats(self) -> Dict[str, any]:
+        """
+        Statistiques des sauvegardes par carte (Saved/SavedArks et dossiers alternatifs)
+        
+        Un seul parcours par dossier de sauvegarde, refait seulement si son
+        mtime a changé : reste rapide avec des dizaines de milliers de profils.
+        
+        Returns:
+            Dict avec: success, stats (liste de dict: name, directory, ark_size,
+            last_save (datetime), profiles, tribes, backups, backups_size), error
+        """
+        try:
+            stats = load_save_stats()
+        except OSError as e:
+            return {
+                "success": False,
+                "stats": [],
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            "stats": [
+                dict(asdict(map_stats), last_save=datetime.fromtimestamp(map_stats.last_save))
+                for map_stats in stats
+            ],
+            "error": None
+        }
+
+    def refresh_mod_maps(self, background: bool = True) -> Dict[str, any]:
+        """
+        Met à jour l'index des cartes fournies par les mods
+        
+        Seuls les dossiers de Content/Mods modifiés depuis le dernier passage
+        sont relus ; l'index est sauvegardé sur disque.
+        
+        Args:
+            background: Indexer dans un thread (le menu reste utilisable)
+        
+        Returns:
+            Dict avec: success, message, error
+        """
+        try:
+            refresh_mod_maps(background)
+        except OSError as e:
+            return {
+                "success": False,
+                "message": "Échec de l'indexation des cartes de mods",
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            "message": "Indexation des cartes de mods lancée" if background else "Index des cartes de mods à jour",
+            "error": None
+        }
+
+    def _asset_files(self, map_name: str) -> Iterator[str]:
+        """Fichiers de la carte puis des mods actifs, par ordre de priorité"""
+        maps_dir = os.path.join(paths.CONTENT_DIR, "Maps")
+        roots = [
+            os.path.join(maps_dir, map_name),
+            os.path.join(maps_dir, f"{map_name}SubMaps"),
+            os.path.join(paths.CONTENT_DIR, map_name),
+            os.path.join(paths.MODS_DIR, map_name)
+        ]
+        # Carte fournie par un mod : son dossier passe avant les autres mods
+        roots.extend(os.path.join(paths.MODS_DIR, mod_map.mod_id)
+                     for mod_map in load_mod_maps_index().maps() if mod_map.name == map_name)
+        roots.extend(os.path.join(paths.MODS_DIR, mod_id) for mod_id in load_mods_registry().ids())
+        
+        for root in dict.fromkeys(roots):
+            for directory, _, files in os.walk(root):
+                for name in sorted(files):
+                    if name.endswith(PREWARM_EXTENSIONS):
+                        yield os.path.join(directory, name)
+    
+    def prewarm_assets(self, map_name: Optional[str] = None, budget_mb: Optional[int] = None,
+                       max_workers: int = 8, background: bool = False) -> Dict[str, any]:
+        """
+        Précharge dans le cache de pages les fichiers de la carte et des mods actifs
+        
+        Réduit les lectures disque au démarrage du serveur (après un redémarrage
+        de la machine ou un changement de carte). Les fichiers déjà en mémoire
+        ne sont pas redemandés.
+        
+        Args:
+            map_name: Carte à précharger (None = carte configurée)
+            budget_mb: Mémoire à utiliser au maximum (None = moitié de la mémoire disponible)
+            max_workers: Nombre de fichiers traités en parallèle
+            background: Précharger dans un thread (report vaut alors None)
+        
+        Returns:
+            Dict avec: success, message, report (voir utils.prewarm.prewarm), error
+        """
+        if map_name is None:
+            current = self.get_current_map()
+            if not current["success"]:
+                return {
+                    "success": False,
+                    "message": "Aucune carte à précharger",
+                    "report": None,
+                    "error": current["error"]
+                }
+            map_name = current["map_name"]
+        
+        budget = budget_mb * 1024 * 1024 if budget_mb is not None else None
+        
+        def run() -> Dict[str, any]:
+            return prewarm(self._asset_files(map_name), budget, max_workers)
+        
+        if background:
+            threading.Thread(target=run, name="assets-prewarm", daemon=True).start()
+            return {
+                "success": True,
+                "message": f"Préchargement de {map_name} lancé",
+                "report": None,
+                "error": None
+            }
+        
+        try:
+            report = run()
+        except OSError as e:
+            return {
+                "success": False,
+                "message": "Échec du préchargement",
+                "report": None,
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            "message": f"{report['files']} fichier(s) de {map_name}: "
+                       f"{report['bytes_requested'] // (1024 * 1024)} Mo demandés",
+            "report": report,
+            "error": None
+        }
@@ -5,11 +5,283 @@ Ajout, suppression, validation de mods.list
 """
 
 import os
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils import paths
+from utils.arkmod import DEFAULT_META, build_mod_file, read_mod_info, read_modmeta
+from utils.fileio import atomic_write, write_changed
+from utils.fingerprint import FingerprintCache, load_fingerprint_cache
+from utils.parse_cache import PARSE_CACHE, file_signature
+from utils.zarchive import extract_tree
+from modules.config.snapshot import parse_mods_list, pinned_snapshot
+
+
+class ModsRegistry:
+    """
+    mods.list en mémoire : mods indexés par ID, dans l'ordre du fichier
+    
+    Les IDs en double sont conservés à leur première occurrence et signalés
+    dans duplicates. Les opérations par lot modifient la mémoire ; save()
+    écrit le fichier en une seule écriture atomique.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: Chemin de mods.list
+        """
+        self.file_path = file_path
+        self._mods: Dict[str, Dict[str, any]] = {}
+        # ID -> numéros de ligne de toutes les occurrences (si plus d'une)
+        self.duplicates: Dict[str, List[int]] = {}
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'ModsRegistry':
+        """
+        Lit mods.list
+        
+        Args:
+            file_path: Chemin de mods.list
+            
+        Returns:
+            Registre (vide si le fichier est absent)
+        """
+        registry = cls(file_path)
+        try:
+            with open(file_path, 'r') as f:
+                mods = parse_mods_list(f)
+        except FileNotFoundError:
+            return registry
+        
+        for mod in mods:
+            existing = registry._mods.get(mod["id"])
+            if existing is None:
+                registry._mods[mod["id"]] = mod
+            else:
+                registry.duplicates.setdefault(mod["id"], [existing["line"]]).append(mod["line"])
+        
+        return registry
+    
+    def __len__(self) -> int:
+        return len(self._mods)
+    
+    def __contains__(self, mod_id: str) -> bool:
+        return mod_id in self._mods
+    
+    def get(self, mod_id: str) -> Optional[Dict[str, any]]:
+        """Retourne le mod (dict avec: id, name, line) ou None"""
+        return self._mods.get(mod_id)
+    
+    def ids(self) -> List[str]:
+        """IDs dans l'ordre de chargement"""
+        return list(self._mods)
+    
+    def mods(self) -> List[Dict[str, any]]:
+        """Mods dans l'ordre de chargement (copies)"""
+        return [dict(mod) for mod in self._mods.values()]
+    
+    def add_many(self, mods: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+        """
+        Ajoute des mods en fin de liste
+        
+        Args:
+            mods: Paires (id, nom)
+            
+        Returns:
+            (IDs ajoutés, IDs déjà présents ignorés)
+        """
+        added, skipped = [], []
+        for mod_id, mod_name in mods:
+            if mod_id in self._mods:
+                skipped.append(mod_id)
+                continue
+            self._mods[mod_id] = {"id": mod_id, "name": mod_name.strip(), "line": None}
+            added.append(mod_id)
+        return added, skipped
+    
+    def remove_many(self, mod_ids: Iterable[str]) -> Tuple[List[Dict[str, any]], List[str]]:
+        """
+        Supprime des mods
+        
+        Args:
+            mod_ids: IDs à supprimer
+            
+        Returns:
+            (mods supprimés, IDs introuvables)
+        """
+        removed, missing = [], []
+        for mod_id in mod_ids:
+            mod = self._mods.pop(mod_id, None)
+            if mod is None:
+                missing.append(mod_id)
+            else:
+                self.duplicates.pop(mod_id, None)
+                removed.append(mod)
+        return removed, missing
+    
+    def reorder(self, mod_ids: List[str]) -> List[str]:
+        """
+        Place des mods en tête de liste, dans l'ordre donné (ordre de chargement ARK)
+        
+        Les mods non cités gardent leur ordre relatif, après ceux-ci.
+        
+        Args:
+            mod_ids: IDs dans le nouvel ordre
+            
+        Returns:
+            IDs introuvables (ignorés)
+        """
+        missing = [mod_id for mod_id in mod_ids if mod_id not in self._mods]
+        first = [mod_id for mod_id in dict.fromkeys(mod_ids) if mod_id in self._mods]
+        placed = set(first)
+        rest = [mod_id for mod_id in self._mods if mod_id not in placed]
+        self._mods = {mod_id: self._mods[mod_id] for mod_id in first + rest}
+        return missing
+    
+    def save(self) -> None:
+        """Écrit mods.list (atomique, doublons supprimés) et met à jour le cache"""
+        atomic_write(self.file_path, "".join(f"{mod['id']}|{mod['name']}\n" for mod in self._mods.values()))
+        for line, mod in enumerate(self._mods.values(), 1):
+            mod["line"] = line
+        self.duplicates = {}
+        PARSE_CACHE.revalidate(self.file_path, self)
+
+
+def _content_dir(mod_path: str) -> str:
+    """SteamCMD place les fichiers dans WindowsNoEditor/ (ou directement à la racine)"""
+    content_path = os.path.join(mod_path, "WindowsNoEditor")
+    return content_path if os.path.isdir(content_path) else mod_path
+
+
+def _install_mod(mod_id: str, executor: ThreadPoolExecutor, fingerprints: FingerprintCache) -> Dict[str, any]:
+    """
+    Extrait un mod du workshop dans Content/Mods et génère son fichier .mod
+    
+    Args:
+        mod_id: ID du mod
+        executor: Pool de décompression partagé
+        fingerprints: Cache des empreintes (l'empreinte extraite y est enregistrée)
+    
+    Returns:
+        Dict avec: id, name, maps, extracted, copied, skipped, removed
+    
+    Raises:
+        OSError, ValueError: Mod absent, illisible ou corrompu
+    """
+    mod_path = os.path.join(paths.WORKSHOP_DIR, mod_id)
+    if not os.path.isdir(mod_path):
+        raise FileNotFoundError(f"absent du workshop: {mod_path}")
+    content_path = _content_dir(mod_path)
+    
+    try:
+        with open(os.path.join(content_path, "mod.info"), 'rb') as f:
+            name, maps = read_mod_info(f.read())
+    except FileNotFoundError:
+        raise ValueError("mod.info manquant")
+    try:
+        with open(os.path.join(content_path, "modmeta.info"), 'rb') as f:
+            meta = read_modmeta(f.read())
+    except FileNotFoundError:
+        meta = DEFAULT_META
+    
+    stats = extract_tree(content_path, os.path.join(paths.MODS_DIR, mod_id), executor)
+    write_changed(os.path.join(paths.MODS_DIR, f"{mod_id}.mod"), build_mod_file(mod_id, name, maps, meta))
+    
+    memo = dict(fingerprints.get_data(mod_id) or {})
+    memo["extracted"] = fingerprints.fingerprint(mod_id, mod_path)
+    fingerprints.set_data(mod_id, memo)
+    
+    return dict(stats, id=mod_id, name=name, maps=maps)
+
+
+def _validate_mod(mod: Dict[str, any], mod_path: str) -> Dict[str, any]:
+    """
+    Vérifie les fichiers d'un mod téléchargé (exécuté dans le pool de threads)
+    
+    Args:
+        mod: Dict avec id et name
+        mod_path: Dossier du mod dans le workshop
+        
+    Returns:
+        Copie de mod avec: path, corrupt (bool), issues (list)
+    """
+    issues = []
+    corrupt = False
+    
+    content_path = _content_dir(mod_path)
+    
+    sizes = {}
+    try:
+        with os.scandir(content_path) as entries:
+            for entry in entries:
+                if entry.name in ("mod.info", "modmeta.info") and entry.is_file():
+                    sizes[entry.name] = entry.stat().st_size
+    except OSError as e:
+        return dict(mod, path=mod_path, corrupt=True, issues=[f"dossier illisible: {e}"])
+    
+    if "mod.info" not in sizes:
+        issues.append("mod.info manquant")
+        corrupt = True
+    elif sizes["mod.info"] == 0:
+        issues.append("mod.info vide")
+        corrupt = True
+    
+    if "modmeta.info" not in sizes:
+        issues.append("modmeta.info manquant")
+    elif sizes["modmeta.info"] == 0:
+        issues.append("modmeta.info vide")
+    
+    # Fichier .mod généré à l'extraction dans ShooterGame/Content/Mods
+    try:
+        if os.stat(os.path.join(paths.MODS_DIR, f"{mod['id']}.mod")).st_size == 0:
+            issues.append(f"{mod['id']}.mod vide")
+    except FileNotFoundError:
+        issues.append(f"{mod['id']}.mod absent (mod non extrait)")
+    
+    return dict(mod, path=mod_path, corrupt=corrupt, issues=issues)
+
+
+def _check_mod(mod: Dict[str, any], mod_path: str, fingerprints: FingerprintCache) -> Dict[str, any]:
+    """
+    _validate_mod, sauté si l'empreinte du mod et le fichier .mod n'ont pas changé
+    
+    Args:
+        mod: Dict avec id et name
+        mod_path: Dossier du mod dans le workshop
+        fingerprints: Cache des empreintes et des validations
+    
+    Returns:
+        Copie de mod avec: path, corrupt (bool), issues (list), cached (bool)
+    """
+    digest = fingerprints.fingerprint(mod["id"], mod_path)
+    signature = file_signature(os.path.join(paths.MODS_DIR, f"{mod['id']}.mod"))
+    key = [digest, list(signature) if signature else None]
+    
+    memo = dict(fingerprints.get_data(mod["id"]) or {})
+    if memo.get("validated") == key:
+        result = dict(mod, path=mod_path, corrupt=memo["corrupt"], issues=list(memo["issues"]), cached=True)
+    else:
+        result = dict(_validate_mod(mod, mod_path), cached=False)
+        memo.update(validated=key, corrupt=result["corrupt"], issues=list(result["issues"]))
+        fingerprints.set_data(mod["id"], memo)
+    
+    if memo.get("extracted") and memo["extracted"] != digest:
+        result["issues"].append("modifié dans le workshop depuis l'extraction")
+    
+    return result
+
+
+def load_mods_registry() -> ModsRegistry:
+    """
+    Retourne le registre partagé de mods.list, relu seulement si le fichier a changé
+    
+    Returns:
+        Registre partagé (le modifier puis appeler save())
+    """
+    return PARSE_CACHE.get(paths.MODS_LIST, ModsRegistry.from_file)
 
 
 class ModsManager:
@@ -17,11 +289,24 @@ class ModsManager:
     
     def read_mods_list(self) -> Dict[str, any]:
         """
-        Lit le fichier mods.list
+        Lit le fichier mods.list (ou l'instantané de l'opération en cours)
+        
+        Un ID en double n'est retourné qu'une fois (voir find_duplicates).
         
         Returns:
             Dict avec: success, mods (list of dict), error
         """
+        snapshot = pinned_snapshot()
+        if snapshot is not None and snapshot.loaded("mods.list"):
+            mods = {}
+            for mod_id, name, line in snapshot.mods:
+                mods.setdefault(mod_id, {"id": mod_id, "name": name, "line": line})
+            return {
+                "success": True,
+                "mods": list(mods.values()),
+                "error": None
+            }
+        
         if not os.path.exists(paths.MODS_LIST):
             return {
                 "success": False,
@@ -29,35 +314,10 @@ class ModsManager:
                 "error": f"Fichier mods.list introuvable: {paths.MODS_LIST}"
             }
         
-        mods = []
         try:
-            with open(paths.MODS_LIST, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    
-                    # Ignorer lignes vides et commentaires
-                    if not line or line.startswith('#'):
-                        continue
-                    
-                    # Format attendu: MOD_ID|MOD_NAME
-                    if '|' not in line:
-                        continue
-                    
-                    parts = line.split('|', 1)
-                    if len(parts) == 2:
-                        mod_id = parts[0].strip()
-                        mod_name = parts[1].strip()
-                        
-                        if mod_id.isdigit():
-                            mods.append({
-                                "id": mod_id,
-                                "name": mod_name,
-                                "line": line_num
-                            })
-            
             return {
                 "success": True,
-                "mods": mods,
+                "mods": load_mods_registry().mods(),
                 "error": None
             }
         except Exception as e:
@@ -69,7 +329,7 @@ class ModsManager:
     
     def write_mods_list(self, mods: List[Dict[str, str]]) -> Dict[str, any]:
         """
-        Écrit le fichier mods.list
+        Écrit le fichier mods.list (écriture atomique)
         
         Args:
             mods: Liste de dict avec 'id' et 'name'
@@ -78,13 +338,13 @@ class ModsManager:
             Dict avec: success, message, error
         """
         try:
-            with open(paths.MODS_LIST, 'w') as f:
-                for mod in mods:
-                    f.write(f"{mod['id']}|{mod['name']}\n")
+            registry = ModsRegistry(paths.MODS_LIST)
+            registry.add_many((mod["id"], mod["name"]) for mod in mods)
+            registry.save()
             
             return {
                 "success": True,
-                "message": f"{len(mods)} mod(s) sauvegardé(s)",
+                "message": f"{len(registry)} mod(s) sauvegardé(s)",
                 "error": None
             }
         except Exception as e:
@@ -105,55 +365,81 @@ class ModsManager:
         Returns:
             Dict avec: success, message, error
         """
-        # Validation
-        if not mod_id.isdigit():
-            return {
-                "success": False,
-                "message": "ID de mod invalide (doit être numérique)",
-                "error": None
-            }
+        result = self.add_mods([(mod_id, mod_name)])
         
-        if not mod_name or not mod_name.strip():
+        if result["success"] and result["skipped"]:
+            mod = load_mods_registry().get(mod_id)
             return {
                 "success": False,
-                "message": "Nom de mod invalide (ne peut pas être vide)",
+                "message": f"Le mod {mod_id} existe déjà ({mod['name'] if mod else mod_id})",
                 "error": None
             }
+        if result["success"]:
+            result["message"] = f"Mod ajouté: {mod_name} ({mod_id})"
         
-        # Lire la liste actuelle
-        result = self.read_mods_list()
-        if not result["success"]:
-            return {
-                "success": False,
-                "message": "Impossible de lire mods.list",
-                "error": result["error"]
-            }
+        return {key: result[key] for key in ("success", "message", "error")}
+    
+    def add_mods(self, mods: List[Tuple[str, str]]) -> Dict[str, any]:
+        """
+        Ajoute plusieurs mods en une seule écriture
         
-        mods = result["mods"]
+        Tout ou rien : si un ID ou un nom est invalide, rien n'est ajouté.
         
-        # Vérifier si le mod existe déjà
-        for mod in mods:
-            if mod["id"] == mod_id:
+        Args:
+            mods: Paires (id, nom)
+            
+        Returns:
+            Dict avec: success, message, added (list), skipped (list, déjà présents), error
+        """
+        for mod_id, mod_name in mods:
+            if not mod_id.isdigit():
                 return {
                     "success": False,
-                    "message": f"Le mod {mod_id} existe déjà ({mod['name']})",
+                    "message": f"ID de mod invalide (doit être numérique): {mod_id}",
+                    "added": [],
+                    "skipped": [],
+                    "error": None
+                }
+            if not mod_name or not mod_name.strip():
+                return {
+                    "success": False,
+                    "message": f"Nom de mod invalide (ne peut pas être vide): {mod_id}",
+                    "added": [],
+                    "skipped": [],
                     "error": None
                 }
         
-        # Ajouter le nouveau mod
-        mods.append({"id": mod_id, "name": mod_name.strip()})
-        
-        # Sauvegarder
-        write_result = self.write_mods_list(mods)
+        if not os.path.exists(paths.MODS_LIST):
+            return {
+                "success": False,
+                "message": "Impossible de lire mods.list",
+                "added": [],
+                "skipped": [],
+                "error": f"Fichier mods.list introuvable: {paths.MODS_LIST}"
+            }
         
-        if write_result["success"]:
+        try:
+            registry = load_mods_registry()
+            added, skipped = registry.add_many(mods)
+            if added:
+                registry.save()
+            
             return {
                 "success": True,
-                "message": f"Mod ajouté: {mod_name} ({mod_id})",
+                "message": f"{len(added)} mod(s) ajouté(s), {len(skipped)} déjà présent(s)",
+                "added": added,
+                "skipped": skipped,
                 "error": None
             }
-        else:
-            return write_result
+        except Exception as e:
+            PARSE_CACHE.invalidate(paths.MODS_LIST)
+            return {
+                "success": False,
+                "message": "Échec de l'écriture de mods.list",
+                "added": [],
+                "skipped": [],
+                "error": str(e)
+            }
     
     def remove_mod(self, mod_id: str) -> Dict[str, any]:
         """
@@ -165,44 +451,110 @@ class ModsManager:
         Returns:
             Dict avec: success, message, error
         """
-        # Lire la liste actuelle
-        result = self.read_mods_list()
-        if not result["success"]:
+        result = self.remove_mods([mod_id])
+        
+        if result["success"] and result["missing"]:
             return {
                 "success": False,
-                "message": "Impossible de lire mods.list",
-                "error": result["error"]
+                "message": f"Mod {mod_id} introuvable dans la liste",
+                "error": None
             }
+        if result["success"]:
+            result["message"] = f"Mod supprimé: {result['removed'][0]['name']} ({mod_id})"
         
-        mods = result["mods"]
-        
-        # Trouver et supprimer le mod
-        mod_found = None
-        new_mods = []
-        for mod in mods:
-            if mod["id"] == mod_id:
-                mod_found = mod
-            else:
-                new_mods.append(mod)
+        return {key: result[key] for key in ("success", "message", "error")}
+    
+    def remove_mods(self, mod_ids: List[str]) -> Dict[str, any]:
+        """
+        Supprime plusieurs mods en une seule écriture
         
-        if not mod_found:
+        Args:
+            mod_ids: IDs à supprimer
+            
+        Returns:
+            Dict avec: success, message, removed (list de mods), missing (list d'IDs), error
+        """
+        if not os.path.exists(paths.MODS_LIST):
             return {
                 "success": False,
-                "message": f"Mod {mod_id} introuvable dans la liste",
+                "message": "Impossible de lire mods.list",
+                "removed": [],
+                "missing": list(mod_ids),
+                "error": f"Fichier mods.list introuvable: {paths.MODS_LIST}"
+            }
+        
+        try:
+            registry = load_mods_registry()
+            removed, missing = registry.remove_many(mod_ids)
+            if removed:
+                registry.save()
+            
+            return {
+                "success": True,
+                "message": f"{len(removed)} mod(s) supprimé(s)",
+                "removed": removed,
+                "missing": missing,
                 "error": None
             }
+        except Exception as e:
+            PARSE_CACHE.invalidate(paths.MODS_LIST)
+            return {
+                "success": False,
+                "message": "Échec de l'écriture de mods.list",
+                "removed": [],
+                "missing": [],
+                "error": str(e)
+            }
+    
+    def reorder_mods(self, mod_ids: List[str]) -> Dict[str, any]:
+        """
+        Change l'ordre de chargement des mods (une seule écriture)
         
-        # Sauvegarder
-        write_result = self.write_mods_list(new_mods)
+        Args:
+            mod_ids: IDs à placer en tête, dans l'ordre voulu
+            
+        Returns:
+            Dict avec: success, message, missing (list d'IDs inconnus), error
+        """
+        try:
+            registry = load_mods_registry()
+            missing = registry.reorder(mod_ids)
+            registry.save()
+            
+            return {
+                "success": True,
+                "message": f"Ordre des mods mis à jour ({len(registry)} mod(s))",
+                "missing": missing,
+                "error": None
+            }
+        except Exception as e:
+            PARSE_CACHE.invalidate(paths.MODS_LIST)
+            return {
+                "success": False,
+                "message": "Échec de l'écriture de mods.list",
+                "missing": [],
+                "error": str(e)
+            }
+    
+    def find_duplicates(self) -> Dict[str, any]:
+        """
+        Liste les IDs présents plusieurs fois dans mods.list
         
-        if write_result["success"]:
+        Returns:
+            Dict avec: success, duplicates ({id: [lignes]}), error
+        """
+        try:
             return {
                 "success": True,
-                "message": f"Mod supprimé: {mod_found['name']} ({mod_id})",
+                "duplicates": dict(load_mods_registry().duplicates),
                 "error": None
             }
-        else:
-            return write_result
+        except Exception as e:
+            return {
+                "success": False,
+                "duplicates": {},
+                "error": str(e)
+            }
     
     def format_mods_list(self) -> str:
         """Retourne une liste formatée des mods"""
@@ -230,16 +582,80 @@ class ModsManager:
                 output.append(f"    ID: {mod['id']}")
                 output.append("")
         
+        duplicates = self.find_duplicates()["duplicates"]
+        for mod_id, lines in duplicates.items():
+            output.append(f"⚠️  Mod {mod_id} en double (lignes {', '.join(map(str, lines))})")
+        if duplicates:
+            output.append("")
+        
         output.append("═" * 60)
         
         return "\n".join(output)
     
-    def check_installed_mods(self) -> Dict[str, any]:
+    def install_mods(self, mod_ids: Optional[List[str]] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, any]:
+        """
+        Extrait les mods téléchargés dans ShooterGame/Content/Mods
+        
+        Les blocs des archives .z sont décompressés en parallèle ; les fichiers
+        déjà à jour (taille et date) ne sont pas réécrits. Le fichier <id>.mod
+        est généré à partir de mod.info et modmeta.info.
+        
+        Args:
+            mod_ids: IDs des mods (None = tous ceux de mods.list)
+            max_workers: Threads de décompression (None = nombre de cœurs)
+        
+        Returns:
+            Dict avec: success, installed (list), failed (list de {id, error}), error
+            installed contient: id, name, maps, extracted, copied, skipped, removed
+        """
+        if mod_ids is None:
+            result = self.read_mods_list()
+            if not result["success"]:
+                return {
+                    "success": False,
+                    "installed": [],
+                    "failed": [],
+                    "error": result["error"]
+                }
+            mod_ids = [mod["id"] for mod in result["mods"]]
+        
+        installed = []
+        failed = []
+        fingerprints = load_fingerprint_cache(paths.MODS_FINGERPRINTS)
+        
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 4) as executor:
+            for mod_id in dict.fromkeys(mod_ids):
+                try:
+                    installed.append(_install_mod(mod_id, executor, fingerprints))
+                except (OSError, ValueError) as e:
+                    failed.append({"id": mod_id, "error": str(e)})
+        
+        fingerprints.save()
+        
+        return {
+            "success": not failed,
+            "installed": installed,
+            "failed": failed,
+            "error": "; ".join(f"{mod['id']}: {mod['error']}" for mod in failed) or None
+        }
+    
+    def check_installed_mods(self, max_workers: int = 8) -> Dict[str, any]:
         """
         Vérifie quels mods sont installés dans le workshop
         
+        Un seul os.scandir du dossier workshop, croisé avec mods.list, puis
+        vérification des fichiers de chaque mod (mod.info, modmeta.info, .mod)
+        dans un pool de threads. La vérification d'un mod est reprise du cache
+        tant que l'empreinte de son dossier et son fichier .mod sont inchangés.
+        
+        Args:
+            max_workers: Nombre de threads de vérification
+        
         Returns:
-            Dict avec: success, installed (list), missing (list), error
+            Dict avec: success, installed (list), missing (list), corrupt (list), orphaned (list), error
+            installed et corrupt contiennent en plus: path, issues (list), cached (bool)
+            orphaned contient les IDs présents dans le workshop mais absents de mods.list
         """
         result = self.read_mods_list()
         if not result["success"]:
@@ -247,22 +663,51 @@ class ModsManager:
                 "success": False,
                 "installed": [],
                 "missing": [],
+                "corrupt": [],
+                "orphaned": [],
                 "error": result["error"]
             }
         
+        mods = result["mods"]
+        
+        try:
+            with os.scandir(paths.WORKSHOP_DIR) as entries:
+                downloaded = {
+                    entry.name: entry.path for entry in entries
+                    if entry.name.isdigit() and entry.is_dir()
+                }
+        except FileNotFoundError:
+            downloaded = {}
+        
+        listed = {mod["id"] for mod in mods}
+        present = [mod for mod in mods if mod["id"] in downloaded]
+        missing = [mod for mod in mods if mod["id"] not in downloaded]
+        orphaned = sorted(downloaded.keys() - listed, key=int)
+        
         installed = []
-        missing = []
+        corrupt = []
         
-        for mod in result["mods"]:
-            mod_path = os.path.join(paths.WORKSHOP_DIR, mod["id"])
-            if os.path.exists(mod_path) and os.path.isdir(mod_path):
-                installed.append(mod)
-            else:
-                missing.append(mod)
+        fingerprints = load_fingerprint_cache(paths.MODS_FINGERPRINTS)
+        for mod_id in fingerprints.keys():
+            if mod_id not in downloaded:
+                fingerprints.forget(mod_id)
+        
+        if present:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(present)))) as executor:
+                checked = list(executor.map(
+                    lambda mod: _check_mod(mod, downloaded[mod["id"]], fingerprints), present
+                ))
+            
+            for mod in checked:
+                (corrupt if mod["corrupt"] else installed).append(mod)
+        
+        fingerprints.save()
         
         return {
             "success": True,
             "installed": installed,
             "missing": missing,
+            "corrupt": corrupt,
+            "orphaned": orphaned,
             "error": None
         }
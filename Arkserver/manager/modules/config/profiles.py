@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Module de gestion des profils de paramètres ARK
+Profils nommés (ex: event, pvp, maintenance) appliqués sous forme de diff
+"""
+
+import os
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils import paths
+from utils.fileio import atomic_write
+from utils.ini_parser import iter_entries, load_ini
+from utils.parse_cache import file_signature
+from modules.config.schema import CONFIG_SCHEMA, GAME, GUS
+from modules.config.settings import SettingsManager
+
+PROFILE_NAME_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+class ProfilesManager:
+    """
+    Gestionnaire des profils de paramètres (CONFIG_DIR/profiles/<nom>.ini)
+    
+    Format d'un profil : sections préfixées par le fichier cible, une clé
+    répétée remplace toutes les occurrences (arrays ARK) :
+        
+        [GameUserSettings.ini:ServerSettings]
+        XPMultiplier=3.0
+        
+        [Game.ini:/script/shootergame.shootergamemode]
+        ConfigOverrideItemCraftingCosts=(...)
+        ConfigOverrideItemCraftingCosts=(...)
+    
+    Un profil est compilé en diff minimal contre les fichiers actuels (seules
+    les clés dont la valeur change), puis appliqué avec une seule écriture
+    par fichier. Le diff compilé est réutilisé tant que ni le profil ni les
+    fichiers cibles n'ont changé.
+    """
+    
+    def __init__(self):
+        # nom -> (signatures profil + fichiers cibles, diff compilé)
+        self._compiled: Dict[str, Tuple[Tuple, List[Dict[str, Any]]]] = {}
+    
+    @staticmethod
+    def _targets() -> Dict[str, str]:
+        """Fichiers modifiables par un profil : nom -> chemin"""
+        return {
+            GUS: paths.GAME_USER_SETTINGS_INI,
+            GAME: paths.GAME_INI,
+        }
+    
+    @staticmethod
+    def _profile_path(name: str) -> str:
+        return os.path.join(paths.PROFILES_DIR, f"{name}.ini")
+    
+    def list_profiles(self) -> Dict[str, any]:
+        """
+        Liste les profils disponibles
+        
+        Returns:
+            Dict avec: success, profiles (list), error
+        """
+        try:
+            names = sorted(
+                entry.name[:-4] for entry in os.scandir(paths.PROFILES_DIR)
+                if entry.is_file() and entry.name.endswith(".ini")
+            )
+        except FileNotFoundError:
+            names = []
+        except Exception as e:
+            return {
+                "success": False,
+                "profiles": [],
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            "profiles": names,
+            "error": None
+        }
+    
+    def read_profile(self, name: str) -> Dict[str, any]:
+        """
+        Lit un profil
+        
+        Args:
+            name: Nom du profil
+        
+        Returns:
+            Dict avec: success, settings ({fichier: {section: {clé: [valeurs]}}}), error
+        """
+        if not PROFILE_NAME_RE.match(name):
+            return {
+                "success": False,
+                "settings": {},
+                "error": f"Nom de profil invalide: {name}"
+            }
+        
+        profile_path = self._profile_path(name)
+        if not os.path.exists(profile_path):
+            return {
+                "success": False,
+                "settings": {},
+                "error": f"Profil introuvable: {name}"
+            }
+        
+        targets = self._targets()
+        settings: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+        
+        try:
+            for full_section, key, value, line_no in iter_entries(profile_path):
+                target, _, section = full_section.partition(":")
+                if target not in targets or not section:
+                    return {
+                        "success": False,
+                        "settings": {},
+                        "error": f"{name}.ini ligne {line_no}: section [{full_section}] invalide "
+                                 f"(attendu: [{GUS}:Section] ou [{GAME}:Section])"
+                    }
+                settings.setdefault(target, {}).setdefault(section, {}).setdefault(key, []).append(value)
+        except Exception as e:
+            return {
+                "success": False,
+                "settings": {},
+                "error": str(e)
+            }
+        
+        return {
+            "success": True,
+            "settings": settings,
+            "error": None
+        }
+    
+    def save_profile(self, name: str, settings: Dict[str, Dict[str, Dict[str, Any]]]) -> Dict[str, any]:
+        """
+        Crée ou remplace un profil
+        
+        Args:
+            name: Nom du profil
+            settings: {fichier: {section: {clé: valeur ou liste de valeurs}}}
+        
+        Returns:
+            Dict avec: success, message, error
+        """
+        if not PROFILE_NAME_RE.match(name):
+            return {
+                "success": False,
+                "message": f"Nom de profil invalide: {name}",
+                "error": "Nom invalide (lettres, chiffres, - et _ uniquement)"
+            }
+        
+        output = []
+        for target, sections in settings.items():
+            if target not in self._targets():
+                return {
+                    "success": False,
+                    "message": f"Fichier cible inconnu: {target}",
+                    "error": "Fichier cible inconnu"
+                }
+            for section, keys in sections.items():
+                output.append(f"[{target}:{section}]\n")
+                for key, values in keys.items():
+                    for value in (values if isinstance(values, list) else [values]):
+                        output.append(f"{key}={value}\n")
+                output.append("\n")
+        
+        try:
+            os.makedirs(paths.PROFILES_DIR, exist_ok=True)
+            atomic_write(self._profile_path(name), "".join(output))
+            self._compiled.pop(name, None)
+            
+            return {
+                "success": True,
+                "message": f"Profil sauvegardé: {name}",
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "message": "Échec de l'écriture du profil",
+                "error": str(e)
+            }
+    
+    def compile_profile(self, name: str) -> Dict[str, any]:
+        """
+        Compile un profil en diff minimal contre les fichiers actuels
+        
+        Args:
+            name: Nom du profil
+        
+        Returns:
+            Dict avec: success, changes (list), error
+            Chaque changement est un dict avec: file, section, key, before (list),
+            after (list), lines (numéros des lignes actuelles), new_section (bool)
+        """
+        targets = self._targets()
+        signature = (file_signature(self._profile_path(name)),) + tuple(
+            file_signature(path) for path in targets.values()
+        )
+        
+        cached = self._compiled.get(name)
+        if cached is not None and cached[0] == signature and signature[0] is not None:
+            return {
+                "success": True,
+                "changes": cached[1],
+                "error": None
+            }
+        
+        profile = self.read_profile(name)
+        if not profile["success"]:
+            return {
+                "success": False,
+                "changes": [],
+                "error": profile["error"]
+            }
+        
+        changes = []
+        
+        try:
+            for target, sections in profile["settings"].items():
+                parser = load_ini(targets[target])
+                existing_sections = set(parser.section_names())
+                file_changes = []
+                
+                for section, keys in sections.items():
+                    for key, values in keys.items():
+                        before = parser.get_all_values(section, key) if section in existing_sections else []
+                        if before == values:
+                            continue
+                        file_changes.append({
+                            "file": target,
+                            "section": section,
+                            "key": key,
+                            "before": before,
+                            "after": values,
+                            "lines": [],
+                            "new_section": section not in existing_sections
+                        })
+                
+                # Numéros de ligne des valeurs remplacées (une passe sur le fichier)
+                wanted = {(change["section"], change["key"]): change for change in file_changes if change["before"]}
+                if wanted:
+                    for section, key, _, line_no in iter_entries(targets[target]):
+                        change = wanted.get((section, key))
+                        if change is not None:
+                            change["lines"].append(line_no)
+                
+                changes.extend(file_changes)
+        except Exception as e:
+            return {
+                "success": False,
+                "changes": [],
+                "error": str(e)
+            }
+        
+        self._compiled[name] = (signature, changes)
+        
+        return {
+            "success": True,
+            "changes": changes,
+            "error": None
+        }
+    
+    def preview_profile(self, name: str) -> str:
+        """
+        Retourne l'aperçu (dry-run) des lignes modifiées par un profil
+        
+        Args:
+            name: Nom du profil
+        
+        Returns:
+            Diff formaté (- ligne actuelle / + nouvelle ligne)
+        """
+        result = self.compile_profile(name)
+        
+        output = []
+        output.append("═" * 60)
+        output.append(f"  APERÇU DU PROFIL: {name}")
+        output.append("═" * 60)
+        output.append("")
+        
+        if not result["success"]:
+            output.append(f"❌ Erreur: {result['error']}")
+            return "\n".join(output)
+        
+        if not result["changes"]:
+            output.append("✅ Aucun changement : la configuration correspond déjà au profil")
+            return "\n".join(output)
+        
+        current = None
+        for change in result["changes"]:
+            header = (change["file"], change["section"])
+            if header != current:
+                current = header
+                suffix = " (nouvelle section)" if change["new_section"] else ""
+                output.append(f"{change['file']} [{change['section']}]{suffix}")
+            
+            for line_no, value in zip(change["lines"], change["before"]):
+                output.append(f"  - L{line_no}: {change['key']}={value}")
+            for value in change["after"]:
+                output.append(f"  + {change['key']}={value}")
+        
+        output.append("")
+        output.append(f"{len(result['changes'])} clé(s) modifiée(s)")
+        
+        return "\n".join(output)
+    
+    def apply_profile(self, name: str, dry_run: bool = False) -> Dict[str, any]:
+        """
+        Applique un profil : une seule écriture par fichier modifié
+        
+        Tout ou rien : les valeurs sont validées par le schéma de configuration
+        avant toute écriture, et l'état précédent est enregistré dans l'historique
+        des révisions. Les fichiers sont écrits l'un après l'autre : si l'un d'eux
+        échoue, ceux déjà écrits sont restaurés depuis cette révision
+        (SettingsManager.restore_backup pour annuler un profil appliqué).
+        
+        Args:
+            name: Nom du profil
+            dry_run: Ne rien écrire, retourner uniquement les changements
+        
+        Returns:
+            Dict avec: success, message, changes (list), error
+        """
+        result = self.compile_profile(name)
+        if not result["success"]:
+            return {
+                "success": False,
+                "message": f"Impossible de compiler le profil {name}",
+                "changes": [],
+                "error": result["error"]
+            }
+        
+        changes = result["changes"]
+        
+        for change in changes:
+            for value in change["after"]:
+                error = CONFIG_SCHEMA.check_value(change["file"], change["section"], change["key"], value)
+                if error:
+                    return {
+                        "success": False,
+                        "message": f"Profil {name} refusé: {error}",
+                        "changes": changes,
+                        "error": "Valeur invalide"
+                    }
+        
+        if dry_run or not changes:
+            return {
+                "success": True,
+                "message": f"{len(changes)} clé(s) à modifier" if dry_run else "Aucun changement nécessaire",
+                "changes": changes,
+                "error": None
+            }
+        
+        targets = self._targets()
+        by_file: Dict[str, List[Dict[str, Any]]] = {}
+        for change in changes:
+            by_file.setdefault(change["file"], []).append(change)
+        
+        store = SettingsManager.revision_store()
+        written = []
+        try:
+            # Révision de l'état actuel : le profil peut être annulé avec restore_backup
+            revision = store.save(f"avant profil {name}")
+            
+            for target, file_changes in by_file.items():
+                parser = load_ini(targets[target])
+                with parser.transaction(reload=False):
+                    for change in file_changes:
+                        if change["new_section"]:
+                            parser.add_section(change["section"])
+                        parser.set_all_values(change["section"], change["key"], change["after"])
+                written.append(target)
+        except Exception as e:
+            if not written:
+                message = f"Échec de l'application du profil {name}"
+            else:
+                # Pas de profil à moitié appliqué : retour à l'état enregistré
+                try:
+                    store.restore(revision["id"], written)
+                    message = f"Échec de l'application du profil {name} (restaurés: {', '.join(written)})"
+                except Exception as restore_error:
+                    message = (f"Échec de l'application du profil {name}, restauration impossible de "
+                               f"{', '.join(written)} (révision {revision['id']}): {restore_error}")
+            self._compiled.pop(name, None)
+            return {
+                "success": False,
+                "message": message,
+                "changes": changes,
+                "error": str(e)
+            }
+        
+        self._compiled.pop(name, None)
+        
+        return {
+            "success": True,
+            "message": f"Profil {name} appliqué: {len(changes)} clé(s) dans {len(written)} fichier(s)",
+            "changes": changes,
+            "error": None
+        }
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Statistiques des sauvegardes par carte
+Un os.scandir par dossier de sauvegarde (SavedArks ou AltSaveDirectoryName),
+comptage à la volée sans liste de fichiers, résultat réutilisé tant que le
+mtime du dossier n'a pas changé
+"""
+
+import os
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils import paths
+
+ARK_SUFFIX = ".ark"
+PROFILE_SUFFIX = ".arkprofile"
+TRIBE_SUFFIX = ".arktribe"
+
+# Copies horodatées écrites par le serveur : <Carte>_18.10.2026_12.00.00.ark
+BACKUP_RE = re.compile(r'^(.+)_\d{2}\.\d{2}\.\d{4}_\d{2}\.\d{2}\.\d{2}\.ark$')
+
+# Dossiers de Saved qui ne contiennent pas de sauvegardes
+IGNORED_DIRS: FrozenSet[str] = frozenset({"Config", "Logs"})
+
+
+@dataclass(frozen=True)
+class MapSaveStats:
+    """Sauvegarde d'une carte (immuable)"""
+    
+    name: str
+    directory: str          # dossier relatif à Saved (SavedArks par défaut)
+    ark_size: int           # taille de <Carte>.ark (0 si seules des copies existent)
+    last_save: float        # mtime de <Carte>.ark (ou de la copie la plus récente)
+    profiles: int           # .arkprofile du dossier (partagés par ses cartes)
+    tribes: int             # .arktribe du dossier
+    backups: int            # copies horodatées de la carte
+    backups_size: int
+
+
+# Par dossier : (ino, mtime_ns) -> statistiques de ses cartes
+_dirs: Dict[str, Tuple[Tuple[int, int], Tuple[MapSaveStats, ...]]] = {}
+# Sous-dossiers de Saved : ((chemin, ino, mtime_ns), noms)
+_saved_entries: Optional[Tuple[Tuple, Tuple[str, ...]]] = None
+_lock = threading.Lock()
+
+
+def _signature(directory: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(directory)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def _scan_save_dir(path: str, directory: str) -> Tuple[MapSaveStats, ...]:
+    """Parcourt un dossier de sauvegarde en un seul passage"""
+    profiles = 0
+    tribes = 0
+    # Carte -> [taille, mtime, copies, taille des copies, mtime des copies]
+    maps: Dict[str, List] = {}
+    
+    with os.scandir(path) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.endswith(PROFILE_SUFFIX):
+                profiles += 1
+            elif name.endswith(TRIBE_SUFFIX):
+                tribes += 1
+            elif name.endswith(ARK_SUFFIX):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                match = BACKUP_RE.match(name)
+                map_name = match.group(1) if match else name[:-len(ARK_SUFFIX)]
+                counters = maps.setdefault(map_name, [0, 0.0, 0, 0, 0.0])
+                if match:
+                    counters[2] += 1
+                    counters[3] += st.st_size
+                    counters[4] = max(counters[4], st.st_mtime)
+                else:
+                    counters[0] = st.st_size
+                    counters[1] = st.st_mtime
+    
+    return tuple(
+        MapSaveStats(map_name, directory, size, mtime or backup_mtime, profiles, tribes, count, backups_size)
+        for map_name, (size, mtime, count, backups_size, backup_mtime) in sorted(maps.items())
+    )
+
+
+def load_save_stats() -> List[MapSaveStats]:
+    """
+    Statistiques des sauvegardes de toutes les cartes
+    
+    Seuls les dossiers dont le mtime a changé depuis le dernier appel sont
+    relus (un enregistrement du serveur remplace les fichiers par rename).
+    
+    Returns:
+        Liste triée par carte puis par dossier
+    """
+    global _saved_entries
+    
+    signature = _signature(paths.SAVED_DIR)
+    if signature is None:
+        return []
+    saved_signature = (paths.SAVED_DIR,) + signature
+    
+    with _lock:
+        cached = _saved_entries
+    if cached is not None and cached[0] == saved_signature:
+        names = cached[1]
+    else:
+        with os.scandir(paths.SAVED_DIR) as entries:
+            names = tuple(sorted(entry.name for entry in entries
+                                 if entry.name not in IGNORED_DIRS and entry.is_dir()))
+        with _lock:
+            _saved_entries = (saved_signature, names)
+    
+    stats: List[MapSaveStats] = []
+    for name in names:
+        path = os.path.join(paths.SAVED_DIR, name)
+        signature = _signature(path)
+        if signature is None:
+            continue
+        with _lock:
+            cached_dir = _dirs.get(path)
+        if cached_dir is not None and cached_dir[0] == signature:
+            stats.extend(cached_dir[1])
+            continue
+        try:
+            dir_stats = _scan_save_dir(path, name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with _lock:
+            _dirs[path] = (signature, dir_stats)
+        stats.extend(dir_stats)
+    
+    return sorted(stats, key=lambda map_stats: (map_stats.name.lower(), map_stats.directory))
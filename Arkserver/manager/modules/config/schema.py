@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Schéma de la configuration ARK
+Types, bornes et règles de GameUserSettings.ini, Game.ini et settings.conf
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils import paths
+from utils.ini_parser import iter_entries, iter_simple_entries
+from utils.schema import Entry, Field, Rule, Schema
+
+# Noms des fichiers dans le rapport
+GUS = "GameUserSettings.ini"
+GAME = "Game.ini"
+CONF = "settings.conf"
+
+SERVER = "ServerSettings"
+SESSION = "SessionSettings"
+GAME_SESSION = "/Script/Engine.GameSession"
+GAME_MODE = "/script/shootergame.shootergamemode"
+
+WEAK_PASSWORDS = ("admin", "password", "123456")
+
+
+def _weak_password(value: str) -> Optional[str]:
+    if value.lower() in WEAK_PASSWORDS:
+        return "mot de passe faible détecté"
+    return None
+
+
+def _not_empty(value: str) -> Optional[str]:
+    return "valeur vide" if not value else None
+
+
+def _multiplier(description: str) -> Field:
+    """Multiplicateur de gameplay : doit être strictement positif"""
+    return Field("float", check=lambda value: "négatif ou nul" if value <= 0 else None,
+                 severity="warning", description=description)
+
+
+def _distinct(*values: Any) -> bool:
+    """Vrai si les valeurs définies sont toutes différentes"""
+    defined = [value for value in values if value is not None]
+    return len(defined) == len(set(defined))
+
+
+FIELDS = {
+    # GameUserSettings.ini
+    (GUS, SERVER, "ServerAdminPassword"): Field("str", required=True, check=_weak_password, severity="warning",
+                                                description="Mot de passe admin"),
+    (GUS, SERVER, "ServerPassword"): Field("str"),
+    (GUS, SERVER, "RCONEnabled"): Field("bool"),
+    (GUS, SERVER, "RCONPort"): Field("port", description="Port RCON"),
+    (GUS, SERVER, "RCONServerGameLogBuffer"): Field("float", min=0),
+    (GUS, SERVER, "MaxPlayers"): Field("int", min=1, max=255),
+    (GUS, SERVER, "DifficultyOffset"): Field("float", min=0, max=1, severity="warning"),
+    (GUS, SERVER, "OverrideOfficialDifficulty"): Field("float", min=0, max=10, severity="warning"),
+    (GUS, SERVER, "XPMultiplier"): _multiplier("Multiplicateur d'XP"),
+    (GUS, SERVER, "TamingSpeedMultiplier"): _multiplier("Vitesse d'apprivoisement"),
+    (GUS, SERVER, "HarvestAmountMultiplier"): _multiplier("Multiplicateur de récolte"),
+    (GUS, SERVER, "HarvestHealthMultiplier"): _multiplier("Santé des ressources"),
+    (GUS, SERVER, "ItemStackSizeMultiplier"): _multiplier("Taille des piles"),
+    (GUS, SERVER, "DayCycleSpeedScale"): _multiplier("Vitesse du cycle jour/nuit"),
+    (GUS, SERVER, "DayTimeSpeedScale"): _multiplier("Vitesse du jour"),
+    (GUS, SERVER, "NightTimeSpeedScale"): _multiplier("Vitesse de la nuit"),
+    (GUS, SERVER, "DinoDamageMultiplier"): _multiplier("Dégâts des dinos"),
+    (GUS, SERVER, "PlayerDamageMultiplier"): _multiplier("Dégâts des joueurs"),
+    (GUS, SERVER, "StructureDamageMultiplier"): _multiplier("Dégâts aux structures"),
+    (GUS, SERVER, "AutoSavePeriodMinutes"): Field("float", min=1, severity="warning"),
+    (GUS, SERVER, "KickIdlePlayersPeriod"): Field("float", min=0),
+    (GUS, SERVER, "MaxTamedDinos"): Field("int", min=0),
+    (GUS, SERVER, "TheMaxStructuresInRange"): Field("int", min=0),
+    (GUS, SERVER, "TribeNameChangeCooldown"): Field("float", min=0),
+    (GUS, SERVER, "ServerPVE"): Field("bool"),
+    (GUS, SERVER, "ServerHardcore"): Field("bool"),
+    (GUS, SERVER, "ServerCrosshair"): Field("bool"),
+    (GUS, SERVER, "ShowMapPlayerLocation"): Field("bool"),
+    (GUS, SERVER, "AllowThirdPersonPlayer"): Field("bool"),
+    (GUS, SERVER, "AllowFlyerCarryPvE"): Field("bool"),
+    (GUS, SERVER, "AllowHitMarkers"): Field("bool"),
+    (GUS, SERVER, "DisableStructureDecayPvE"): Field("bool"),
+    (GUS, SESSION, "SessionName"): Field("str", check=_not_empty),
+    (GUS, SESSION, "Port"): Field("port"),
+    (GUS, SESSION, "QueryPort"): Field("port"),
+    (GUS, GAME_SESSION, "MaxPlayers"): Field("int", min=1, max=255),
+    
+    # Game.ini
+    (GAME, GAME_MODE, "MaxNumberOfPlayersInTribe"): Field("int", min=0),
+    (GAME, GAME_MODE, "OverrideMaxExperiencePointsPlayer"): Field("int", min=0),
+    (GAME, GAME_MODE, "OverrideMaxExperiencePointsDino"): Field("int", min=0),
+    (GAME, GAME_MODE, "BabyMatureSpeedMultiplier"): _multiplier("Vitesse de croissance"),
+    (GAME, GAME_MODE, "BabyCuddleIntervalMultiplier"): _multiplier("Intervalle de câlins"),
+    (GAME, GAME_MODE, "EggHatchSpeedMultiplier"): _multiplier("Vitesse d'éclosion"),
+    (GAME, GAME_MODE, "MatingIntervalMultiplier"): _multiplier("Intervalle d'accouplement"),
+    (GAME, GAME_MODE, "CropGrowthSpeedMultiplier"): _multiplier("Croissance des cultures"),
+    (GAME, GAME_MODE, "bAllowUnlimitedRespecs"): Field("bool"),
+    (GAME, GAME_MODE, "bDisableStructurePlacementCollision"): Field("bool"),
+    (GAME, GAME_MODE, "bAllowFlyerSpeedLeveling"): Field("bool"),
+    (GAME, GAME_MODE, "bUseSingleplayerSettings"): Field("bool"),
+    (GAME, GAME_MODE, "ConfigOverrideItemCraftingCosts"): Field("struct"),
+    (GAME, GAME_MODE, "ConfigOverrideSupplyCrateItems"): Field("struct"),
+    (GAME, GAME_MODE, "ConfigOverrideNPCSpawnEntriesContainer"): Field("struct"),
+    (GAME, GAME_MODE, "ConfigAddNPCSpawnEntriesContainer"): Field("struct"),
+    (GAME, GAME_MODE, "ConfigSubtractNPCSpawnEntriesContainer"): Field("struct"),
+    (GAME, GAME_MODE, "DinoSpawnWeightMultipliers"): Field("struct"),
+    (GAME, GAME_MODE, "OverrideEngramEntries"): Field("struct"),
+    (GAME, GAME_MODE, "OverrideNamedEngramEntries"): Field("struct"),
+    (GAME, GAME_MODE, "LevelExperienceRampOverrides"): Field("struct"),
+    
+    # settings.conf (lu par ark-core.sh)
+    (CONF, None, "SESSION_NAME"): Field("str", check=_not_empty),
+    (CONF, None, "GAME_PORT"): Field("port"),
+    (CONF, None, "QUERY_PORT"): Field("port"),
+    (CONF, None, "RCON_ENABLED"): Field("bool", choices=("true", "false", "1", "0")),
+    (CONF, None, "RCON_PORT"): Field("port"),
+    (CONF, None, "RCON_PASSWORD"): Field("str"),
+    (CONF, None, "MAX_PLAYERS"): Field("int", min=1, max=255),
+    (CONF, None, "SERVER_PASSWORD"): Field("str"),
+    (CONF, None, "SERVER_ADMIN_PASSWORD"): Field("str", check=_weak_password, severity="warning"),
+    (CONF, None, "EXTRA_FLAGS"): Field("str"),
+}
+
+RULES = [
+    Rule([(CONF, None, "GAME_PORT"), (CONF, None, "QUERY_PORT"), (CONF, None, "RCON_PORT")],
+         lambda game, query, rcon: _distinct(game, game + 1 if game is not None else None, query, rcon),
+         "GAME_PORT, GAME_PORT+1 (raw UDP), QUERY_PORT et RCON_PORT doivent être différents"),
+    Rule([(CONF, None, "RCON_ENABLED"), (CONF, None, "RCON_PORT"), (CONF, None, "RCON_PASSWORD")],
+         lambda enabled, port, password: not enabled or (port is not None and bool(password)),
+         "RCON activé mais RCON_PORT ou RCON_PASSWORD non défini (RCON sera ignoré)",
+         severity="warning"),
+    Rule([(CONF, None, "RCON_PORT"), (GUS, SERVER, "RCONPort")],
+         lambda conf_port, ini_port: conf_port is None or ini_port is None or conf_port == ini_port,
+         "RCON_PORT (settings.conf) différent de RCONPort (GameUserSettings.ini) : la ligne de commande l'emporte",
+         severity="warning"),
+    Rule([(GUS, SESSION, "Port"), (GUS, SESSION, "QueryPort"), (GUS, SERVER, "RCONPort")],
+         _distinct,
+         "Port, QueryPort et RCONPort doivent être différents"),
+    Rule([(GAME, GAME_MODE, "BabyMatureSpeedMultiplier"), (GAME, GAME_MODE, "BabyCuddleIntervalMultiplier")],
+         lambda mature, cuddle: mature is None or cuddle is None or mature <= 1 or cuddle <= 1 / mature,
+         "BabyMatureSpeedMultiplier élevé sans réduire BabyCuddleIntervalMultiplier : imprégnation impossible",
+         severity="warning"),
+]
+
+CONFIG_SCHEMA = Schema(FIELDS, RULES)
+
+
+def _guarded(source: str, entries: Iterable[Entry], problems: List[Dict[str, Any]]) -> Iterator[Entry]:
+    """
+    Arrête proprement la lecture d'un fichier illisible (ex: encodage) et le signale
+    
+    Simple avertissement : le jeu peut lire des fichiers que le validateur ne
+    sait pas décoder, un serveur qui fonctionne ne doit pas être bloqué.
+    """
+    try:
+        yield from entries
+    except (OSError, UnicodeDecodeError) as e:
+        problems.append({
+            "file": source,
+            "section": None,
+            "key": None,
+            "line": None,
+            "message": f"Fichier illisible, non validé: {e}"
+        })
+
+
+def validate_config(sources: Optional[Dict[str, Iterable[Entry]]] = None) -> Dict[str, Any]:
+    """
+    Valide toute la configuration en une passe par fichier
+    
+    Args:
+        sources: Entrées à valider par fichier (défaut: fichiers de paths)
+    
+    Returns:
+        Dict avec: success, errors (list), warnings (list), checked, duration_ms
+    """
+    if sources is None:
+        sources = {
+            GUS: iter_entries(paths.GAME_USER_SETTINGS_INI),
+            GAME: iter_entries(paths.GAME_INI),
+            CONF: iter_simple_entries(paths.SETTINGS_CONF),
+        }
+    
+    unreadable: List[Dict[str, Any]] = []
+    report = CONFIG_SCHEMA.validate({
+        source: _guarded(source, entries, unreadable) for source, entries in sources.items()
+    })
+    
+    report["warnings"].extend(unreadable)
+    
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """
+    Formate les problèmes d'un rapport pour l'affichage
+    
+    Args:
+        report: Résultat de validate_config
+    
+    Returns:
+        Lignes "❌/⚠️ fichier[:ligne] [section] message"
+    """
+    output = []
+    for icon, issues in (("❌", report["errors"]), ("⚠️ ", report["warnings"])):
+        for issue in issues:
+            location = issue["file"] + (f":{issue['line']}" if issue["line"] else "")
+            section = f" [{issue['section']}]" if issue["section"] else ""
+            output.append(f"{icon} {location}{section} {issue['message']}")
+    return output
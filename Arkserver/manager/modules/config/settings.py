@@ -10,7 +10,26 @@ from typing import Dict, List, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 from utils import paths
-from utils.ini_parser import ArkINIParser
+from utils.ini_parser import ArkINIParser, load_ini
+from utils.revisions import RevisionStore
+from modules.config.schema import CONFIG_SCHEMA, GUS, validate_config
+from modules.config.snapshot import pinned_snapshot
+
+
+class _MissingSectionError(Exception):
+    """Section absente du INI : annule la transaction en cours"""
+    
+    def __init__(self, section: str):
+        super().__init__(section)
+        self.section = section
+
+
+class _InvalidValueError(Exception):
+    """Valeur refusée par le schéma : annule la transaction en cours"""
+    
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
 
 
 class SettingsManager:
@@ -33,13 +52,14 @@ class SettingsManager:
         }
     }
     
-    def __init__(self):
-        """Initialise le gestionnaire"""
-        self.parser = ArkINIParser(paths.GAME_USER_SETTINGS_INI)
+    @property
+    def parser(self) -> ArkINIParser:
+        """Parser partagé de GameUserSettings.ini (reparsé seulement si le fichier a changé)"""
+        return load_ini(paths.GAME_USER_SETTINGS_INI)
     
     def get_setting(self, section: str, key: str) -> Optional[str]:
         """
-        Récupère une valeur de paramètre
+        Récupère une valeur de paramètre (depuis l'instantané de l'opération en cours s'il y en a un)
         
         Args:
             section: Section du INI
@@ -48,7 +68,9 @@ class SettingsManager:
         Returns:
             Valeur ou None si introuvable
         """
-        self.parser.read()
+        snapshot = pinned_snapshot()
+        if snapshot is not None and snapshot.loaded("GameUserSettings.ini"):
+            return snapshot.get_setting(section, key)
         return self.parser.get_value(section, key)
     
     def set_setting(self, section: str, key: str, value: str) -> Dict[str, any]:
@@ -63,23 +85,58 @@ class SettingsManager:
         Returns:
             Dict avec: success, message, error
         """
-        try:
-            self.parser.read()
-            
-            if not self.parser.set_value(section, key, value):
-                return {
-                    "success": False,
-                    "message": f"Impossible de modifier {key} dans [{section}]",
-                    "error": "Section introuvable"
-                }
+        result = self.set_settings({section: {key: value}})
+        
+        if result["success"]:
+            result["message"] = f"Paramètre modifié: {key} = {value}"
+        elif result["error"] == "Section introuvable":
+            result["message"] = f"Impossible de modifier {key} dans [{section}]"
+        
+        return result
+    
+    def set_settings(self, changes: Dict[str, Dict[str, str]]) -> Dict[str, any]:
+        """
+        Modifie plusieurs paramètres en une seule lecture et une seule écriture
+        
+        Tout ou rien : si une section est introuvable ou si une valeur est refusée
+        par le schéma de configuration, le fichier n'est pas modifié.
+        
+        Args:
+            changes: {section: {key: value}}
             
-            self.parser.write()
+        Returns:
+            Dict avec: success, message, error
+        """
+        count = sum(len(keys) for keys in changes.values())
+        
+        try:
+            parser = self.parser
+            with parser.transaction(reload=False):
+                for section, keys in changes.items():
+                    for key, value in keys.items():
+                        error = CONFIG_SCHEMA.check_value(GUS, section, key, value)
+                        if error:
+                            raise _InvalidValueError(error)
+                        if not parser.set_value(section, key, value):
+                            raise _MissingSectionError(section)
             
             return {
                 "success": True,
-                "message": f"Paramètre modifié: {key} = {value}",
+                "message": f"{count} paramètre(s) modifié(s)",
                 "error": None
             }
+        except _MissingSectionError as e:
+            return {
+                "success": False,
+                "message": f"Section introuvable: [{e.section}]",
+                "error": "Section introuvable"
+            }
+        except _InvalidValueError as e:
+            return {
+                "success": False,
+                "message": e.message,
+                "error": "Valeur invalide"
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -94,14 +151,14 @@ class SettingsManager:
         Returns:
             Dict avec: success, settings (dict), error
         """
-        self.parser.read()
+        parser = self.parser
         
         settings = {}
         
         for section, keys in self.COMMON_SETTINGS.items():
             settings[section] = {}
             for key, description in keys.items():
-                value = self.parser.get_value(section, key)
+                value = parser.get_value(section, key)
                 settings[section][key] = {
                     "value": value if value else "(non défini)",
                     "description": description
@@ -142,77 +199,113 @@ class SettingsManager:
         
         return "\n".join(output)
     
-    def backup_settings(self) -> Dict[str, any]:
+    @staticmethod
+    def revision_store() -> RevisionStore:
+        """Historique des fichiers de configuration (CONFIG_DIR/revisions)"""
+        return RevisionStore(paths.REVISIONS_DIR, {
+            "GameUserSettings.ini": paths.GAME_USER_SETTINGS_INI,
+            "Game.ini": paths.GAME_INI,
+            "settings.conf": paths.SETTINGS_CONF,
+            "mods.list": paths.MODS_LIST,
+            "current_map": paths.CURRENT_MAP_FILE,
+        })
+    
+    def backup_settings(self, label: str = "") -> Dict[str, any]:
         """
-        Crée une sauvegarde du fichier GameUserSettings.ini
+        Enregistre une révision de la configuration
+        
+        GameUserSettings.ini, Game.ini, settings.conf, mods.list et current_map.
+        Un contenu déjà sauvegardé n'est pas dupliqué.
+        
+        Args:
+            label: Description libre de la révision
         
         Returns:
-            Dict avec: success, backup_path, error
+            Dict avec: success, revision (id), created, error
         """
-        import shutil
-        from datetime import datetime
-        
         try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{paths.GAME_USER_SETTINGS_INI}.backup_{timestamp}"
+            revision = self.revision_store().save(label)
             
-            shutil.copy2(paths.GAME_USER_SETTINGS_INI, backup_path)
+            return {
+                "success": True,
+                "revision": revision["id"],
+                "created": revision["created"],
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "revision": None,
+                "created": False,
+                "error": str(e)
+            }
+    
+    def list_backups(self) -> Dict[str, any]:
+        """
+        Liste les révisions de la configuration
+        
+        Returns:
+            Dict avec: success, revisions (list, plus récente en premier), error
+        """
+        try:
+            return {
+                "success": True,
+                "revisions": self.revision_store().list(),
+                "error": None
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "revisions": [],
+                "error": str(e)
+            }
+    
+    def restore_backup(self, revision_id: str, names: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        Restaure une révision de la configuration
+        
+        L'état actuel est enregistré avant restauration, pour pouvoir revenir en arrière.
+        
+        Args:
+            revision_id: Identifiant de la révision
+            names: Fichiers à restaurer (None = tous)
+        
+        Returns:
+            Dict avec: success, message, error
+        """
+        store = self.revision_store()
+        
+        if store.get(revision_id) is None:
+            return {
+                "success": False,
+                "message": f"Révision introuvable: {revision_id}",
+                "error": "Révision introuvable"
+            }
+        
+        try:
+            store.save(f"avant restauration de {revision_id}")
+            restored = store.restore(revision_id, names)
             
             return {
                 "success": True,
-                "backup_path": backup_path,
+                "message": f"Révision {revision_id} restaurée: {', '.join(restored) or 'aucun fichier'}",
                 "error": None
             }
         except Exception as e:
             return {
                 "success": False,
-                "backup_path": None,
+                "message": "Échec de la restauration",
                 "error": str(e)
             }
     
     def validate_settings(self) -> Dict[str, any]:
         """
-        Valide la configuration (vérifie les paramètres critiques)
+        Valide toute la configuration (GameUserSettings.ini, Game.ini, settings.conf)
         
-        Returns:
-            Dict avec: success, warnings (list), errors (list)
-        """
-        self.parser.read()
-        
-        warnings = []
-        errors = []
-        
-        # Vérifier mot de passe admin
-        admin_pass = self.parser.get_value("ServerSettings", "ServerAdminPassword")
-        if not admin_pass or admin_pass == "":
-            warnings.append("Mot de passe admin non défini")
-        elif admin_pass in ["admin", "password", "123456"]:
-            warnings.append("Mot de passe admin faible détecté")
-        
-        # Vérifier port RCON
-        rcon_port = self.parser.get_value("ServerSettings", "RCONPort")
-        if rcon_port:
-            try:
-                port = int(rcon_port)
-                if port < 1024 or port > 65535:
-                    errors.append(f"Port RCON invalide: {port} (doit être entre 1024 et 65535)")
-            except ValueError:
-                errors.append(f"Port RCON invalide: {rcon_port} (doit être numérique)")
-        
-        # Vérifier multiplicateurs
-        multipliers = ["XPMultiplier", "TamingSpeedMultiplier", "HarvestAmountMultiplier"]
-        for mult in multipliers:
-            value = self.parser.get_value("ServerSettings", mult)
-            if value:
-                try:
-                    float_val = float(value)
-                    if float_val <= 0:
-                        warnings.append(f"{mult} est négatif ou nul")
-                except ValueError:
-                    errors.append(f"{mult} invalide: {value}")
+        Types, bornes et règles inter-paramètres : voir modules/config/schema.py.
         
-        return {
-            "success": len(errors) == 0,
-            "warnings": warnings,
-            "errors": errors
-        }
+        Returns:
+            Dict avec: success, warnings (list), errors (list), checked, duration_ms
+            Chaque problème est un dict avec: file, section, key, line, message
+        """
+        return validate_config()
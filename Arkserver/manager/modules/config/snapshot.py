@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Instantané de la configuration ARK
+current_map, mods.list, settings.conf, GameUserSettings.ini et Game.ini lus
+une seule fois, dans un objet immuable partagé par les managers
+"""
+
+import hashlib
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils import paths
+from utils.ini_parser import iter_entries, iter_simple_entries
+from utils.parse_cache import file_signature
+
+# Instantané épinglé pour l'opération en cours (par thread)
+_pinned = threading.local()
+
+# Dernier instantané chargé : (signatures des fichiers, instantané)
+_last: Optional[Tuple[Tuple, 'ConfigSnapshot']] = None
+_last_lock = threading.Lock()
+
+
+def parse_mods_list(lines: Iterable[str]) -> List[Dict[str, any]]:
+    """
+    Parse le contenu de mods.list (format ID|NAME)
+    
+    Args:
+        lines: Lignes du fichier
+    
+    Returns:
+        Liste de dict avec: id, name, line
+    """
+    mods = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        
+        # Ignorer lignes vides et commentaires
+        if not line or line.startswith('#'):
+            continue
+        
+        # Format attendu: MOD_ID|MOD_NAME
+        if '|' not in line:
+            continue
+        
+        parts = line.split('|', 1)
+        if len(parts) == 2:
+            mod_id = parts[0].strip()
+            mod_name = parts[1].strip()
+            
+            if mod_id.isdigit():
+                mods.append({
+                    "id": mod_id,
+                    "name": mod_name,
+                    "line": line_num
+                })
+    return mods
+
+
+@dataclass(frozen=True, eq=False)
+class ConfigSnapshot:
+    """
+    Configuration complète à un instant donné (immuable, hashable)
+    
+    Deux instantanés sont égaux si les cinq fichiers ont exactement le même
+    contenu : digest est utilisable comme clé de cache.
+    """
+    
+    map_name: Optional[str]                                 # current_map (None si absent)
+    mods: Tuple[Tuple[str, str, int], ...]                  # (id, name, ligne) de mods.list
+    settings_conf: Tuple[Tuple[str, str], ...]              # (clé, valeur) de settings.conf
+    game_user_settings: Tuple[Tuple[str, str, str], ...]    # (section, clé, valeur)
+    game_ini: Tuple[Tuple[str, str, str], ...]              # (section, clé, valeur)
+    missing: Tuple[str, ...]                                # fichiers absents
+    errors: Tuple[Tuple[str, str], ...]                     # fichiers illisibles (fichier, erreur)
+    digest: str                                             # empreinte du contenu des cinq fichiers
+    
+    def __eq__(self, other: any) -> bool:
+        if isinstance(other, ConfigSnapshot):
+            return self.digest == other.digest
+        return NotImplemented
+    
+    def __hash__(self) -> int:
+        return hash(self.digest)
+    
+    def __repr__(self) -> str:
+        return f"ConfigSnapshot(map={self.map_name!r}, mods={len(self.mods)}, digest={self.digest[:12]})"
+    
+    @cached_property
+    def _settings_index(self) -> Dict[Tuple[str, str], str]:
+        """Première valeur de chaque (section, clé) de GameUserSettings.ini"""
+        index = {}
+        for section, key, value in self.game_user_settings:
+            index.setdefault((section, key), value)
+        return index
+    
+    def loaded(self, name: str) -> bool:
+        """
+        Indique si un fichier a été lu et parsé
+        
+        Args:
+            name: current_map, mods.list, settings.conf, GameUserSettings.ini ou Game.ini
+        
+        Returns:
+            False si le fichier est absent ou illisible
+        """
+        return name not in self.missing and all(error[0] != name for error in self.errors)
+    
+    def get_setting(self, section: str, key: str) -> Optional[str]:
+        """
+        Valeur d'un paramètre de GameUserSettings.ini (première occurrence)
+        
+        Args:
+            section: Section du INI
+            key: Clé du paramètre
+        
+        Returns:
+            Valeur ou None si introuvable
+        """
+        return self._settings_index.get((section, key))
+    
+    def get_conf(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """
+        Valeur d'une clé de settings.conf (dernière occurrence, comme bash)
+        
+        Args:
+            key: Clé (ex: SESSION_NAME)
+            default: Valeur si absente
+        
+        Returns:
+            Valeur ou default
+        """
+        return dict(self.settings_conf).get(key, default)
+
+
+def _sources() -> Dict[str, str]:
+    """Fichiers de l'instantané : nom -> chemin"""
+    return {
+        "current_map": paths.CURRENT_MAP_FILE,
+        "mods.list": paths.MODS_LIST,
+        "settings.conf": paths.SETTINGS_CONF,
+        "GameUserSettings.ini": paths.GAME_USER_SETTINGS_INI,
+        "Game.ini": paths.GAME_INI,
+    }
+
+
+def _read(file_path: str) -> Optional[bytes]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _ini_entries(data: bytes) -> Tuple[Tuple[str, str, str], ...]:
+    return tuple((section, key, value) for section, key, value, _ in iter_entries(io.BytesIO(data)))
+
+
+def load_snapshot(parallel: bool = False) -> ConfigSnapshot:
+    """
+    Charge l'instantané de la configuration
+    
+    Si aucun des cinq fichiers n'a changé (signature stat) depuis le dernier
+    chargement, le même objet est retourné sans relire les fichiers.
+    
+    Args:
+        parallel: Lire les fichiers dans des threads séparés
+    
+    Returns:
+        Instantané immuable
+    """
+    global _last
+    
+    sources = _sources()
+    signatures = tuple((file_path, file_signature(file_path)) for file_path in sources.values())
+    
+    with _last_lock:
+        if _last is not None and _last[0] == signatures:
+            return _last[1]
+    
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(sources)) as executor:
+            contents = dict(zip(sources, executor.map(_read, sources.values())))
+    else:
+        contents = {name: _read(file_path) for name, file_path in sources.items()}
+    
+    digest = hashlib.sha256()
+    missing = []
+    errors = []
+    parsed = {}
+    
+    for name, data in contents.items():
+        digest.update(name.encode('utf-8') + b'\0')
+        if data is None:
+            missing.append(name)
+            digest.update(b'-\0')
+            continue
+        digest.update(hashlib.sha256(data).digest())
+        
+        try:
+            if name == "current_map":
+                parsed[name] = data.decode('utf-8').strip()
+            elif name == "mods.list":
+                parsed[name] = tuple(
+                    (mod["id"], mod["name"], mod["line"])
+                    for mod in parse_mods_list(data.decode('utf-8').splitlines())
+                )
+            elif name == "settings.conf":
+                parsed[name] = tuple((key, value) for _, key, value, _ in iter_simple_entries(io.BytesIO(data)))
+            else:
+                parsed[name] = _ini_entries(data)
+        except (UnicodeDecodeError, ValueError) as e:
+            errors.append((name, str(e)))
+    
+    snapshot = ConfigSnapshot(
+        map_name=parsed.get("current_map"),
+        mods=parsed.get("mods.list", ()),
+        settings_conf=parsed.get("settings.conf", ()),
+        game_user_settings=parsed.get("GameUserSettings.ini", ()),
+        game_ini=parsed.get("Game.ini", ()),
+        missing=tuple(missing),
+        errors=tuple(errors),
+        digest=digest.hexdigest()
+    )
+    
+    with _last_lock:
+        _last = (signatures, snapshot)
+    
+    return snapshot
+
+
+def pinned_snapshot() -> Optional[ConfigSnapshot]:
+    """Instantané de l'opération en cours dans ce thread, ou None hors opération"""
+    return getattr(_pinned, "snapshot", None)
+
+
+@contextmanager
+def config_operation(parallel: bool = False) -> Iterator[ConfigSnapshot]:
+    """
+    Épingle un instantané pour la durée d'une opération en lecture
+    
+    Pendant le bloc, get_current_map, read_mods_list et get_setting lisent
+    l'instantané au lieu de rouvrir les fichiers.
+    
+    Exemple:
+        with config_operation() as snapshot:
+            maps_manager.get_current_map()
+            mods_manager.read_mods_list()
+    """
+    previous = pinned_snapshot()
+    snapshot = previous if previous is not None else load_snapshot(parallel)
+    _pinned.snapshot = snapshot
+    try:
+        yield snapshot
+    finally:
+        _pinned.snapshot = previous
@@ -13,6 +13,7 @@ import os
 # Import du module paths
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import paths
+from modules.config.maps import MapsManager
 
 
 class ServerManager:
@@ -105,6 +106,9 @@ class ServerManager:
                 "error": None
             }
         
+        # Précharger la carte et les mods : le serveur les trouvera en mémoire
+        prewarm = MapsManager().prewarm_assets()
+        
         # Tenter démarrage via systemctl
         returncode, stdout, stderr = self._run_command([
             "sudo", "systemctl", "start", self.service_name
@@ -119,6 +123,7 @@ class ServerManager:
                 return {
                     "success": True,
                     "message": f"Serveur démarré avec succès (PID: {status['pid']})",
+                    "prewarm": prewarm["report"],
                     "error": None
                 }
             else:
@@ -138,6 +143,7 @@ class ServerManager:
                     return {
                         "success": True,
                         "message": "Serveur démarré via script direct",
+                        "prewarm": prewarm["report"],
                         "error": None
                     }
                 else:
@@ -1,17 +1,33 @@
 #!/usr/bin/env python3
 """
 Module de gestion des mises à jour ARK
-Interface Python vers ark-update-check.sh et ark-mods.sh
+Interface Python vers ark-update-check.sh et SteamCMD
 """
 
 import subprocess
 import json
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import paths
+from utils.fileio import atomic_write
+from utils.parse_cache import PARSE_CACHE
+from utils.steamcmd import WorkshopDownloader, install_record, plan_updates, read_workshop_manifest
+from modules.config.mods import ModsManager, load_mods_registry
+
+
+def _load_install_records(file_path: str) -> Dict[str, Dict[str, any]]:
+    """Loader du cache : dernière installation réussie de chaque mod"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        # Fichier corrompu : tous les mods seront revérifiés
+        return {}
 
 
 class UpdateManager:
@@ -110,44 +126,189 @@ class UpdateManager:
                 "error": stderr or "Erreur SteamCMD"
             }
     
-    def update_mods(self) -> Dict[str, any]:
+    def _record_installs(self, mod_ids: List[str]) -> None:
+        """Enregistre l'état du manifeste workshop des mods qui viennent d'être téléchargés"""
+        try:
+            installed = read_workshop_manifest(paths.WORKSHOP_MANIFEST)
+        except ValueError:
+            return
+        
+        records = dict(PARSE_CACHE.get(paths.MODS_INSTALLED, _load_install_records))
+        changed = False
+        for mod_id in mod_ids:
+            if mod_id in installed and records.get(mod_id) != install_record(installed[mod_id]):
+                records[mod_id] = install_record(installed[mod_id])
+                changed = True
+        
+        if not changed:
+            return
+        
+        atomic_write(paths.MODS_INSTALLED, json.dumps(records, indent=2, sort_keys=True) + "\n")
+        PARSE_CACHE.revalidate(paths.MODS_INSTALLED, records)
+    
+    def plan_mod_updates(self, mod_ids: Optional[List[str]] = None) -> Dict[str, any]:
         """
-        Met à jour les mods via ark-mods.sh
+        Détermine les mods à télécharger d'après le manifeste workshop local
+        
+        Un mod est à télécharger s'il est absent du manifeste ou du disque, si Steam
+        signale un manifeste plus récent, ou si son entrée diffère de la dernière
+        installation réussie enregistrée.
+        
+        Args:
+            mod_ids: IDs des mods (None = tous ceux de mods.list)
         
         Returns:
-            Dict avec: success (bool), message, error
+            Dict avec: success (bool), scheduled (list de {id, reason}), up_to_date (list), message, error
+        """
+        if mod_ids is None:
+            mod_ids = load_mods_registry().ids()
+        
+        try:
+            installed = read_workshop_manifest(paths.WORKSHOP_MANIFEST)
+            error = None
+        except ValueError as e:
+            # Manifeste illisible : tout retélécharger
+            installed = {}
+            error = f"Manifeste workshop illisible: {e}"
+        
+        records = PARSE_CACHE.get(paths.MODS_INSTALLED, _load_install_records)
+        scheduled, up_to_date = plan_updates(mod_ids, installed, records, paths.WORKSHOP_DIR)
+        
+        return {
+            "success": True,
+            "scheduled": [{"id": mod_id, "reason": reason} for mod_id, reason in scheduled],
+            "up_to_date": up_to_date,
+            "message": f"{len(scheduled)} mod(s) à mettre à jour, {len(up_to_date)} à jour",
+            "error": error
+        }
+    
+    def download_mods(self, mod_ids: Optional[List[str]] = None, sessions: int = 1,
+                      batch_size: int = 25, item_timeout: int = 300, retries: int = 2,
+                      record: bool = True) -> Dict[str, any]:
+        """
+        Télécharge des mods workshop en regroupant les mods par session SteamCMD
+        
+        Args:
+            mod_ids: IDs des mods (None = tous ceux de mods.list)
+            sessions: Nombre maximum de sessions SteamCMD simultanées (1 = une à la fois)
+            batch_size: Nombre maximum de mods par session
+            item_timeout: Délai maximum par mod, en secondes
+            retries: Nombre de nouvelles tentatives pour un mod en échec
+            record: Enregistrer les mods téléchargés dans mods_installed.json
+                (False si l'appelant les enregistre après leur extraction)
+        
+        Returns:
+            Dict avec: success (bool), message, downloaded (list), failed (list), results (dict), error
         """
-        if not os.path.exists(paths.SCRIPT_MODS):
+        if not os.path.exists(paths.STEAMCMD):
             return {
                 "success": False,
-                "message": "Script de gestion des mods introuvable",
-                "error": f"Fichier manquant: {paths.SCRIPT_MODS}"
+                "message": "SteamCMD introuvable",
+                "downloaded": [],
+                "failed": [],
+                "results": {},
+                "error": f"Fichier manquant: {paths.STEAMCMD}"
             }
         
-        print("⏳ Mise à jour des mods en cours...")
+        if mod_ids is None:
+            mod_ids = load_mods_registry().ids()
         
-        returncode, stdout, stderr = self._run_command([
-            "bash", paths.SCRIPT_MODS, "update"
-        ], timeout=900)  # 15 minutes max
-        
-        # Le script retourne 0 si OK, 1 si warnings, 2 si erreur critique
-        if returncode == 0:
+        if not mod_ids:
             return {
                 "success": True,
-                "message": "Tous les mods ont été mis à jour avec succès",
+                "message": "Aucun mod à télécharger",
+                "downloaded": [],
+                "failed": [],
+                "results": {},
                 "error": None
             }
-        elif returncode == 1:
+        
+        downloader = WorkshopDownloader(
+            paths.STEAMCMD,
+            paths.ARK_WORKSHOP_ID,
+            sessions=sessions,
+            batch_size=batch_size,
+            item_timeout=item_timeout,
+            retries=retries
+        )
+        results = downloader.download(mod_ids)
+        
+        downloaded = [mod_id for mod_id, result in results.items() if result["success"]]
+        failed = [result for result in results.values() if not result["success"]]
+        
+        if record and downloaded:
+            self._record_installs(downloaded)
+        
+        return {
+            "success": not failed,
+            "message": f"{len(downloaded)}/{len(results)} mod(s) téléchargé(s)",
+            "downloaded": downloaded,
+            "failed": failed,
+            "results": results,
+            "error": "; ".join(f"{result['id']}: {result['message']}" for result in failed) or None
+        }
+    
+    def update_mods(self, force: bool = False, install: bool = True,
+                    mod_ids: Optional[List[str]] = None) -> Dict[str, any]:
+        """
+        Met à jour les mods de mods.list via SteamCMD
+        
+        Seuls les mods absents ou modifiés (voir plan_mod_updates) sont téléchargés,
+        puis extraits dans ShooterGame/Content/Mods. Un mod n'est enregistré comme
+        installé qu'après son extraction : un mod non extrait reste planifié.
+        
+        Args:
+            force: Retélécharger et valider tous les mods
+            install: Extraire les mods téléchargés (archives .z et fichier .mod)
+            mod_ids: IDs des mods (None = tous ceux de mods.list)
+        
+        Returns:
+            Dict avec: success (bool), message, error
+        """
+        if mod_ids is None:
+            mod_ids = load_mods_registry().ids()
+        if not force:
+            plan = self.plan_mod_updates(mod_ids)
+            mod_ids = [mod["id"] for mod in plan["scheduled"]]
+            if not mod_ids:
+                return {
+                    "success": True,
+                    "message": f"Tous les mods sont à jour ({len(plan['up_to_date'])})",
+                    "error": None
+                }
+        
+        print(f"⏳ Mise à jour de {len(mod_ids)} mod(s) en cours...")
+        
+        result = self.download_mods(mod_ids, record=not install)
+        errors = [result["error"]] if result["error"] else []
+        updated = result["downloaded"]
+        
+        if install and result["downloaded"]:
+            print(f"📦 Extraction de {len(result['downloaded'])} mod(s)...")
+            install_result = ModsManager().install_mods(result["downloaded"])
+            if install_result["error"]:
+                errors.append(f"Extraction: {install_result['error']}")
+            updated = [mod["id"] for mod in install_result["installed"]]
+            if updated:
+                self._record_installs(updated)
+        
+        if not updated:
+            return {
+                "success": False,
+                "message": "Échec de la mise à jour des mods",
+                "error": "; ".join(errors) or None
+            }
+        elif errors:
             return {
                 "success": True,
-                "message": "Mods mis à jour avec des avertissements (voir logs)",
-                "error": "Certains mods ont généré des warnings"
+                "message": "Mods mis à jour avec des avertissements (voir erreurs)",
+                "error": "; ".join(errors)
             }
         else:
             return {
-                "success": False,
-                "message": "Échec de la mise à jour des mods",
-                "error": stderr or "Erreur critique"
+                "success": True,
+                "message": f"{len(updated)} mod(s) mis à jour avec succès",
+                "error": None
             }
     
     def full_update(self) -> Dict[str, any]:
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Vérifications avant lancement (appelé par ark-core.sh)
+
+    preflight.py          validation de la configuration
+    preflight.py --mods   vérification des mods (remplace ark-mods.sh --check)
+
+Affiche le rapport sur une seule ligne JSON (stdout), les autres messages sur stderr.
+Codes de sortie (comme ark-mods.sh --check) :
+    0 = OK, 1 = avertissements, 2 = erreurs (le serveur ne doit pas être lancé)
+"""
+
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from modules.config.schema import validate_config
+
+
+def check_config() -> int:
+    report = validate_config()
+    print(json.dumps(report, ensure_ascii=False))
+    
+    if report["errors"]:
+        return 2
+    if report["warnings"]:
+        return 1
+    return 0
+
+
+def check_mods() -> int:
+    """
+    Vérification des mods de mods.list, reprise du cache d'empreintes
+    
+    Les mods absents du workshop sont téléchargés et extraits, comme le
+    faisait ark-mods.sh --check (progression sur stderr, erreur dans
+    update_error). Un mod manquant ou corrompu n'empêche pas
+    le démarrage (exit 1) ; mods.list illisible l'empêche (exit 2).
+    """
+    from modules.config.mods import ModsManager
+    
+    manager = ModsManager()
+    result = manager.check_installed_mods()
+    if not result["success"]:
+        print(json.dumps({"status": "error", "error": result["error"]}, ensure_ascii=False))
+        return 2
+    
+    update_error = None
+    if result["missing"]:
+        from modules.updates import UpdateManager
+        
+        with redirect_stdout(sys.stderr):
+            update = UpdateManager().update_mods(mod_ids=[mod["id"] for mod in result["missing"]])
+        update_error = update["error"]
+        result = manager.check_installed_mods()
+    
+    warning = bool(result["missing"] or result["corrupt"])
+    print(json.dumps({
+        "status": "warning" if warning else "ok",
+        "installed": len(result["installed"]),
+        "cached": sum(1 for mod in result["installed"] if mod["cached"]),
+        "missing": [mod["id"] for mod in result["missing"]],
+        "corrupt": [{"id": mod["id"], "issues": mod["issues"]} for mod in result["corrupt"]],
+        "orphaned": result["orphaned"],
+        "update_error": update_error
+    }, ensure_ascii=False))
+    return 1 if warning else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ["--mods"]:
+        return check_mods()
+    if argv:
+        print(f"Usage: {os.path.basename(__file__)} [--mods]", file=sys.stderr)
+        return 2
+    return check_config()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
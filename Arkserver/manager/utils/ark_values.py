@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Décodeur des valeurs structurées ARK
+Ex: ConfigOverrideItemCraftingCosts=(ItemClassString="...",BaseCraftingResourceRequirements=((...),(...)))
+
+Le décodage est paresseux : seul le niveau de parenthèses accédé est découpé,
+les sous-tuples restent sous forme de texte brut jusqu'à leur premier accès.
+À la réécriture, tout élément non modifié reproduit son texte d'origine.
+"""
+
+import re
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+# Caractères significatifs pour le découpage d'un niveau de tuple
+_TOKEN_RE = re.compile(r'[(),"=\\]')
+
+# Une valeur nue doit être entourée de guillemets si elle contient l'un de ces caractères
+_NEEDS_QUOTES_RE = re.compile(r'[(),"=\s]')
+
+_UNDECODED = object()
+
+
+class _Entry:
+    """Élément d'un tuple : clé optionnelle, texte brut d'origine, valeur décodée"""
+    
+    __slots__ = ('key', 'raw', 'value', 'quoted')
+    
+    def __init__(self, key: Optional[str], raw: Optional[str], value: Any = _UNDECODED, quoted: bool = False):
+        self.key = key
+        self.raw = raw  # None si la valeur a été remplacée
+        self.value = value
+        self.quoted = quoted
+
+
+class ArkTuple:
+    """
+    Tuple ARK (Key=Value,...) ou liste ((...),(...)) décodé à la demande
+    
+    Accès par clé (str) pour les structures, par position (int) pour les listes.
+    Les valeurs scalaires sont retournées sous forme de str sans guillemets.
+    """
+    
+    __slots__ = ('_raw', '_entries', '_dirty')
+    
+    def __init__(self, raw: Optional[str] = None):
+        """
+        Args:
+            raw: Texte d'origine, parenthèses comprises (None pour un tuple vide neuf)
+        """
+        self._raw = raw
+        self._entries: Optional[List[_Entry]] = None if raw is not None else []
+        self._dirty = raw is None
+    
+    # ------------------------------------------------------------------
+    # Décodage
+    # ------------------------------------------------------------------
+    
+    def _split(self) -> List[_Entry]:
+        """Découpe le niveau courant en éléments (les sous-tuples restent bruts)"""
+        if self._entries is not None:
+            return self._entries
+        
+        text = self._raw.strip()
+        if not (text.startswith('(') and text.endswith(')')):
+            raise ValueError(f"Tuple ARK invalide: {text[:80]}")
+        
+        entries: List[_Entry] = []
+        depth = 0
+        in_quotes = False
+        item_start = 1
+        key_end = None  # position du '=' de premier niveau de l'élément courant
+        escaped_pos = -1  # position du caractère suivant un '\\' entre guillemets
+        
+        for match in _TOKEN_RE.finditer(text):
+            char = match.group()
+            pos = match.start()
+            
+            if in_quotes:
+                if pos == escaped_pos:
+                    continue
+                if char == '"':
+                    in_quotes = False
+                elif char == '\\':
+                    escaped_pos = pos + 1
+                continue
+            
+            if char == '"':
+                in_quotes = True
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    if pos != len(text) - 1:
+                        raise ValueError(f"Tuple ARK invalide (texte après la parenthèse finale): {text[:80]}")
+                    self._add_entry(entries, text, item_start, key_end, pos)
+            elif depth == 1:
+                if char == '=' and key_end is None:
+                    key_end = pos
+                elif char == ',':
+                    self._add_entry(entries, text, item_start, key_end, pos)
+                    item_start = pos + 1
+                    key_end = None
+        
+        if depth != 0 or in_quotes:
+            raise ValueError(f"Tuple ARK invalide (parenthèses ou guillemets non fermés): {text[:80]}")
+        
+        self._entries = entries
+        return entries
+    
+    @staticmethod
+    def _add_entry(entries: List[_Entry], text: str, start: int, key_end: Optional[int], end: int) -> None:
+        """Ajoute l'élément text[start:end] (clé éventuelle avant key_end)"""
+        if key_end is not None:
+            key = text[start:key_end].strip()
+            raw = text[key_end + 1:end].strip()
+        else:
+            key = None
+            raw = text[start:end].strip()
+        
+        # Tuple vide "()"
+        if key is None and not raw and not entries and end == len(text) - 1:
+            return
+        
+        entries.append(_Entry(key, raw, quoted=raw.startswith('"')))
+    
+    @staticmethod
+    def _decode_entry(entry: _Entry) -> Any:
+        """Décode la valeur d'un élément au premier accès"""
+        if entry.value is _UNDECODED:
+            raw = entry.raw
+            if raw.startswith('('):
+                entry.value = ArkTuple(raw)
+            elif entry.quoted and len(raw) >= 2 and raw.endswith('"'):
+                entry.value = raw[1:-1].replace('\\"', '"')
+            else:
+                entry.value = raw
+        return entry.value
+    
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+    
+    def _find(self, key: Union[str, int]) -> _Entry:
+        """Retourne l'élément correspondant à une clé ou une position"""
+        entries = self._split()
+        if isinstance(key, int):
+            return entries[key]
+        for entry in entries:
+            if entry.key == key:
+                return entry
+        raise KeyError(key)
+    
+    def __getitem__(self, key: Union[str, int]) -> Any:
+        return self._decode_entry(self._find(key))
+    
+    def __setitem__(self, key: Union[str, int], value: Any) -> None:
+        try:
+            entry = self._find(key)
+        except KeyError:
+            self.append(value, key=key)
+            return
+        entry.value = value
+        entry.raw = None
+        self._dirty = True
+    
+    def __delitem__(self, key: Union[str, int]) -> None:
+        entry = self._find(key)
+        self._entries.remove(entry)
+        self._dirty = True
+    
+    def __contains__(self, key: str) -> bool:
+        return any(entry.key == key for entry in self._split())
+    
+    def __len__(self) -> int:
+        return len(self._split())
+    
+    def __iter__(self) -> Iterator[Any]:
+        """Itère sur les valeurs (comme une liste)"""
+        for entry in self._split():
+            yield self._decode_entry(entry)
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ArkTuple):
+            return self.to_ark() == other.to_ark()
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"ArkTuple({self.to_ark()!r})"
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Retourne la valeur d'une clé, ou default si absente"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def keys(self) -> List[Optional[str]]:
+        """Clés des éléments (None pour les éléments de liste)"""
+        return [entry.key for entry in self._split()]
+    
+    def items(self) -> List[Tuple[Optional[str], Any]]:
+        """Paires (clé, valeur) décodées"""
+        return [(entry.key, self._decode_entry(entry)) for entry in self._split()]
+    
+    @property
+    def is_struct(self) -> bool:
+        """True si tous les éléments sont nommés (Key=Value)"""
+        entries = self._split()
+        return bool(entries) and all(entry.key is not None for entry in entries)
+    
+    def append(self, value: Any, key: Optional[str] = None) -> None:
+        """
+        Ajoute un élément en fin de tuple
+        
+        Args:
+            value: Valeur (str, nombre, bool, ArkTuple, list ou dict)
+            key: Clé pour un élément nommé, None pour un élément de liste
+        """
+        self._split().append(_Entry(key, None, value))
+        self._dirty = True
+    
+    # ------------------------------------------------------------------
+    # Réécriture
+    # ------------------------------------------------------------------
+    
+    @property
+    def modified(self) -> bool:
+        """True si ce tuple ou l'un de ses sous-tuples décodés a été modifié"""
+        if self._dirty:
+            return True
+        if self._entries is None:
+            return False
+        return any(isinstance(entry.value, ArkTuple) and entry.value.modified for entry in self._entries)
+    
+    def to_ark(self) -> str:
+        """
+        Sérialise le tuple au format ARK
+        
+        Les éléments non modifiés reprennent leur texte d'origine.
+        """
+        if not self.modified:
+            return self._raw.strip()
+        
+        parts = []
+        for entry in self._entries:
+            if entry.raw is not None and not (isinstance(entry.value, ArkTuple) and entry.value.modified):
+                text = entry.raw
+            else:
+                text = encode_ark_value(entry.value, quoted=entry.quoted)
+            parts.append(text if entry.key is None else f"{entry.key}={text}")
+        
+        return "(" + ",".join(parts) + ")"
+
+
+def decode_ark_value(raw: str) -> Union[ArkTuple, str]:
+    """
+    Décode une valeur de ligne INI ARK
+    
+    Args:
+        raw: Partie droite d'une ligne key=value
+    
+    Returns:
+        ArkTuple (décodé à la demande) si la valeur est entre parenthèses, sinon raw inchangé
+    """
+    if raw.lstrip().startswith('('):
+        return ArkTuple(raw)
+    return raw
+
+
+def encode_ark_value(value: Any, quoted: bool = False) -> str:
+    """
+    Sérialise une valeur Python au format ARK
+    
+    Args:
+        value: str, nombre, bool, ArkTuple, list (liste ARK) ou dict (structure ARK)
+        quoted: Force les guillemets autour d'une chaîne
+    
+    Returns:
+        Texte ARK
+    """
+    if isinstance(value, ArkTuple):
+        return value.to_ark()
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, dict):
+        return "(" + ",".join(f"{key}={encode_ark_value(val)}" for key, val in value.items()) + ")"
+    if isinstance(value, (list, tuple)):
+        return "(" + ",".join(encode_ark_value(val) for val in value) + ")"
+    
+    text = str(value)
+    if quoted or not text or _NEEDS_QUOTES_RE.search(text):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
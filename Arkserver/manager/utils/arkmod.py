@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Métadonnées des mods ARK : lecture de mod.info / modmeta.info et
+génération du fichier <id>.mod attendu par le serveur (format arkmanager)
+"""
+
+import struct
+from typing import Dict, List, Tuple
+
+_INT32 = struct.Struct('<i')
+
+# Constantes du format .mod (identiques à celles écrites par le devkit)
+_MOD_MAGIC = 4280483635
+_MOD_VERSION = 2
+
+# Chemin du mod relatif au binaire du serveur, écrit après le nom
+_MOD_PATH = "../../../ShooterGame/Content/Mods/{mod_id}"
+
+# modmeta.info absent : mod standard
+DEFAULT_META = {"ModType": "1"}
+
+
+class _Reader:
+    """Lecture séquentielle de chaînes UE4 dans un buffer"""
+    
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+    
+    def int32(self) -> int:
+        if self.pos + 4 > len(self.data):
+            raise ValueError("fichier tronqué")
+        value = _INT32.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return value
+    
+    def string(self) -> str:
+        """FString UE4 : longueur (négative = UTF-16) puis caractères terminés par un zéro"""
+        count = self.int32()
+        if count == 0:
+            return ""
+        if count < 0:
+            size, encoding = -count * 2, 'utf-16-le'
+        else:
+            size, encoding = count, 'utf-8'
+        if self.pos + size > len(self.data):
+            raise ValueError("fichier tronqué")
+        raw = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return raw.decode(encoding, errors='replace').rstrip('\0')
+
+
+def _ue4_string(value: str) -> bytes:
+    if value.isascii():
+        return _INT32.pack(len(value) + 1) + value.encode('ascii') + b'\0'
+    encoded = (value + '\0').encode('utf-16-le')
+    return _INT32.pack(-(len(encoded) // 2)) + encoded
+
+
+def read_mod_info(data: bytes) -> Tuple[str, List[str]]:
+    """
+    Parse mod.info
+    
+    Args:
+        data: Contenu du fichier
+    
+    Returns:
+        (nom du mod, cartes fournies par le mod)
+    
+    Raises:
+        ValueError: Fichier tronqué
+    """
+    reader = _Reader(data)
+    name = reader.string()
+    maps = [reader.string() for _ in range(reader.int32())]
+    return name, [map_name for map_name in maps if map_name]
+
+
+def read_modmeta(data: bytes) -> Dict[str, str]:
+    """
+    Parse modmeta.info
+    
+    Args:
+        data: Contenu du fichier
+    
+    Returns:
+        Paires clé/valeur (ex: {"ModType": "1"})
+    
+    Raises:
+        ValueError: Fichier tronqué
+    """
+    reader = _Reader(data)
+    meta = {}
+    for _ in range(reader.int32()):
+        key = reader.string()
+        meta[key] = reader.string()
+    return meta
+
+
+def build_mod_file(mod_id: str, name: str, maps: List[str], meta: Dict[str, str]) -> bytes:
+    """
+    Construit le contenu de ShooterGame/Content/Mods/<id>.mod
+    
+    Args:
+        mod_id: ID workshop du mod
+        name: Nom du mod (mod.info)
+        maps: Cartes du mod (mod.info)
+        meta: Métadonnées (modmeta.info)
+    
+    Returns:
+        Contenu binaire du fichier
+    """
+    parts = [struct.pack('<Q', int(mod_id)), _ue4_string(name), _ue4_string(_MOD_PATH.format(mod_id=mod_id))]
+    parts.append(_INT32.pack(len(maps)))
+    parts.extend(_ue4_string(map_name) for map_name in maps)
+    parts.append(struct.pack('<Ii', _MOD_MAGIC, _MOD_VERSION))
+    parts.append(b'\x01' if "ModType" in meta else b'\x00')
+    parts.append(_INT32.pack(len(meta)))
+    for key, value in meta.items():
+        parts.append(_ue4_string(key) + _ue4_string(value))
+    return b"".join(parts)
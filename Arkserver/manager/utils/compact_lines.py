@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Stockage compact de lignes de texte
+Un seul buffer d'octets + un tableau d'offsets, au lieu d'un objet str par ligne
+"""
+
+from array import array
+from typing import Iterable, Iterator, List
+
+
+class CompactLines:
+    """
+    Séquence de lignes stockées dans un bytearray UTF-8
+    
+    Chaque ligne est décodée à la lecture uniquement. Utilisé par ArkINIParser
+    (compact=True) pour les gros fichiers d'overrides, où le coût mémoire d'un
+    objet str par ligne dépasse largement la taille du texte lui-même.
+    """
+    
+    __slots__ = ('_buf', '_offsets')
+    
+    def __init__(self, lines: Iterable[str] = ()):
+        """
+        Args:
+            lines: Lignes initiales (fin de ligne incluse)
+        """
+        self._buf = bytearray()
+        self._offsets = array('I', [0])  # début de chaque ligne + fin du buffer
+        self.extend(lines)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'CompactLines':
+        """
+        Construit la séquence depuis un contenu brut, découpé sur '\\n'
+        
+        Args:
+            data: Octets UTF-8 (les fins de ligne sont conservées telles quelles)
+        
+        Returns:
+            Nouvelle séquence
+        """
+        lines = cls()
+        lines._buf = bytearray(data)
+        offsets = lines._offsets
+        pos = data.find(b'\n')
+        while pos != -1:
+            offsets.append(pos + 1)
+            pos = data.find(b'\n', pos + 1)
+        if offsets[-1] != len(data):
+            offsets.append(len(data))
+        return lines
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._buf[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+    
+    def __setitem__(self, index: int, line: str) -> None:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        
+        data = line.encode('utf-8')
+        start, end = self._offsets[index], self._offsets[index + 1]
+        self._buf[start:end] = data
+        
+        # Décaler les offsets suivants si la longueur a changé
+        delta = len(data) - (end - start)
+        if delta:
+            offsets = self._offsets
+            for idx in range(index + 1, len(offsets)):
+                offsets[idx] += delta
+    
+    def __iter__(self) -> Iterator[str]:
+        buf, offsets = self._buf, self._offsets
+        for idx in range(len(offsets) - 1):
+            yield buf[offsets[idx]:offsets[idx + 1]].decode('utf-8')
+    
+    def append(self, line: str) -> None:
+        """Ajoute une ligne (fin de ligne incluse)"""
+        self._buf += line.encode('utf-8')
+        self._offsets.append(len(self._buf))
+    
+    def extend(self, lines: Iterable[str]) -> None:
+        """Ajoute plusieurs lignes"""
+        for line in lines:
+            self.append(line)
+    
+    def pop(self) -> str:
+        """Retire et retourne la dernière ligne"""
+        line = self[-1]
+        del self._buf[self._offsets[-2]:]
+        self._offsets.pop()
+        return line
+    
+    def byte_offset(self, index: int) -> int:
+        """Position en octets du début de la ligne index (len(self) = fin du buffer)"""
+        return self._offsets[index]
+    
+    def to_list(self) -> List[str]:
+        """Retourne les lignes décodées"""
+        return list(self)
+    
+    def to_bytes(self) -> bytes:
+        """Retourne le contenu brut (toutes les lignes concaténées)"""
+        return bytes(self._buf)
+    
+    def nbytes(self) -> int:
+        """Taille du stockage (buffer + offsets), en octets"""
+        return len(self._buf) + self._offsets.itemsize * len(self._offsets)
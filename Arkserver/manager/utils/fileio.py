@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Écriture sûre des fichiers de configuration
+Fichier temporaire + fsync + rename : un crash laisse l'ancien ou le nouveau contenu, jamais un mélange
+Réécriture partielle (pwrite) des seules zones modifiées pour les gros fichiers
+"""
+
+import os
+import stat
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+
+def fsync_dir(directory: str) -> None:
+    """
+    Force l'écriture sur disque de l'entrée de répertoire (après un rename)
+    
+    Args:
+        directory: Chemin du dossier
+    """
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        # Certains systèmes de fichiers ne supportent pas fsync sur un dossier
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def atomic_write(file_path: str, content: Union[str, bytes], encoding: str = 'utf-8') -> None:
+    """
+    Remplace atomiquement le contenu d'un fichier
+    
+    Le contenu est écrit dans un fichier temporaire du même dossier, synchronisé
+    (fsync) puis renommé sur la cible. Les permissions du fichier existant sont conservées.
+    
+    Args:
+        file_path: Chemin du fichier cible
+        content: Contenu complet (str encodé avec encoding, ou bytes)
+        encoding: Encodage utilisé si content est un str
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    directory = os.path.dirname(os.path.abspath(file_path))
+    
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(file_path)}.",
+        suffix=".tmp",
+        dir=directory
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Conserver permissions et propriétaire du fichier remplacé
+        try:
+            st = os.stat(file_path)
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+            try:
+                os.chown(tmp_path, st.st_uid, st.st_gid)
+            except OSError:
+                pass
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    fsync_dir(directory)
+
+
+def pwrite_regions(file_path: str, regions: List[Tuple[int, bytes]], truncate_at: Optional[int] = None) -> int:
+    """
+    Réécrit en place des zones d'un fichier existant (pwrite), puis fsync
+    
+    Contrairement à atomic_write, l'écriture n'est pas atomique : à réserver
+    aux gros fichiers dont seule une petite partie change.
+    
+    Args:
+        file_path: Chemin du fichier
+        regions: Liste de (offset, octets) à écrire
+        truncate_at: Nouvelle taille du fichier (None = inchangée)
+        
+    Returns:
+        Nombre d'octets écrits
+    """
+    written = 0
+    fd = os.open(file_path, os.O_WRONLY)
+    try:
+        for offset, data in regions:
+            view = memoryview(data)
+            while view:
+                count = os.pwrite(fd, view, offset)
+                view = view[count:]
+                offset += count
+                written += count
+        if truncate_at is not None:
+            os.ftruncate(fd, truncate_at)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return written
+
+
+def _common_prefix_len(a: bytes, b: bytes) -> int:
+    """Longueur du préfixe commun de deux contenus (comparaison par dichotomie)"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def write_changed(file_path: str, content: Union[str, bytes], encoding: str = 'utf-8') -> int:
+    """
+    Écrit un fichier en ne réécrivant que la zone qui diffère du contenu actuel
+    
+    - contenu identique : aucune écriture
+    - même taille : pwrite de la seule zone modifiée
+    - taille différente : réécriture à partir du premier octet modifié
+    - fichier absent : atomic_write
+    
+    Args:
+        file_path: Chemin du fichier
+        content: Nouveau contenu complet
+        encoding: Encodage utilisé si content est un str
+        
+    Returns:
+        Nombre d'octets écrits
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    
+    try:
+        with open(file_path, 'rb') as f:
+            current = f.read()
+    except FileNotFoundError:
+        atomic_write(file_path, data)
+        return len(data)
+    
+    if current == data:
+        return 0
+    
+    start = _common_prefix_len(current, data)
+    if len(current) == len(data):
+        # Même taille : s'arrêter au dernier octet différent
+        end = len(data) - _common_prefix_len(current[start:][::-1], data[start:][::-1])
+        return pwrite_regions(file_path, [(start, data[start:end])])
+    
+    return pwrite_regions(file_path, [(start, data[start:])], truncate_at=len(data))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Empreintes d'arborescences (Merkle) mémorisées sur disque
+Empreinte d'un dossier = hash de ses fichiers (chemin, taille, mtime_ns,
+contenu en option) et des empreintes de ses sous-dossiers. Un dossier dont
+le mtime n'a pas changé n'est pas relu : un stat par dossier suffit
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fileio import atomic_write
+from .parse_cache import PARSE_CACHE
+
+_HASH_BLOCK = 1024 * 1024
+
+
+def _content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FingerprintCache:
+    """
+    Empreintes d'arborescences par clé (ex: ID de mod), persistées en JSON
+    
+    Pour chaque dossier de l'arborescence, le cache garde son mtime, le hash
+    de ses fichiers et la liste de ses sous-dossiers. Ajouter, supprimer ou
+    remplacer (rename) un fichier change le mtime du dossier parent : seuls
+    ces dossiers sont relus. Une réécriture en place sans rename n'est vue
+    qu'en mode content=True sur un dossier relu.
+    
+    Des données libres peuvent être associées à chaque clé (get_data/set_data),
+    par exemple le résultat d'une validation pour une empreinte donnée.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Args:
+            file_path: Fichier JSON du cache
+        """
+        self.file_path = file_path
+        self._trees: Dict[str, Dict[str, Any]] = {}
+        self._data: Dict[str, Any] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_file(cls, file_path: str) -> 'FingerprintCache':
+        """
+        Charge le cache (vide si absent ou corrompu)
+        
+        Args:
+            file_path: Fichier JSON du cache
+        
+        Returns:
+            Cache
+        """
+        cache = cls(file_path)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                document = json.load(f)
+            cache._trees = document.get("trees", {})
+            cache._data = document.get("data", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, AttributeError):
+            # Cache illisible : tout sera recalculé
+            cache._dirty = True
+        return cache
+    
+    def _scan_dir(self, path: str, cached: Optional[Dict[str, Any]],
+                  content: bool) -> Tuple[str, List[str], Optional[Dict[str, list]]]:
+        """Relit un dossier : (hash des fichiers, sous-dossiers, fichiers si content)"""
+        previous = (cached or {}).get("files") or {}
+        files = []
+        dirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    st = entry.stat()
+                    record = [st.st_size, st.st_mtime_ns, None]
+                    if content:
+                        old = previous.get(entry.name)
+                        if old and old[:2] == record[:2]:
+                            record[2] = old[2]
+                        else:
+                            record[2] = _content_hash(entry.path)
+                    files.append((entry.name, record))
+        
+        files.sort()
+        digest = hashlib.sha256()
+        for name, (size, mtime_ns, content_hash) in files:
+            digest.update(f"f\0{name}\0{size}\0{mtime_ns}\0{content_hash or ''}\n".encode('utf-8', 'surrogateescape'))
+        return digest.hexdigest(), sorted(dirs), dict(files) if content else None
+    
+    def _tree_digest(self, path: str, rel: str, old: Dict[str, Any], new: Dict[str, Any],
+                     content: bool) -> str:
+        st = os.stat(path)
+        cached = old.get(rel)
+        
+        if cached is not None and cached["mtime_ns"] == st.st_mtime_ns:
+            files_digest, dirs, files = cached["files_digest"], cached["dirs"], cached.get("files")
+        else:
+            files_digest, dirs, files = self._scan_dir(path, cached, content)
+        
+        digest = hashlib.sha256(f"d\0{files_digest}\n".encode('ascii'))
+        for name in dirs:
+            child = self._tree_digest(os.path.join(path, name), f"{rel}/{name}" if rel else name, old, new, content)
+            digest.update(f"{name}\0{child}\n".encode('utf-8', 'surrogateescape'))
+        
+        entry = {"mtime_ns": st.st_mtime_ns, "files_digest": files_digest, "dirs": dirs}
+        if files is not None:
+            entry["files"] = files
+        new[rel] = entry
+        return digest.hexdigest()
+    
+    def fingerprint(self, key: str, root: str, content: bool = False) -> Optional[str]:
+        """
+        Empreinte d'une arborescence, recalculée seulement pour les dossiers modifiés
+        
+        Args:
+            key: Clé de l'arborescence dans le cache
+            root: Dossier racine
+            content: Inclure le SHA-256 du contenu des fichiers
+        
+        Returns:
+            Empreinte hexadécimale, ou None si root n'existe pas
+        """
+        with self._lock:
+            tree = self._trees.get(key)
+        old = tree["dirs"] if tree and tree.get("root") == root and tree.get("content") == content else {}
+        new: Dict[str, Any] = {}
+        
+        try:
+            digest = self._tree_digest(root, "", old, new, content)
+        except FileNotFoundError:
+            digest = None
+        
+        with self._lock:
+            if digest is None:
+                if self._trees.pop(key, None) is not None:
+                    self._dirty = True
+            elif new != old:
+                self._trees[key] = {"root": root, "content": content, "digest": digest, "dirs": new}
+                self._dirty = True
+        return digest
+    
+    def get_data(self, key: str) -> Any:
+        """Données associées à une clé (None si aucune)"""
+        with self._lock:
+            return self._data.get(key)
+    
+    def set_data(self, key: str, value: Any) -> None:
+        """Associe des données (sérialisables en JSON) à une clé"""
+        with self._lock:
+            if self._data.get(key) != value:
+                self._data[key] = value
+                self._dirty = True
+    
+    def forget(self, key: str) -> None:
+        """Supprime l'arborescence et les données d'une clé"""
+        with self._lock:
+            removed = [self._trees.pop(key, None), self._data.pop(key, None)]
+            if any(value is not None for value in removed):
+                self._dirty = True
+    
+    def keys(self) -> List[str]:
+        """Clés connues du cache"""
+        with self._lock:
+            return list(self._trees.keys() | self._data.keys())
+    
+    def save(self) -> bool:
+        """
+        Écrit le cache s'il a changé (atomique) et met à jour le cache de parsing
+        
+        Returns:
+            True si le fichier a été écrit
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            document = json.dumps({"trees": self._trees, "data": self._data}, separators=(',', ':'))
+            self._dirty = False
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        atomic_write(self.file_path, document)
+        PARSE_CACHE.revalidate(self.file_path, self)
+        return True
+
+
+def load_fingerprint_cache(file_path: str) -> FingerprintCache:
+    """
+    Retourne le cache partagé d'un fichier, relu seulement s'il a changé
+    
+    Args:
+        file_path: Fichier JSON du cache
+    
+    Returns:
+        Cache partagé (appeler save() après modification)
+    """
+    return PARSE_CACHE.get(file_path, FingerprintCache.from_file)
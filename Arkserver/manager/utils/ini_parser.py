@@ -4,50 +4,295 @@ Parser INI spécialisé pour les fichiers de configuration ARK
 Gère les particularités du format ARK (sections complexes, lignes longues, clés répétées)
 """
 
+import codecs
+import hashlib
+import mmap
+import os
 import re
-from typing import Dict, List, Tuple, Optional
+from array import array
+from contextlib import contextmanager
+from typing import IO, Any, Dict, Iterator, List, Tuple, Optional, Union
+
+from .ark_values import ArkTuple, decode_ark_value
+from .compact_lines import CompactLines
+from .fileio import atomic_write, pwrite_regions
+from .parse_cache import PARSE_CACHE, FileSignature, file_signature
+
+
+class IniMergeConflict(Exception):
+    """
+    Le fichier a été modifié sur disque depuis read() et les modifications en
+    cours touchent les mêmes clés avec des valeurs différentes
+    """
+    
+    def __init__(self, file_path: str, conflicts: List[Dict[str, Any]]):
+        """
+        Args:
+            file_path: Fichier concerné
+            conflicts: Liste de dict avec: section, key, base, ours, theirs
+        """
+        keys = ", ".join(f"[{c['section']}] {c['key']}" for c in conflicts)
+        super().__init__(f"{file_path} modifié sur disque, conflit sur: {keys}")
+        self.file_path = file_path
+        self.conflicts = conflicts
 
 
 class ArkINIParser:
     """
     Parser conservateur pour les fichiers INI d'ARK
     Préserve la structure exacte du fichier, y compris les lignes complexes
+    
+    Les lignes sont stockées par blocs : le bloc 0 contient les lignes situées
+    avant la première section, chaque bloc suivant commence par son en-tête
+    [Section]. Une insertion ne touche que le bloc de sa section, sans
+    décaler les indices des autres sections.
+    
+    En mode lazy, le fichier est mappé en mémoire (mmap) : read() ne repère que
+    les en-têtes de section, et les lignes d'un bloc ne sont décodées qu'au
+    premier accès à sa section. Les blocs jamais décodés sont réécrits octet
+    pour octet depuis le mapping.
+    
+    En mode compact, chaque bloc est stocké dans un buffer d'octets unique
+    (CompactLines) au lieu d'une liste de str : les lignes ne sont décodées
+    qu'à la lecture.
+    
+    Les modifications sont journalisées (valeur avant/après) et les lignes
+    touchées marquées : write() détecte une modification concurrente du
+    fichier depuis read() et fusionne (3-way) au lieu d'écraser, et
+    write_in_place() ne réécrit que les zones modifiées.
     """
     
-    def __init__(self, file_path: str):
+    # Détection de section : [SectionName] en début de ligne (espaces tolérés)
+    SECTION_RE = re.compile(rb'^[ \t\f\v]*\[(.+)\]', re.MULTILINE)
+    
+    def __init__(self, file_path: str, lazy: bool = False, compact: bool = False):
         """
         Initialise le parser avec un fichier INI
         
         Args:
             file_path: Chemin absolu vers le fichier INI
+            lazy: True pour mapper le fichier et décoder les sections à la demande
+            compact: True pour stocker les lignes dans des buffers d'octets (CompactLines)
         """
         self.file_path = file_path
-        self.lines: List[str] = []
-        self.sections: Dict[str, List[int]] = {}  # section_name -> [line_indices]
+        self.lazy = lazy
+        self.compact = compact
+        self._data = b''  # contenu brut (mmap en mode lazy), source des blocs non décodés
+        # bloc 0 = lignes avant la première section ; None = bloc pas encore décodé
+        self._blocks: List[Optional[Union[List[str], CompactLines]]] = [[]]
+        self._raw_ranges: List[Optional[Tuple[int, int]]] = [None]  # bloc -> (début, fin) dans _data
+        self._block_sections: List[Optional[str]] = [None]  # bloc -> nom de section
+        self._section_blocks: Dict[str, List[int]] = {}  # section_name -> [block_ids]
+        # (section, key) -> positions (block_id << 32 | line_offset) des blocs décodés
+        # array('Q') plutôt qu'une liste de tuples : 8 octets par ligne indexée
+        self._key_index: Dict[Tuple[str, str], array] = {}
+        # (block_id, line_offset) -> (ligne source, valeur décodée) : cache de get_structs
+        self._value_cache: Dict[Tuple[int, int], Tuple[str, Any]] = {}
+        # État du fichier au moment de read() : détection des modifications concurrentes
+        self._signature: Optional[FileSignature] = None
+        self._content_hash: Optional[str] = None  # non calculé en mode lazy
+        # Journal des modifications depuis read() : (type, section, key, avant, après)
+        self._changes: List[Tuple[str, str, Optional[str], Any, Any]] = []
+        # block_id -> [première, dernière] ligne modifiée depuis read()
+        self._dirty: Dict[int, List[int]] = {}
         
     def read(self) -> None:
         """
-        Lit le fichier INI et construit l'index des sections
+        Lit le fichier INI et construit l'index des sections et des clés
+        
+        En mode lazy, seuls les en-têtes de section sont repérés ici.
         """
+        self.close()
+        self._blocks = [[]]
+        self._raw_ranges = [None]
+        self._block_sections = [None]
+        self._section_blocks = {}
+        self._key_index = {}
+        self._value_cache = {}
+        self._signature = None
+        self._content_hash = None
+        self._changes = []
+        self._dirty = {}
+        
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                self.lines = f.readlines()
+            with open(self.file_path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                self._signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+                if not self.lazy:
+                    data = f.read()
+                    self._content_hash = self._hash(data)
+                elif st.st_size > 0:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = b''
         except FileNotFoundError:
-            self.lines = []
             return
+        
+        # Découpage en blocs sur les en-têtes de section
+        header_offsets = [0]
+        for match in self.SECTION_RE.finditer(data):
+            header_offsets.append(match.start())
+            self._new_block(match.group(1).decode('utf-8'))
+        header_offsets.append(len(data))
+        
+        self._data = data
+        self._raw_ranges = [
+            (header_offsets[idx], header_offsets[idx + 1])
+            for idx in range(len(header_offsets) - 1)
+        ]
+        # Aucun bloc n'est encore décodé
+        self._blocks = [None] * len(self._raw_ranges)
+        
+        if not self.lazy:
+            for block_id in range(len(self._blocks)):
+                self._decode_block(block_id)
+            self._data = b''
+    
+    def close(self) -> None:
+        """
+        Libère le mapping mémoire (mode lazy)
+        
+        Les blocs non décodés deviennent inaccessibles : relire avec read().
+        """
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = b''
+    
+    def _decode_block(self, block_id: int) -> None:
+        """
+        Décode les lignes d'un bloc depuis le contenu brut et les indexe
+        
+        Args:
+            block_id: Bloc à décoder
+        """
+        start, end = self._raw_ranges[block_id]
+        
+        # Découpage sur '\n' uniquement : les fins de ligne (\r\n) sont conservées telles quelles
+        if self.compact:
+            block = CompactLines.from_bytes(self._data[start:end])
+        else:
+            block = [line + '\n' for line in self._data[start:end].decode('utf-8').split('\n')]
+            block[-1] = block[-1][:-1]
+            if not block[-1]:
+                block.pop()
+        
+        self._blocks[block_id] = block
+        if self._block_sections[block_id] is not None:
+            # La ligne 0 est l'en-tête [Section]
+            for offset in range(1, len(block)):
+                self._index_line(block_id, offset)
+    
+    def _ensure_section(self, section: str) -> None:
+        """Décode les blocs d'une section qui ne l'ont pas encore été (mode lazy)"""
+        for block_id in self._section_blocks.get(section, []):
+            if self._blocks[block_id] is None:
+                self._decode_block(block_id)
+    
+    def _ensure_all(self) -> None:
+        """Décode tous les blocs qui ne l'ont pas encore été (mode lazy)"""
+        for block_id, block in enumerate(self._blocks):
+            if block is None:
+                self._decode_block(block_id)
+    
+    @property
+    def lines(self) -> List[str]:
+        """
+        Vue à plat de toutes les lignes du fichier (copie, reconstruite à chaque appel)
+        """
+        self._ensure_all()
+        return [line for block in self._blocks for line in block]
+    
+    @property
+    def sections(self) -> Dict[str, List[int]]:
+        """
+        Vue section_name -> [indices de lignes dans self.lines] (hors en-têtes)
+        
+        Reconstruite à chaque appel : à réserver à l'affichage et au diagnostic
+        """
+        self._ensure_all()
+        sections: Dict[str, List[int]] = {name: [] for name in self._section_blocks}
+        start = 0
+        for block_id, block in enumerate(self._blocks):
+            section = self._block_sections[block_id]
+            if section is not None:
+                sections[section].extend(range(start + 1, start + len(block)))
+            start += len(block)
+        return sections
+    
+    def section_names(self) -> List[str]:
+        """Retourne les noms de sections, dans l'ordre du fichier, sans rien décoder"""
+        return list(self._section_blocks)
+    
+    def _make_block(self, lines: List[str]) -> Union[List[str], CompactLines]:
+        """Construit un bloc dans la représentation du parser (liste ou CompactLines)"""
+        return CompactLines(lines) if self.compact else lines
+    
+    def _new_block(self, section: str) -> Union[List[str], CompactLines]:
+        """
+        Crée un bloc vide rattaché à une section
+        
+        Args:
+            section: Nom de la section
             
-        current_section = None
+        Returns:
+            Les lignes (vides) du nouveau bloc
+        """
+        block = self._make_block([])
+        self._blocks.append(block)
+        self._raw_ranges.append(None)
+        self._block_sections.append(section)
+        self._section_blocks.setdefault(section, []).append(len(self._blocks) - 1)
+        return block
+    
+    @staticmethod
+    def _parse_key(line: str) -> Optional[str]:
+        """
+        Extrait la clé d'une ligne key=value
         
-        for idx, line in enumerate(self.lines):
-            # Détection de section : [SectionName]
-            section_match = re.match(r'^\[(.+)\]', line.strip())
-            if section_match:
-                current_section = section_match.group(1)
-                if current_section not in self.sections:
-                    self.sections[current_section] = []
-            elif current_section:
-                # Ligne appartient à la section courante
-                self.sections[current_section].append(idx)
+        Args:
+            line: Ligne brute du fichier
+            
+        Returns:
+            La clé, ou None pour une ligne vide, un commentaire ou une ligne sans '='
+        """
+        line = line.strip()
+        if not line or line.startswith('#') or line.startswith(';'):
+            return None
+        if '=' not in line:
+            return None
+        return line.split('=', 1)[0]
+    
+    def _index_line(self, block_id: int, offset: int) -> None:
+        """
+        Ajoute une ligne à l'index (section, clé) -> [(bloc, position)]
+        
+        Args:
+            block_id: Bloc contenant la ligne
+            offset: Position de la ligne dans le bloc
+        """
+        key = self._parse_key(self._blocks[block_id][offset])
+        if key is not None:
+            section = self._block_sections[block_id]
+            positions = self._key_index.get((section, key))
+            if positions is None:
+                positions = self._key_index[(section, key)] = array('Q')
+            positions.append(block_id << 32 | offset)
+    
+    def _positions(self, section: str, key: str) -> List[Tuple[int, int]]:
+        """Retourne les positions (block_id, line_offset) d'une clé, dans l'ordre du fichier"""
+        return [(packed >> 32, packed & 0xFFFFFFFF) for packed in self._key_index.get((section, key), ())]
+    
+    def _first_position(self, section: str, key: str) -> Optional[Tuple[int, int]]:
+        """Retourne la position de la première occurrence d'une clé, ou None"""
+        positions = self._key_index.get((section, key))
+        if not positions:
+            return None
+        return positions[0] >> 32, positions[0] & 0xFFFFFFFF
+    
+    def _line_value(self, position: Tuple[int, int]) -> str:
+        """Retourne la partie valeur d'une ligne key=value indexée"""
+        block_id, offset = position
+        return self._blocks[block_id][offset].strip().split('=', 1)[1]
     
     def get_value(self, section: str, key: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -61,22 +306,12 @@ class ArkINIParser:
         Returns:
             La valeur de la clé ou default si non trouvée
         """
-        if section not in self.sections:
+        self._ensure_section(section)
+        position = self._first_position(section, key)
+        if position is None:
             return default
             
-        for line_idx in self.sections[section]:
-            line = self.lines[line_idx].strip()
-            
-            # Ignore les lignes vides et commentaires
-            if not line or line.startswith('#') or line.startswith(';'):
-                continue
-                
-            # Parse key=value
-            match = re.match(rf'^{re.escape(key)}=(.*)$', line)
-            if match:
-                return match.group(1)
-                
-        return default
+        return self._line_value(position)
     
     def set_value(self, section: str, key: str, value: str) -> bool:
         """
@@ -92,28 +327,114 @@ class ArkINIParser:
             True si la modification a réussi, False sinon
         """
         # Si la section n'existe pas, on ne peut pas modifier
-        if section not in self.sections:
+        if section not in self._section_blocks:
             return False
             
         # Chercher la clé existante
-        for line_idx in self.sections[section]:
-            line = self.lines[line_idx].strip()
-            
-            if line.startswith(key + '='):
-                # Modifier la ligne existante
-                self.lines[line_idx] = f"{key}={value}\n"
-                return True
-        
-        # Clé non trouvée : ajouter à la fin de la section
-        if self.sections[section]:
-            last_line_idx = self.sections[section][-1]
-            # Insérer après la dernière ligne de la section
-            self.lines.insert(last_line_idx + 1, f"{key}={value}\n")
-            # Mettre à jour les indices de toutes les sections suivantes
-            self._update_section_indices_after_insert(last_line_idx + 1)
+        self._ensure_section(section)
+        position = self._first_position(section, key)
+        if position is not None:
+            # Modifier la ligne existante
+            block_id, offset = position
+            self._changes.append(('set', section, key, self._line_value(position), value))
+            self._blocks[block_id][offset] = f"{key}={value}\n"
+            self._mark_dirty(block_id, offset, offset)
+            return True
+        
+        # Clé non trouvée : ajouter à la fin du dernier bloc de la section
+        self._changes.append(('set', section, key, None, value))
+        block_id = self._section_blocks[section][-1]
+        block = self._blocks[block_id]
+        block.append(f"{key}={value}\n")
+        self._index_line(block_id, len(block) - 1)
+        self._mark_dirty(block_id, len(block) - 1, len(block) - 1)
+        
+        return True
+    
+    def _mark_dirty(self, block_id: int, first: int, last: int) -> None:
+        """
+        Marque des lignes d'un bloc comme modifiées depuis read()
+        
+        Args:
+            block_id: Bloc modifié
+            first: Première ligne modifiée
+            last: Dernière ligne modifiée
+        """
+        dirty = self._dirty.get(block_id)
+        if dirty is None:
+            self._dirty[block_id] = [first, last]
+        else:
+            dirty[0] = min(dirty[0], first)
+            dirty[1] = max(dirty[1], last)
+    
+    def set_all_values(self, section: str, key: str, values: List[str]) -> bool:
+        """
+        Remplace toutes les valeurs d'une clé répétée (pour les arrays ARK)
+        
+        Les anciennes lignes sont supprimées et les nouvelles insérées, dans
+        l'ordre, à la place de la première occurrence (ou en fin de section si
+        la clé n'existait pas). Une seule passe sur la section, un seul réindexage.
         
+        Args:
+            section: Nom de la section
+            key: Nom de la clé (ex: OverrideEngramEntries)
+            values: Nouvelles valeurs, dans l'ordre
+            
+        Returns:
+            True si la modification a réussi, False si la section n'existe pas
+        """
+        if section not in self._section_blocks:
+            return False
+        
+        self._ensure_section(section)
+        positions = self._positions(section, key)
+        new_lines = [f"{key}={value}\n" for value in values]
+        self._changes.append(('set_all', section, key, self.get_all_values(section, key), list(values)))
+        
+        if positions:
+            old_positions = set(positions)
+            touched_blocks = sorted({block_id for block_id, _ in positions})
+            for block_id in touched_blocks:
+                rebuilt = []
+                for offset, line in enumerate(self._blocks[block_id]):
+                    if (block_id, offset) not in old_positions:
+                        rebuilt.append(line)
+                    elif (block_id, offset) == positions[0]:
+                        rebuilt.extend(new_lines)
+                self._blocks[block_id] = self._make_block(rebuilt)
+                first_offset = min(offset for pos_block, offset in positions if pos_block == block_id)
+                self._mark_dirty(block_id, first_offset, max(first_offset, len(rebuilt) - 1))
+        else:
+            touched_blocks = [self._section_blocks[section][-1]]
+            block = self._blocks[touched_blocks[0]]
+            block.extend(new_lines)
+            self._mark_dirty(touched_blocks[0], len(block) - len(new_lines), len(block) - 1)
+        
+        self._reindex_section(section, touched_blocks)
         return True
     
+    def _reindex_section(self, section: str, touched_blocks: List[int]) -> None:
+        """
+        Reconstruit l'index des clés d'une section après une modification de ses blocs
+        
+        Args:
+            section: Section à réindexer
+            touched_blocks: Blocs dont les lignes ont bougé (leur cache de valeurs est vidé)
+        """
+        for index_key in [index_key for index_key in self._key_index if index_key[0] == section]:
+            del self._key_index[index_key]
+        
+        for block_id in self._section_blocks[section]:
+            for offset in range(1, len(self._blocks[block_id])):
+                self._index_line(block_id, offset)
+        
+        touched = set(touched_blocks)
+        self._value_cache = {
+            position: cached
+            for position, cached in self._value_cache.items()
+            if position[0] not in touched
+        }
+    
     def add_section(self, section: str) -> bool:
         """
         Ajoute une nouvelle section au fichier
@@ -124,12 +445,13 @@ class ArkINIParser:
         Returns:
             True si ajoutée, False si elle existe déjà
         """
-        if section in self.sections:
+        if section in self._section_blocks:
             return False
             
         # Ajouter la section à la fin du fichier
-        self.lines.append(f"\n[{section}]\n")
-        self.sections[section] = []
+        self._changes.append(('add_section', section, None, None, None))
+        self._new_block(section).append(f"\n[{section}]\n")
+        self._mark_dirty(len(self._blocks) - 1, 0, 0)
         
         return True
     
@@ -142,7 +464,7 @@ class ArkINIParser:
             key: Nom de la clé
             default_value: Valeur par défaut
         """
-        if section not in self.sections:
+        if section not in self._section_blocks:
             self.add_section(section)
             
         if self.get_value(section, key) is None:
@@ -151,22 +473,236 @@ class ArkINIParser:
     def write(self) -> None:
         """
         Écrit les modifications dans le fichier INI
+        
+        L'écriture est atomique (fichier temporaire + fsync + rename).
+        Les blocs non décodés (mode lazy) sont recopiés octet pour octet.
+        Si le fichier a été modifié sur disque depuis read(), les modifications
+        en cours sont fusionnées avec son contenu actuel (voir _merge_with_disk).
+        
+        Raises:
+            IniMergeConflict: Une même clé a été modifiée différemment des deux côtés
+        """
+        self._check_disk()
+        
+        chunks = [self._block_bytes(block_id) for block_id in range(len(self._blocks))]
+        data = b''.join(chunks)
+        
+        atomic_write(self.file_path, data)
+        self._after_write([len(chunk) for chunk in chunks], self._hash(data) if not self.lazy else None)
+        PARSE_CACHE.revalidate(self.file_path, self)
+    
+    def write_in_place(self) -> int:
+        """
+        Écrit uniquement les zones modifiées depuis read(), directement dans le fichier
+        
+        - tailles inchangées (ex: MaxPlayers=10 -> 20) : pwrite des seules lignes modifiées
+        - sinon : réécriture à partir de la première ligne modifiée, puis truncate
+        
+        Non atomique, contrairement à write() : destiné aux gros Game.ini dont
+        on ne modifie que quelques lignes. Même détection de modification
+        concurrente et fusion que write().
+        
+        Returns:
+            Nombre d'octets écrits
+            
+        Raises:
+            IniMergeConflict: Une même clé a été modifiée différemment des deux côtés
         """
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            f.writelines(self.lines)
+        self._check_disk()
+        
+        if not self._dirty:
+            return 0
+        if self._signature is None:
+            # Fichier absent : rien à réécrire en place
+            self.write()
+            return sum(end - start for start, end in self._raw_ranges)
+        
+        encoded = {block_id: self._block_bytes(block_id) for block_id in self._dirty}
+        sizes = [
+            len(encoded[block_id]) if block_id in encoded else end - start
+            for block_id, (start, end) in (
+                (block_id, self._raw_ranges[block_id] or (0, 0)) for block_id in range(len(self._blocks))
+            )
+        ]
+        
+        same_layout = all(
+            self._raw_ranges[block_id] is not None
+            and len(data) == self._raw_ranges[block_id][1] - self._raw_ranges[block_id][0]
+            for block_id, data in encoded.items()
+        )
+        
+        if same_layout:
+            # Aucune ligne ne bouge : écrire uniquement les lignes modifiées
+            regions = []
+            for block_id in sorted(self._dirty):
+                first, last = self._dirty[block_id]
+                prefix = self._lines_nbytes(block_id, 0, first)
+                length = self._lines_nbytes(block_id, first, last + 1)
+                regions.append((self._raw_ranges[block_id][0] + prefix, encoded[block_id][prefix:prefix + length]))
+            truncate_at = None
+        else:
+            # Réécriture de la fin du fichier à partir de la première ligne modifiée
+            first_block = min(self._dirty)
+            original_end = max(raw[1] for raw in self._raw_ranges if raw is not None)
+            block_start = self._raw_ranges[first_block][0] if self._raw_ranges[first_block] else original_end
+            prefix = self._lines_nbytes(first_block, 0, self._dirty[first_block][0])
+            tail = encoded[first_block][prefix:] + b''.join(
+                encoded[block_id] if block_id in encoded else self._block_bytes(block_id)
+                for block_id in range(first_block + 1, len(self._blocks))
+            )
+            regions = [(block_start + prefix, tail)]
+            truncate_at = block_start + prefix + len(tail)
+        
+        written = pwrite_regions(self.file_path, regions, truncate_at)
+        self._after_write(sizes, None)
+        PARSE_CACHE.revalidate(self.file_path, self)
+        return written
+    
+    def _block_bytes(self, block_id: int) -> bytes:
+        """Retourne le contenu brut d'un bloc (recopié du fichier s'il n'a pas été décodé)"""
+        block = self._blocks[block_id]
+        if block is None:
+            start, end = self._raw_ranges[block_id]
+            return self._data[start:end]
+        if isinstance(block, CompactLines):
+            return block.to_bytes()
+        return ''.join(block).encode('utf-8')
     
-    def _update_section_indices_after_insert(self, insert_idx: int) -> None:
+    def _lines_nbytes(self, block_id: int, first: int, end: int) -> int:
+        """Taille en octets des lignes [first, end) d'un bloc décodé"""
+        block = self._blocks[block_id]
+        if isinstance(block, CompactLines):
+            return block.byte_offset(end) - block.byte_offset(first)
+        return sum(len(line.encode('utf-8')) for line in block[first:end])
+    
+    def _after_write(self, block_sizes: List[int], content_hash: Optional[str]) -> None:
         """
-        Met à jour les indices de toutes les sections après une insertion de ligne
+        Met à jour l'état du parser pour qu'il corresponde au fichier écrit
         
         Args:
-            insert_idx: Index où la ligne a été insérée
+            block_sizes: Taille écrite de chaque bloc, dans l'ordre
+            content_hash: Empreinte du contenu écrit (None si inconnue)
         """
-        for section_name, indices in self.sections.items():
-            self.sections[section_name] = [
-                idx + 1 if idx >= insert_idx else idx
-                for idx in indices
-            ]
+        ranges = []
+        offset = 0
+        for size in block_sizes:
+            ranges.append((offset, offset + size))
+            offset += size
+        self._raw_ranges = ranges
+        
+        # Mode lazy : les blocs non décodés doivent pointer vers le nouveau contenu
+        if self.lazy and any(block is None for block in self._blocks):
+            self.close()
+            with open(self.file_path, 'rb') as f:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if offset else b''
+        
+        self._signature = file_signature(self.file_path)
+        self._content_hash = content_hash
+        self._changes = []
+        self._dirty = {}
+    
+    @staticmethod
+    def _hash(data: bytes) -> str:
+        """Empreinte du contenu d'un fichier"""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
+    def _check_disk(self) -> None:
+        """
+        Vérifie que le fichier n'a pas changé sur disque depuis read(), sinon fusionne
+        
+        Raises:
+            IniMergeConflict: La fusion est impossible
+        """
+        signature = file_signature(self.file_path)
+        if signature == self._signature:
+            return
+        
+        # Signature différente mais contenu identique (ex: touch) : pas de conflit
+        if signature is not None and self._content_hash is not None:
+            with open(self.file_path, 'rb') as f:
+                if self._hash(f.read()) == self._content_hash:
+                    self._signature = signature
+                    return
+        
+        self._merge_with_disk()
+    
+    def _merge_with_disk(self) -> None:
+        """
+        Fusion 3-way : rejoue les modifications en cours sur le contenu actuel du disque
+        
+        Pour chaque modification (base -> ours), la valeur sur disque (theirs) est comparée :
+        - theirs == base : la modification est appliquée
+        - theirs == ours : déjà appliquée, rien à faire
+        - sinon : conflit, rien n'est écrit
+        
+        En l'absence de conflit, le parser adopte le contenu fusionné.
+        
+        Raises:
+            IniMergeConflict: Liste des clés en conflit
+        """
+        theirs = ArkINIParser(self.file_path, lazy=self.lazy, compact=self.compact)
+        theirs.read()
+        conflicts = []
+        
+        for change, section, key, base, ours in self._changes:
+            if change == 'add_section':
+                theirs.add_section(section)
+                continue
+            
+            if change == 'set':
+                current = theirs.get_value(section, key)
+            else:
+                current = theirs.get_all_values(section, key)
+            
+            if current == ours:
+                continue
+            
+            if current == base:
+                applied = (theirs.set_value(section, key, ours) if change == 'set'
+                           else theirs.set_all_values(section, key, ours))
+                if applied:
+                    continue
+            
+            conflicts.append({
+                "section": section,
+                "key": key,
+                "base": base,
+                "ours": ours,
+                "theirs": current
+            })
+        
+        if conflicts:
+            theirs.close()
+            raise IniMergeConflict(self.file_path, conflicts)
+        
+        self.close()
+        self.__dict__.update(theirs.__dict__)
+    
+    @contextmanager
+    def transaction(self, reload: bool = True) -> Iterator['ArkINIParser']:
+        """
+        Applique un lot de modifications avec une seule lecture et une seule écriture
+        
+        Le fichier est relu à l'entrée, puis écrit atomiquement à la sortie du bloc.
+        Si une exception survient dans le bloc, rien n'est écrit et le parser
+        est rechargé depuis le disque.
+        
+        Args:
+            reload: False si le parser est déjà à jour (ex: obtenu via load_ini)
+        
+        Exemple:
+            with parser.transaction():
+                parser.set_value("ServerSettings", "XPMultiplier", "2.0")
+                parser.set_value("ServerSettings", "MaxPlayers", "20")
+        """
+        if reload:
+            self.read()
+        try:
+            yield self
+        except BaseException:
+            self.read()
+            raise
+        self.write()
     
     def get_all_values(self, section: str, key: str) -> List[str]:
         """
@@ -179,22 +715,183 @@ class ArkINIParser:
         Returns:
             Liste des valeurs trouvées
         """
-        values = []
+        self._ensure_section(section)
+        return [self._line_value(position) for position in self._positions(section, key)]
+    
+    def get_structs(self, section: str, key: str) -> List[Any]:
+        """
+        Récupère les valeurs d'une clé (répétée ou non) décodées en tuples ARK
         
-        if section not in self.sections:
-            return values
+        Les valeurs entre parenthèses sont retournées en ArkTuple (décodage
+        paresseux), les autres en str. Le résultat est mis en cache par ligne :
+        un second appel retourne les mêmes objets tant que la ligne n'a pas changé.
+        
+        Args:
+            section: Nom de la section
+            key: Nom de la clé (ex: ConfigOverrideItemCraftingCosts)
             
-        for line_idx in self.sections[section]:
-            line = self.lines[line_idx].strip()
+        Returns:
+            Liste des valeurs décodées, dans l'ordre du fichier
+        """
+        self._ensure_section(section)
+        values = []
+        
+        for block_id, offset in self._positions(section, key):
+            line = self._blocks[block_id][offset]
+            cached = self._value_cache.get((block_id, offset))
+            if cached is None or cached[0] != line:
+                cached = (line, decode_ark_value(self._line_value((block_id, offset))))
+                self._value_cache[(block_id, offset)] = cached
+            values.append(cached[1])
+        
+        return values
+    
+    def store_structs(self, section: str, key: str) -> int:
+        """
+        Réécrit les lignes dont les tuples obtenus via get_structs ont été modifiés
+        
+        Seules les entrées modifiées sont resérialisées.
+        
+        Args:
+            section: Nom de la section
+            key: Nom de la clé
             
-            if not line or line.startswith('#') or line.startswith(';'):
+        Returns:
+            Nombre de lignes réécrites
+        """
+        updated = 0
+        before = self.get_all_values(section, key)
+        
+        for block_id, offset in self._positions(section, key):
+            cached = self._value_cache.get((block_id, offset))
+            if cached is None or cached[0] != self._blocks[block_id][offset]:
                 continue
-                
-            match = re.match(rf'^{re.escape(key)}=(.*)$', line)
-            if match:
-                values.append(match.group(1))
-                
-        return values
+            value = cached[1]
+            if isinstance(value, ArkTuple) and value.modified:
+                line = f"{key}={value.to_ark()}\n"
+                self._blocks[block_id][offset] = line
+                # Le tuple resérialisé devient la nouvelle référence de la ligne
+                self._value_cache[(block_id, offset)] = (line, decode_ark_value(value.to_ark()))
+                self._mark_dirty(block_id, offset, offset)
+                updated += 1
+        
+        if updated:
+            self._changes.append(('set_all', section, key, before, self.get_all_values(section, key)))
+        
+        return updated
+
+
+# BOM -> encodage (les .ini écrits par ARK sont souvent en UTF-16 LE avec BOM)
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _open_config(file_path: str) -> IO:
+    """
+    Ouvre un fichier de configuration pour une lecture ligne par ligne
+    
+    Args:
+        file_path: Chemin du fichier
+    
+    Returns:
+        Objet fichier binaire (UTF-8 sans BOM), ou texte décodé selon le BOM détecté
+    
+    Raises:
+        FileNotFoundError: Fichier absent
+    """
+    f = open(file_path, 'rb')
+    head = f.read(len(codecs.BOM_UTF8))
+    for bom, encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            f.close()
+            return open(file_path, 'r', encoding=encoding)
+    f.seek(0)
+    return f
+
+
+def iter_entries(source: Union[str, IO], section: Optional[str] = None) -> Iterator[Tuple[str, str, str, int]]:
+    """
+    Parcourt les entrées key=value d'un fichier INI ARK sans le charger en mémoire
+    
+    Le fichier est lu ligne par ligne : la mémoire utilisée ne dépend pas de sa taille.
+    Accepte un chemin ou un objet fichier déjà ouvert (ex: membre d'une archive
+    tarfile.extractfile()), en mode texte ou binaire. Un chemin avec BOM
+    (UTF-8 ou UTF-16) est décodé selon celui-ci.
+    
+    Args:
+        source: Chemin du fichier INI ou objet fichier
+        section: Ne retourner que les entrées de cette section (None = toutes)
+        
+    Yields:
+        Tuples (section, key, value, line_no), line_no commençant à 1
+    """
+    if isinstance(source, str):
+        try:
+            f = _open_config(source)
+        except FileNotFoundError:
+            return
+        with f:
+            yield from iter_entries(f, section)
+        return
+    
+    current_section = None
+    
+    for line_no, line in enumerate(source, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        
+        stripped = line.strip()
+        if stripped.startswith('['):
+            section_match = re.match(r'^\[(.+)\]', stripped)
+            if section_match:
+                current_section = section_match.group(1)
+                continue
+        
+        if current_section is None or (section is not None and current_section != section):
+            continue
+        
+        key = ArkINIParser._parse_key(stripped)
+        if key is not None:
+            yield current_section, key, stripped.split('=', 1)[1], line_no
+
+
+def _load_ini(file_path: str) -> ArkINIParser:
+    """Loader du cache : parse un fichier INI"""
+    parser = ArkINIParser(file_path)
+    parser.read()
+    return parser
+
+
+def load_ini(file_path: str) -> ArkINIParser:
+    """
+    Retourne le parser partagé d'un fichier INI, reparsé seulement si le fichier a changé
+    
+    Le parser retourné est partagé par tout le processus : ne le modifier
+    qu'à l'intérieur de transaction(reload=False).
+    
+    Args:
+        file_path: Chemin absolu vers le fichier INI
+        
+    Returns:
+        Parser déjà lu
+    """
+    return PARSE_CACHE.get(file_path, _load_ini)
+
+
+def load_simple_config(file_path: str) -> Dict[str, str]:
+    """
+    Version en cache de read_simple_config (reparsé seulement si le fichier a changé)
+    
+    Args:
+        file_path: Chemin vers le fichier
+        
+    Returns:
+        Copie du dictionnaire {key: value}
+    """
+    return dict(PARSE_CACHE.get(file_path, read_simple_config))
 
 
 def read_simple_config(file_path: str) -> Dict[str, str]:
@@ -208,45 +905,68 @@ def read_simple_config(file_path: str) -> Dict[str, str]:
     Returns:
         Dictionnaire {key: value}
     """
-    config = {}
+    return {key: value for _, key, value, _ in iter_simple_entries(file_path)}
+
+
+def iter_simple_entries(source: Union[str, IO]) -> Iterator[Tuple[None, str, str, int]]:
+    """
+    Parcourt les entrées d'un fichier de configuration simple (key=value sans sections)
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                
-                # Ignorer lignes vides et commentaires
-                if not line or line.startswith('#'):
-                    continue
-                    
-                # Parse key=value
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    # Retirer les quotes si présentes
-                    value = value.strip().strip('"').strip("'")
-                    config[key.strip()] = value
-    except FileNotFoundError:
-        pass
+    Même format de sortie que iter_entries (section toujours None), pour la validation.
+    
+    Args:
+        source: Chemin du fichier ou objet fichier (texte ou binaire)
         
-    return config
+    Yields:
+        Tuples (None, key, value, line_no), quotes retirées, line_no commençant à 1
+    """
+    if isinstance(source, str):
+        try:
+            f = _open_config(source)
+        except FileNotFoundError:
+            return
+        with f:
+            yield from iter_simple_entries(f)
+        return
+    
+    for line_no, line in enumerate(source, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        
+        # Ignorer lignes vides et commentaires
+        if not line or line.startswith('#'):
+            continue
+            
+        # Parse key=value
+        if '=' in line:
+            key, value = line.split('=', 1)
+            # Retirer les quotes si présentes
+            value = value.strip().strip('"').strip("'")
+            yield None, key.strip(), value, line_no
 
 
 def write_simple_config(file_path: str, config: Dict[str, str], header: Optional[str] = None) -> None:
     """
     Écrit un fichier de configuration simple (key=value sans sections)
+    L'écriture est atomique (fichier temporaire + fsync + rename)
     
     Args:
         file_path: Chemin vers le fichier
         config: Dictionnaire {key: value}
         header: Commentaire d'en-tête optionnel
     """
-    with open(file_path, 'w', encoding='utf-8') as f:
-        if header:
-            f.write(f"# {header}\n\n")
-            
-        for key, value in config.items():
-            # Ajouter des quotes si la valeur contient des espaces
-            if ' ' in value:
-                f.write(f'{key}="{value}"\n')
-            else:
-                f.write(f'{key}={value}\n')
+    output = []
+    
+    if header:
+        output.append(f"# {header}\n\n")
+        
+    for key, value in config.items():
+        # Ajouter des quotes si la valeur contient des espaces
+        if ' ' in value:
+            output.append(f'{key}="{value}"\n')
+        else:
+            output.append(f'{key}={value}\n')
+    
+    atomic_write(file_path, ''.join(output))
+    PARSE_CACHE.invalidate(file_path)
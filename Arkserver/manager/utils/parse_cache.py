@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Cache des fichiers de configuration déjà parsés
+Une entrée reste valide tant que (inode, taille, mtime_ns) du fichier n'a pas changé
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (st_ino, st_size, st_mtime_ns)
+FileSignature = Tuple[int, int, int]
+
+
+def file_signature(file_path: str) -> Optional[FileSignature]:
+    """
+    Retourne la signature stat d'un fichier
+    
+    Args:
+        file_path: Chemin du fichier
+        
+    Returns:
+        (inode, taille, mtime_ns) ou None si le fichier n'existe pas
+    """
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class ParseCache:
+    """
+    Cache process-wide : chemin -> (signature, objet parsé)
+    
+    Un fichier n'est relu que si sa signature stat a changé depuis le dernier parsing.
+    Les fichiers absents ne sont jamais mis en cache.
+    """
+    
+    def __init__(self):
+        """Initialise un cache vide"""
+        self._entries: Dict[str, Tuple[FileSignature, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, file_path: str, loader: Callable[[str], Any]) -> Any:
+        """
+        Retourne l'objet parsé pour un fichier, en le (re)chargeant si nécessaire
+        
+        Args:
+            file_path: Chemin du fichier
+            loader: Fonction loader(file_path) qui parse le fichier
+            
+        Returns:
+            L'objet retourné par loader (partagé entre les appelants)
+        """
+        # Signature prise avant le parsing : une écriture concurrente provoquera un miss au prochain appel
+        signature = file_signature(file_path)
+        
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if signature is not None and entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        value = loader(file_path)
+        
+        with self._lock:
+            if signature is None:
+                self._entries.pop(file_path, None)
+            else:
+                self._entries[file_path] = (signature, value)
+        
+        return value
+    
+    def revalidate(self, file_path: str, value: Any) -> None:
+        """
+        À appeler après une écriture du fichier par le manager lui-même
+        
+        Si value est l'objet en cache, sa signature est mise à jour (il reflète
+        déjà le nouveau contenu). Sinon l'entrée est invalidée.
+        
+        Args:
+            file_path: Chemin du fichier écrit
+            value: Objet ayant produit l'écriture
+        """
+        signature = file_signature(file_path)
+        
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[1] is value and signature is not None:
+                self._entries[file_path] = (signature, value)
+            else:
+                self._entries.pop(file_path, None)
+    
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        Supprime une entrée du cache (ou toutes si file_path est None)
+        
+        Args:
+            file_path: Chemin du fichier à invalider
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path, None)
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Retourne les compteurs du cache
+        
+        Returns:
+            Dict avec: hits, misses, entries
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries)
+            }
+
+
+# Instance partagée par tous les managers du processus
+PARSE_CACHE = ParseCache()
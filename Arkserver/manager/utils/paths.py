@@ -26,6 +26,7 @@ ARK_SERVER_BIN = f"{ARK_BINARIES_DIR}/ShooterGameServer"
 
 # Workshop Steam
 WORKSHOP_DIR = f"{STEAM_ROOT}/steamapps/workshop/content/346110"
+WORKSHOP_MANIFEST = f"{STEAM_ROOT}/steamapps/workshop/appworkshop_346110.acf"
 STEAMCMD = f"{STEAMCMD_ROOT}/steamcmd.sh"
 
 # Scripts core (bash)
@@ -41,6 +42,12 @@ SETTINGS_CONF = f"{CONFIG_DIR}/settings.conf"
 CURRENT_MAP_FILE = f"{CONFIG_DIR}/current_map"
 GAME_USER_SETTINGS_INI = f"{ARK_CONFIG_DIR}/GameUserSettings.ini"
 GAME_INI = f"{ARK_CONFIG_DIR}/Game.ini"
+PROFILES_DIR = f"{CONFIG_DIR}/profiles"
+REVISIONS_DIR = f"{CONFIG_DIR}/revisions"
+MODS_INSTALLED = f"{CONFIG_DIR}/mods_installed.json"
+MODS_FINGERPRINTS = f"{CONFIG_DIR}/mods_fingerprints.json"
+MAP_INDEX_FILE = f"{CONFIG_DIR}/map_index"
+MOD_MAPS_INDEX = f"{CONFIG_DIR}/mod_maps.json"
 
 # Fichiers de logs
 CORE_LOG = f"{LOGS_DIR}/core.log"
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Préchargement de fichiers dans le cache de pages du noyau
+mincore() mesure ce qui est déjà en mémoire, posix_fadvise(WILLNEED) lance
+la lecture anticipée du reste, dans la limite d'un budget mémoire
+"""
+
+import ctypes
+import ctypes.util
+import mmap
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+PAGE_SIZE = mmap.PAGESIZE
+
+# Part de MemAvailable utilisable par défaut
+DEFAULT_BUDGET_RATIO = 0.5
+
+_libc = None
+_libc_loaded = False
+_libc_lock = threading.Lock()
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """libc avec mmap/mincore/munmap typés (None hors Linux ou si indisponible)"""
+    global _libc, _libc_loaded
+    with _libc_lock:
+        if _libc_loaded:
+            return _libc
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.mmap.restype = ctypes.c_void_p
+            libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int,
+                                  ctypes.c_int, ctypes.c_long]
+            libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte)]
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = None
+        _libc_loaded = True
+        return _libc
+
+
+# Octet du vecteur mincore -> bit "page résidente"
+_RESIDENT_BIT = bytes(value & 1 for value in range(256))
+
+
+def resident_bytes(fd: int, size: int) -> Optional[int]:
+    """
+    Octets d'un fichier déjà présents dans le cache de pages (mmap + mincore)
+    
+    Args:
+        fd: Descripteur du fichier ouvert en lecture
+        size: Taille du fichier
+    
+    Returns:
+        Nombre d'octets résidents, ou None si la mesure est impossible
+    """
+    if size == 0:
+        return 0
+    libc = _load_libc()
+    if libc is None:
+        return None
+    
+    address = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+    if address is None or address == ctypes.c_void_p(-1).value:
+        return None
+    try:
+        pages = (size + PAGE_SIZE - 1) // PAGE_SIZE
+        vector = (ctypes.c_ubyte * pages)()
+        if libc.mincore(address, size, vector) != 0:
+            return None
+        resident = bytes(vector).translate(_RESIDENT_BIT).count(1)
+    finally:
+        libc.munmap(address, size)
+    return min(resident * PAGE_SIZE, size)
+
+
+def available_memory() -> Optional[int]:
+    """
+    Mémoire disponible d'après /proc/meminfo (MemAvailable)
+    
+    Returns:
+        Octets, ou None si inconnue
+    """
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _measure(file_path: str) -> Optional[Dict[str, any]]:
+    """Taille et part résidente d'un fichier (exécuté dans le pool)"""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        size = os.fstat(fd).st_size
+        return {"path": file_path, "size": size, "resident": resident_bytes(fd, size)}
+    finally:
+        os.close(fd)
+
+
+def _advise(file_path: str) -> bool:
+    """Demande la lecture anticipée d'un fichier entier (exécuté dans le pool)"""
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        return True
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+
+
+def prewarm(files: Iterable[str], budget: Optional[int] = None, max_workers: int = 8) -> Dict[str, any]:
+    """
+    Précharge des fichiers dans le cache de pages
+    
+    Les fichiers sont pris dans l'ordre donné (les plus utiles en premier) :
+    un fichier dont la partie non résidente dépasse le budget restant est ignoré.
+    
+    Args:
+        files: Chemins des fichiers, par priorité décroissante
+        budget: Octets à charger au maximum (None = moitié de MemAvailable)
+        max_workers: Nombre de threads
+    
+    Returns:
+        Dict avec: files, bytes_total, bytes_resident (None si mincore indisponible),
+        bytes_requested, skipped (fichiers hors budget), budget, duration_ms
+    """
+    start = time.monotonic()
+    files = list(dict.fromkeys(files))
+    
+    if budget is None:
+        memory = available_memory()
+        budget = int(memory * DEFAULT_BUDGET_RATIO) if memory is not None else 0
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        measured = [entry for entry in executor.map(_measure, files) if entry is not None]
+        
+        selected: List[str] = []
+        requested = 0
+        skipped = 0
+        for entry in measured:
+            missing = entry["size"] - (entry["resident"] or 0)
+            if missing == 0:
+                continue
+            if requested + missing > budget:
+                skipped += 1
+                continue
+            selected.append(entry["path"])
+            requested += missing
+        
+        list(executor.map(_advise, selected))
+    
+    resident_known = all(entry["resident"] is not None for entry in measured)
+    return {
+        "files": len(measured),
+        "bytes_total": sum(entry["size"] for entry in measured),
+        "bytes_resident": sum(entry["resident"] for entry in measured) if resident_known else None,
+        "bytes_requested": requested,
+        "skipped": skipped,
+        "budget": budget,
+        "duration_ms": round((time.monotonic() - start) * 1000, 1)
+    }
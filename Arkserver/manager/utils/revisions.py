@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Historique des fichiers de configuration (stockage adressé par contenu)
+Chaque contenu distinct est stocké une seule fois, compressé (zlib), sous son
+empreinte SHA-256 ; une révision est un index {fichier: empreinte}
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .fileio import atomic_write, fsync_dir
+from .parse_cache import PARSE_CACHE
+
+
+def _load_index(index_path: str) -> Dict[str, Dict[str, Any]]:
+    """Loader du cache : révisions par identifiant, dans l'ordre de création"""
+    index = {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un crash : ignorée
+                    continue
+                index[record["id"]] = record
+    except FileNotFoundError:
+        pass
+    return index
+
+
+class RevisionStore:
+    """
+    Révisions de fichiers de configuration
+    
+    Arborescence :
+        <root>/objects/<2 premiers caractères>/<sha256>   contenu compressé
+        <root>/index.jsonl                                une révision par ligne
+    
+    Une révision identique à une révision existante n'est pas dupliquée.
+    Lister, lire ou restaurer une révision est une recherche dans un dict.
+    """
+    
+    def __init__(self, root: str, files: Dict[str, str]):
+        """
+        Args:
+            root: Dossier du stockage
+            files: Fichiers suivis : {nom: chemin}
+        """
+        self.root = root
+        self.files = files
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.jsonl")
+    
+    def _index(self) -> Dict[str, Dict[str, Any]]:
+        """Index des révisions (relu seulement si index.jsonl a changé)"""
+        return PARSE_CACHE.get(self.index_path, _load_index)
+    
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+    
+    def _store_object(self, data: bytes) -> str:
+        """Stocke un contenu s'il est nouveau et retourne son empreinte"""
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            atomic_write(object_path, zlib.compress(data, 6))
+        return digest
+    
+    def read_object(self, digest: str) -> bytes:
+        """
+        Retourne un contenu stocké
+        
+        Args:
+            digest: Empreinte SHA-256
+        
+        Returns:
+            Contenu décompressé
+        """
+        with open(self._object_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+    
+    def save(self, label: str = "") -> Dict[str, Any]:
+        """
+        Enregistre l'état actuel des fichiers suivis
+        
+        Args:
+            label: Description libre (ex: "avant profil event")
+        
+        Returns:
+            La révision (dict avec: id, timestamp, label, files, created)
+            created est False si une révision identique existait déjà
+        """
+        manifest: Dict[str, Optional[str]] = {}
+        for name, file_path in sorted(self.files.items()):
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                manifest[name] = None
+                continue
+            manifest[name] = self._store_object(data)
+        
+        # L'identifiant dépend uniquement du contenu : même état = même révision
+        revision_id = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        
+        index = self._index()
+        existing = index.get(revision_id)
+        if existing is not None:
+            return dict(existing, created=False)
+        
+        record = {
+            "id": revision_id,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "label": label,
+            "files": manifest
+        }
+        
+        os.makedirs(self.root, exist_ok=True)
+        new_index = not os.path.exists(self.index_path)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        if new_index:
+            fsync_dir(self.root)
+        
+        index[revision_id] = record
+        PARSE_CACHE.revalidate(self.index_path, index)
+        
+        return dict(record, created=True)
+    
+    def list(self) -> List[Dict[str, Any]]:
+        """
+        Liste les révisions, de la plus récente à la plus ancienne
+        
+        Returns:
+            Liste de dict avec: id, timestamp, label, files
+        """
+        return list(reversed(list(self._index().values())))
+    
+    def get(self, revision_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne une révision
+        
+        Args:
+            revision_id: Identifiant de la révision
+        
+        Returns:
+            La révision, ou None si inconnue
+        """
+        return self._index().get(revision_id)
+    
+    def restore(self, revision_id: str, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Restaure les fichiers d'une révision (écriture atomique de chaque fichier)
+        
+        Args:
+            revision_id: Identifiant de la révision
+            names: Fichiers à restaurer (None = tous ceux présents dans la révision)
+        
+        Returns:
+            Noms des fichiers restaurés
+        
+        Raises:
+            KeyError: Révision ou fichier inconnu
+        """
+        record = self._index()[revision_id]
+        
+        restored = []
+        for name in (names if names is not None else list(record["files"])):
+            digest = record["files"][name]
+            if digest is None:
+                continue
+            file_path = self.files[name]
+            atomic_write(file_path, self.read_object(digest))
+            PARSE_CACHE.invalidate(file_path)
+            restored.append(name)
+        
+        return restored
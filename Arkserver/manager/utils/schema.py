@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Schéma typé de validation des fichiers de configuration
+Chaque champ est compilé une fois en une fonction de contrôle ; la validation
+est ensuite une seule passe sur les entrées (un dict lookup par entrée)
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .ark_values import decode_ark_value
+
+# (fichier, section, clé) ; section None pour les fichiers sans section (settings.conf)
+FieldKey = Tuple[str, Optional[str], str]
+
+# Entrée à valider : (section, clé, valeur, numéro de ligne)
+Entry = Tuple[Optional[str], str, str, int]
+
+_TRUE_VALUES = ("true", "1")
+_FALSE_VALUES = ("false", "0")
+
+
+def _to_bool(raw: str) -> bool:
+    """Conversion booléenne tolérante (True/False, true/false, 1/0)"""
+    lowered = raw.lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ValueError(raw)
+
+
+def _to_struct(raw: str) -> Any:
+    """Vérifie qu'une valeur ARK entre parenthèses est bien formée"""
+    value = decode_ark_value(raw)
+    if isinstance(value, str):
+        raise ValueError(raw)
+    len(value)  # force le découpage du premier niveau
+    return value
+
+
+# Type de champ -> (conversion, libellé du type attendu)
+_CONVERTERS: Dict[str, Tuple[Callable[[str], Any], str]] = {
+    "str": (str, "texte"),
+    "int": (lambda raw: int(float(raw)) if float(raw).is_integer() else int(raw), "entier"),
+    "float": (float, "nombre"),
+    "bool": (_to_bool, "True/False"),
+    "port": (int, "port"),
+    "struct": (_to_struct, "structure ARK (...)"),
+}
+
+
+class Field:
+    """
+    Description d'un paramètre : type, bornes, valeurs autorisées
+    
+    Les erreurs de type sont toujours des erreurs ; severity s'applique aux
+    autres contrôles (bornes, choix, check, absence si required).
+    """
+    
+    def __init__(self, kind: str = "str", min: Optional[float] = None, max: Optional[float] = None,
+                 choices: Optional[Sequence[str]] = None, required: bool = False,
+                 check: Optional[Callable[[Any], Optional[str]]] = None,
+                 severity: str = "error", description: str = ""):
+        """
+        Args:
+            kind: str, int, float, bool, port ou struct
+            min: Valeur minimale (incluse)
+            max: Valeur maximale (incluse)
+            choices: Valeurs autorisées (comparaison insensible à la casse)
+            required: Signaler l'absence du paramètre
+            check: Contrôle supplémentaire, retourne un message si la valeur est refusée
+            severity: "error" ou "warning"
+            description: Libellé affiché dans le rapport
+        """
+        if kind not in _CONVERTERS:
+            raise ValueError(f"Type de champ inconnu: {kind}")
+        if kind == "port":
+            min = 1024 if min is None else min
+            max = 65535 if max is None else max
+        self.kind = kind
+        self.min = min
+        self.max = max
+        self.choices = choices
+        self.required = required
+        self.check = check
+        self.severity = severity
+        self.description = description
+    
+    def compile(self, key: str) -> Callable[[str], Tuple[Any, Optional[Tuple[str, str]]]]:
+        """
+        Construit la fonction de contrôle du champ
+        
+        Args:
+            key: Nom du paramètre (pour les messages)
+        
+        Returns:
+            Fonction raw -> (valeur typée ou None, (sévérité, message) ou None)
+        """
+        convert, type_label = _CONVERTERS[self.kind]
+        minimum, maximum, check, severity = self.min, self.max, self.check, self.severity
+        choices = {choice.lower() for choice in self.choices} if self.choices else None
+        choices_label = ", ".join(self.choices) if self.choices else ""
+        
+        def validate(raw: str) -> Tuple[Any, Optional[Tuple[str, str]]]:
+            raw = raw.strip().strip('"')
+            try:
+                value = convert(raw)
+            except (ValueError, OverflowError):
+                return None, ("error", f"{key} invalide: {raw} (attendu: {type_label})")
+            
+            if choices is not None and raw.lower() not in choices:
+                return value, (severity, f"{key} invalide: {raw} (valeurs possibles: {choices_label})")
+            if minimum is not None and value < minimum:
+                return value, (severity, f"{key} trop petit: {raw} (minimum {minimum})")
+            if maximum is not None and value > maximum:
+                return value, (severity, f"{key} trop grand: {raw} (maximum {maximum})")
+            if check is not None:
+                message = check(value)
+                if message:
+                    return value, (severity, f"{key}: {message}")
+            return value, None
+        
+        return validate
+
+
+class Rule:
+    """Règle portant sur plusieurs paramètres (éventuellement de fichiers différents)"""
+    
+    def __init__(self, keys: Sequence[FieldKey], check: Callable[..., bool], message: str,
+                 severity: str = "error"):
+        """
+        Args:
+            keys: Paramètres concernés, passés dans cet ordre à check (None si absent)
+            check: Retourne True si la combinaison est valide
+            message: Message du rapport si la règle échoue
+            severity: "error" ou "warning"
+        """
+        self.keys = list(keys)
+        self.check = check
+        self.message = message
+        self.severity = severity
+
+
+class Schema:
+    """
+    Ensemble de champs et de règles, compilé à la construction
+    
+    Les noms de section et de clé sont comparés sans tenir compte de la casse,
+    comme le fait le moteur du jeu.
+    """
+    
+    def __init__(self, fields: Dict[FieldKey, Field], rules: Iterable[Rule] = ()):
+        """
+        Args:
+            fields: {(fichier, section, clé): Field}
+            rules: Règles inter-champs, évaluées après la passe sur les entrées
+        """
+        self.fields = fields
+        self.rules = list(rules)
+        self._validators = {
+            self._normalize(field_key): (field_key, field.compile(field_key[2]))
+            for field_key, field in fields.items()
+        }
+    
+    @staticmethod
+    def _normalize(field_key: FieldKey) -> FieldKey:
+        source, section, key = field_key
+        return source, section.lower() if section is not None else None, key.lower()
+    
+    def check_value(self, source: str, section: Optional[str], key: str, value: str) -> Optional[str]:
+        """
+        Valide une seule valeur (ex: avant sauvegarde)
+        
+        Args:
+            source: Nom du fichier
+            section: Section (None pour settings.conf)
+            key: Clé
+            value: Valeur brute
+        
+        Returns:
+            Message d'erreur, ou None si la valeur est acceptée (ou non décrite)
+        """
+        compiled = self._validators.get(self._normalize((source, section, key)))
+        if compiled is None:
+            return None
+        _, problem = compiled[1](value)
+        if problem is not None and problem[0] == "error":
+            return problem[1]
+        return None
+    
+    def validate(self, sources: Dict[str, Iterable[Entry]]) -> Dict[str, Any]:
+        """
+        Valide les entrées de plusieurs fichiers en une seule passe
+        
+        Args:
+            sources: {nom du fichier: itérable de (section, clé, valeur, ligne)}
+        
+        Returns:
+            Dict avec: success, errors (list), warnings (list), checked, duration_ms
+            Chaque problème est un dict avec: file, section, key, line, message
+        """
+        start = time.perf_counter()
+        validators = self._validators
+        values: Dict[FieldKey, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        warnings: List[Dict[str, Any]] = []
+        checked = 0
+        
+        for source, entries in sources.items():
+            for section, key, raw, line_no in entries:
+                compiled = validators.get((source, section.lower() if section is not None else None, key.lower()))
+                if compiled is None:
+                    continue
+                field_key, validate = compiled
+                checked += 1
+                value, problem = validate(raw)
+                if value is not None:
+                    values[field_key] = value
+                if problem is not None:
+                    severity, message = problem
+                    (errors if severity == "error" else warnings).append(
+                        self._issue(source, section, key, line_no, message)
+                    )
+        
+        for field_key, field in self.fields.items():
+            if field.required and field_key not in values:
+                source, section, key = field_key
+                (errors if field.severity == "error" else warnings).append(
+                    self._issue(source, section, key, None, f"{field.description or key} non défini")
+                )
+        
+        for rule in self.rules:
+            args = [values.get(field_key) for field_key in rule.keys]
+            if all(arg is None for arg in args) or rule.check(*args):
+                continue
+            source, section, key = rule.keys[0]
+            (errors if rule.severity == "error" else warnings).append(
+                self._issue(source, section, key, None, rule.message)
+            )
+        
+        return {
+            "success": len(errors) == 0,
+            "errors": errors,
+            "warnings": warnings,
+            "checked": checked,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+    
+    @staticmethod
+    def _issue(source: str, section: Optional[str], key: str, line_no: Optional[int], message: str) -> Dict[str, Any]:
+        return {
+            "file": source,
+            "section": section,
+            "key": key,
+            "line": line_no,
+            "message": message
+        }
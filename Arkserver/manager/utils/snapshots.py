@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Taille des snapshots rsync --link-dest (backups fast)
+Les fichiers inchangés d'un snapshot à l'autre sont des liens physiques :
+l'espace disque réel se calcule en dédupliquant les inodes (st_dev, st_ino).
+Un snapshot terminé ne change plus, son parcours est gardé en mémoire
+"""
+
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Nom des snapshots (TIMESTAMP d'ark-backup.sh) : 20261018-1005
+SNAPSHOT_NAME_FORMAT = "%Y%m%d-%H%M"
+
+
+@dataclass(frozen=True)
+class SnapshotScan:
+    """Fichiers d'un snapshot (tableaux compacts, un élément par fichier)"""
+    
+    files: int
+    apparent_size: int      # somme des st_size
+    created: float          # date du snapshot (voir snapshot_time)
+    devices: array          # st_dev
+    inodes: array           # st_ino
+    disk_sizes: array       # octets alloués (st_blocks * 512)
+
+
+@dataclass(frozen=True)
+class SnapshotUsage:
+    """Occupation d'un snapshot dans sa série"""
+    
+    path: str
+    files: int
+    apparent_size: int
+    incremental_size: int   # octets des inodes absents des snapshots précédents
+    created: float
+
+
+# Par chemin : ((ino, mtime_ns) du dossier, parcours)
+_scans: Dict[str, Tuple[Tuple[int, int], SnapshotScan]] = {}
+# Par dossier de snapshots : (snapshots et signatures, (occupations, octets uniques))
+_usages: Dict[str, Tuple[Tuple, Tuple[List[SnapshotUsage], int]]] = {}
+_lock = threading.Lock()
+
+
+def snapshot_time(path: str) -> float:
+    """
+    Date de création d'un snapshot, lue dans son nom
+    
+    rsync -a recopie le mtime du dossier Saved : le mtime du snapshot ne
+    date pas la sauvegarde. Il ne sert que pour un nom non horodaté.
+    
+    Args:
+        path: Dossier du snapshot
+    
+    Returns:
+        Timestamp (heure locale, comme date dans ark-backup.sh)
+    """
+    try:
+        return datetime.strptime(os.path.basename(path), SNAPSHOT_NAME_FORMAT).timestamp()
+    except ValueError:
+        return os.stat(path).st_mtime
+
+
+def scan_snapshot(path: str) -> SnapshotScan:
+    """
+    Parcourt un snapshot (os.scandir récursif, liens symboliques ignorés)
+    
+    Args:
+        path: Dossier du snapshot
+    
+    Returns:
+        SnapshotScan
+    """
+    devices = array('Q')
+    inodes = array('Q')
+    disk_sizes = array('Q')
+    apparent_size = 0
+    stack = [path]
+    
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    devices.append(st.st_dev)
+                    inodes.append(st.st_ino)
+                    disk_sizes.append(st.st_blocks * 512)
+                    apparent_size += st.st_size
+    
+    return SnapshotScan(len(inodes), apparent_size, snapshot_time(path), devices, inodes, disk_sizes)
+
+
+def _signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns)
+
+
+def _load_scan(path: str, cache: bool) -> Tuple[Tuple[int, int], SnapshotScan]:
+    """Parcours d'un snapshot, réutilisé si le dossier n'a pas été remplacé"""
+    signature = _signature(path)
+    with _lock:
+        cached = _scans.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached
+    scanned = (signature, scan_snapshot(path))
+    if cache:
+        with _lock:
+            _scans[path] = scanned
+    return scanned
+
+
+def snapshot_usage(snapshots: List[str], in_progress: Iterable[str] = ()) -> Tuple[List[SnapshotUsage], int]:
+    """
+    Taille apparente, taille incrémentale et espace disque réel d'une série de snapshots
+    
+    Args:
+        snapshots: Dossiers des snapshots, du plus ancien au plus récent
+        in_progress: Snapshots encore en cours d'écriture (parcourus sans être mémorisés)
+    
+    Returns:
+        (occupation de chaque snapshot dans l'ordre donné, octets uniques de la série)
+    """
+    in_progress = set(in_progress)
+    scans = []
+    for path in snapshots:
+        try:
+            scans.append((path, _load_scan(path, path not in in_progress)))
+        except (FileNotFoundError, NotADirectoryError):
+            # Supprimé par la rotation pendant le parcours
+            continue
+    
+    # Série inchangée (mêmes snapshots terminés) : dédoublonnage déjà fait
+    series = os.path.dirname(snapshots[0]) if snapshots else ""
+    key = tuple((path, signature) for path, (signature, _) in scans)
+    with _lock:
+        cached = _usages.get(series)
+    if cached is not None and cached[0] == key and not in_progress:
+        return cached[1]
+    
+    seen = set()
+    usages = []
+    for path, (_, scan) in scans:
+        incremental = 0
+        for device, inode, disk_size in zip(scan.devices, scan.inodes, scan.disk_sizes):
+            inode_key = (device, inode)
+            if inode_key not in seen:
+                seen.add(inode_key)
+                incremental += disk_size
+        usages.append(SnapshotUsage(path, scan.files, scan.apparent_size, incremental, scan.created))
+    result = (usages, sum(usage.incremental_size for usage in usages))
+    
+    with _lock:
+        # Snapshots supprimés par la rotation : plus besoin de leur parcours
+        kept = {path for path, _ in scans}
+        for path in [path for path in _scans if os.path.dirname(path) == series and path not in kept]:
+            del _scans[path]
+        if not in_progress:
+            _usages[series] = (key, result)
+    return result
+
+
+def latest_snapshot(directory: str, link_name: str = "latest") -> Optional[str]:
+    """
+    Snapshot désigné par le lien "latest" d'ark-backup.sh
+    
+    Args:
+        directory: Dossier des snapshots
+        link_name: Nom du lien symbolique
+    
+    Returns:
+        Chemin du snapshot, ou None si le lien est absent
+    """
+    try:
+        target = os.readlink(os.path.join(directory, link_name))
+    except OSError:
+        return None
+    return os.path.normpath(os.path.join(directory, target))
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Téléchargement des mods workshop via SteamCMD
+Plusieurs workshop_download_item par session SteamCMD (un seul login),
+sessions éventuellement parallèles, timeout par mod et nouvelles tentatives.
+Lecture du manifeste workshop (appworkshop_<app>.acf) pour les mises à jour incrémentales
+"""
+
+import math
+import os
+import re
+import selectors
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import vdf
+from .parse_cache import PARSE_CACHE
+
+# Success. Downloaded item 731604991 to "/home/.../346110/731604991" (123456 bytes)
+SUCCESS_RE = re.compile(r'Success\. Downloaded item (\d+) to "([^"]*)" \((\d+) bytes\)')
+# ERROR! Download item 731604991 failed (Failure).  /  ERROR! Timeout downloading item 731604991
+ERROR_RE = re.compile(r'ERROR! .*?\bitem (\d+)\b')
+# Logging in user 'anonymous' to Steam Public...OK  /  Waiting for user info...OK
+LOGIN_RE = re.compile(r"Logging in user .*\.\.\.OK|Waiting for user info\.\.\.OK")
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_workshop_manifest(file_path: str) -> Dict[str, Dict[str, any]]:
+    """Loader du cache : mods installés d'après appworkshop_<app>.acf"""
+    try:
+        document = vdf.load(file_path)
+    except FileNotFoundError:
+        return {}
+    
+    app = document.get("AppWorkshop", {})
+    installed = app.get("WorkshopItemsInstalled", {})
+    details = app.get("WorkshopItemDetails", {})
+    
+    items = {}
+    for mod_id, entry in installed.items():
+        if not isinstance(entry, dict):
+            continue
+        detail = details.get(mod_id)
+        items[mod_id] = {
+            "size": _to_int(entry.get("size")),
+            "timeupdated": _to_int(entry.get("timeupdated")),
+            "manifest": entry.get("manifest"),
+            "latest_manifest": detail.get("manifest") if isinstance(detail, dict) else None
+        }
+    return items
+
+
+def read_workshop_manifest(file_path: str) -> Dict[str, Dict[str, any]]:
+    """
+    Mods installés d'après le manifeste workshop de Steam (relu seulement s'il a changé)
+    
+    Args:
+        file_path: Chemin de appworkshop_<app>.acf
+    
+    Returns:
+        {mod_id: dict avec: size, timeupdated, manifest, latest_manifest}
+        latest_manifest est le manifeste connu de Steam (WorkshopItemDetails)
+    
+    Raises:
+        ValueError: Manifeste corrompu
+    """
+    return PARSE_CACHE.get(file_path, _load_workshop_manifest)
+
+
+def install_record(item: Dict[str, any]) -> Dict[str, any]:
+    """Ce qui identifie une installation : comparé d'une mise à jour à l'autre"""
+    return {
+        "manifest": item["manifest"],
+        "timeupdated": item["timeupdated"],
+        "size": item["size"]
+    }
+
+
+def plan_updates(mod_ids: Iterable[str], installed: Dict[str, Dict[str, any]],
+                 records: Dict[str, Dict[str, any]],
+                 workshop_dir: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Sélectionne les mods à télécharger
+    
+    Args:
+        mod_ids: Mods voulus
+        installed: Résultat de read_workshop_manifest
+        records: Dernière installation réussie de chaque mod ({mod_id: install_record})
+        workshop_dir: Dossier content/<app> du workshop
+    
+    Returns:
+        (à télécharger [(mod_id, raison)], à jour [mod_id])
+    """
+    scheduled = []
+    up_to_date = []
+    
+    for mod_id in dict.fromkeys(mod_ids):
+        item = installed.get(mod_id)
+        if item is None:
+            reason = "absent du manifeste workshop"
+        elif not os.path.isdir(os.path.join(workshop_dir, mod_id)):
+            reason = "dossier workshop absent"
+        elif item["latest_manifest"] and item["latest_manifest"] != item["manifest"]:
+            reason = "mise à jour signalée par Steam"
+        elif mod_id not in records:
+            reason = "aucune installation enregistrée"
+        elif records[mod_id] != install_record(item):
+            reason = "modifié depuis la dernière installation"
+        else:
+            up_to_date.append(mod_id)
+            continue
+        scheduled.append((mod_id, reason))
+    
+    return scheduled, up_to_date
+
+
+class WorkshopDownloader:
+    """
+    Moteur de téléchargement des mods workshop
+    
+    Les mods sont répartis en lots ; chaque lot est téléchargé par une seule
+    session SteamCMD (login + N workshop_download_item + quit). Jusqu'à
+    `sessions` sessions tournent en parallèle. Une session qui ne produit plus
+    de résultat pendant item_timeout secondes est tuée ; les mods en échec
+    sont retentés dans de nouvelles sessions.
+    """
+    
+    def __init__(self, steamcmd: str, app_id: str, sessions: int = 1, batch_size: int = 25,
+                 item_timeout: float = 300, login_timeout: float = 120, retries: int = 2,
+                 install_dir: Optional[str] = None):
+        """
+        Args:
+            steamcmd: Chemin de steamcmd.sh
+            app_id: App ID workshop (346110 pour ARK)
+            sessions: Nombre maximum de sessions SteamCMD simultanées
+            batch_size: Nombre maximum de mods par session
+            item_timeout: Délai maximum sans résultat pour un mod, en secondes
+            login_timeout: Délai supplémentaire accordé au démarrage/login de la session
+            retries: Nombre de nouvelles tentatives pour un mod en échec
+            install_dir: +force_install_dir (None = dossier Steam par défaut)
+        """
+        self.steamcmd = steamcmd
+        self.app_id = app_id
+        self.sessions = max(1, sessions)
+        self.batch_size = max(1, batch_size)
+        self.item_timeout = item_timeout
+        self.login_timeout = login_timeout
+        self.retries = max(0, retries)
+        self.install_dir = install_dir
+    
+    def build_command(self, mod_ids: List[str]) -> List[str]:
+        """
+        Construit la ligne de commande d'une session
+        
+        Args:
+            mod_ids: Mods du lot
+        
+        Returns:
+            Arguments de subprocess
+        """
+        command = [self.steamcmd]
+        if self.install_dir:
+            command += ["+force_install_dir", self.install_dir]
+        command += ["+login", "anonymous"]
+        for mod_id in mod_ids:
+            command += ["+workshop_download_item", self.app_id, mod_id, "validate"]
+        command.append("+quit")
+        return command
+    
+    @staticmethod
+    def _result(mod_id: str, success: bool, message: str, path: Optional[str] = None,
+                size: Optional[int] = None) -> Dict[str, any]:
+        return {
+            "id": mod_id,
+            "success": success,
+            "path": path,
+            "bytes": size,
+            "attempts": 0,
+            "message": message
+        }
+    
+    def parse_line(self, line: str) -> Optional[Dict[str, any]]:
+        """
+        Interprète une ligne de sortie SteamCMD
+        
+        Args:
+            line: Ligne de sortie
+        
+        Returns:
+            Résultat d'un mod, ou None si la ligne n'en contient pas
+        """
+        match = SUCCESS_RE.search(line)
+        if match:
+            return self._result(match.group(1), True, "Téléchargé", match.group(2), int(match.group(3)))
+        match = ERROR_RE.search(line)
+        if match:
+            return self._result(match.group(1), False, line.strip())
+        return None
+    
+    def run_session(self, mod_ids: List[str]) -> Dict[str, Dict[str, any]]:
+        """
+        Télécharge un lot de mods dans une seule session SteamCMD
+        
+        Args:
+            mod_ids: Mods du lot
+        
+        Returns:
+            {mod_id: résultat} pour chaque mod du lot
+        """
+        pending = set(mod_ids)
+        results: Dict[str, Dict[str, any]] = {}
+        
+        try:
+            process = subprocess.Popen(
+                self.build_command(mod_ids),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+        except OSError as e:
+            return {mod_id: self._result(mod_id, False, f"Lancement SteamCMD impossible: {e}") for mod_id in mod_ids}
+        
+        timed_out = False
+        buffer = b""
+        deadline = time.monotonic() + self.login_timeout + self.item_timeout
+        fd = process.stdout.fileno()
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                if not selector.select(remaining):
+                    continue
+                
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                
+                # SteamCMD réécrit ses lignes de progression avec \r
+                *lines, buffer = re.split(rb'[\r\n]', buffer + chunk)
+                for raw_line in lines:
+                    line = raw_line.decode('utf-8', errors='replace')
+                    if LOGIN_RE.search(line):
+                        # Login terminé : le délai par mod commence
+                        deadline = time.monotonic() + self.item_timeout
+                        continue
+                    result = self.parse_line(line)
+                    if result is not None and result["id"] in pending:
+                        pending.discard(result["id"])
+                        results[result["id"]] = result
+                        # Le délai repart à chaque mod terminé
+                        deadline = time.monotonic() + self.item_timeout
+        
+        if pending and buffer:
+            result = self.parse_line(buffer.decode('utf-8', errors='replace'))
+            if result is not None and result["id"] in pending:
+                pending.discard(result["id"])
+                results[result["id"]] = result
+        
+        if timed_out or pending:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+        
+        for mod_id in pending:
+            if timed_out:
+                message = f"Timeout: aucun résultat depuis {self.item_timeout:g}s"
+            else:
+                message = f"Aucun résultat SteamCMD (code {returncode})"
+            results[mod_id] = self._result(mod_id, False, message)
+        
+        return results
+    
+    def _batches(self, mod_ids: List[str]) -> List[List[str]]:
+        """Répartit les mods en lots, au moins un par session disponible"""
+        size = min(self.batch_size, math.ceil(len(mod_ids) / self.sessions))
+        return [mod_ids[start:start + size] for start in range(0, len(mod_ids), size)]
+    
+    def download(self, mod_ids: Iterable[str]) -> Dict[str, Dict[str, any]]:
+        """
+        Télécharge des mods, avec nouvelles tentatives pour ceux en échec
+        
+        Args:
+            mod_ids: IDs des mods (doublons ignorés)
+        
+        Returns:
+            {mod_id: dict avec: id, success, path, bytes, attempts, message}, dans l'ordre demandé
+        """
+        ordered = list(dict.fromkeys(mod_ids))
+        results: Dict[str, Dict[str, any]] = {}
+        pending = ordered
+        
+        for attempt in range(1, self.retries + 2):
+            if not pending:
+                break
+            
+            batches = self._batches(pending)
+            with ThreadPoolExecutor(max_workers=min(self.sessions, len(batches))) as executor:
+                batch_results = list(executor.map(self.run_session, batches))
+            
+            pending = []
+            for batch_result in batch_results:
+                for mod_id, result in batch_result.items():
+                    result["attempts"] = attempt
+                    results[mod_id] = result
+                    if not result["success"]:
+                        pending.append(mod_id)
+        
+        return {mod_id: results[mod_id] for mod_id in ordered}
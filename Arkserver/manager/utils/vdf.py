@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Parser du format texte VDF / KeyValues de Valve (fichiers .acf, .vdf)
+"""
+
+import re
+from typing import Any, Dict
+
+# Chaîne entre guillemets, accolade, commentaire, condition [$WIN32] ou mot nu
+_TOKEN_RE = re.compile(r'"((?:\\.|[^"\\])*)"|([{}])|//[^\n]*|\[[^\]\n]*\]|([^\s{}"]+)')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+_ESCAPE_RE = re.compile(r'\\(.)')
+
+
+def _unescape(value: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def parse(text: str) -> Dict[str, Any]:
+    """
+    Parse un document VDF
+    
+    Args:
+        text: Contenu du fichier
+    
+    Returns:
+        Dict imbriqué : les valeurs sont des str ou des dict.
+        Une clé répétée fusionne les blocs et remplace les valeurs simples.
+    
+    Raises:
+        ValueError: Accolade non appariée ou clé sans valeur
+    """
+    root: Dict[str, Any] = {}
+    stack = [root]
+    key = None
+    
+    for match in _TOKEN_RE.finditer(text):
+        quoted, brace, bare = match.groups()
+        
+        if brace == "{":
+            if key is None:
+                raise ValueError(f"Bloc sans clé (position {match.start()})")
+            block = stack[-1].get(key)
+            if not isinstance(block, dict):
+                block = stack[-1][key] = {}
+            stack.append(block)
+            key = None
+        elif brace == "}":
+            if key is not None or len(stack) == 1:
+                raise ValueError(f"Accolade fermante inattendue (position {match.start()})")
+            stack.pop()
+        elif quoted is not None or bare is not None:
+            token = _unescape(quoted) if quoted is not None else bare
+            if key is None:
+                key = token
+            else:
+                stack[-1][key] = token
+                key = None
+    
+    if key is not None or len(stack) != 1:
+        raise ValueError("Document VDF incomplet")
+    
+    return root
+
+
+def load(file_path: str) -> Dict[str, Any]:
+    """
+    Parse un fichier VDF
+    
+    Args:
+        file_path: Chemin du fichier
+    
+    Returns:
+        Dict imbriqué (voir parse)
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        return parse(f.read())
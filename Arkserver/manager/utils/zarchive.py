@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Extraction des archives .z du workshop ARK (zlib découpé en blocs)
+Les blocs sont décompressés en parallèle (zlib libère le GIL) et écrits
+directement à leur position dans un fichier de sortie préalloué
+"""
+
+import os
+import shutil
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Dict, List, NamedTuple, Optional
+
+# Signature UE4 des archives compressées (PACKAGE_FILE_TAG)
+Z_SIGNATURE = 0x9E2A83C1
+Z_CHUNK_SIZE = 131072
+
+# En-tête : signature, taille de bloc, taille compressée, taille décompressée (int64 LE)
+_HEADER = struct.Struct('<qqqq')
+_PAIR = struct.Struct('<qq')
+
+# Fichiers .z ouverts simultanément pendant une extraction
+MAX_OPEN_FILES = 64
+
+
+class ZChunk(NamedTuple):
+    """Bloc d'une archive .z"""
+    offset: int             # position des données compressées dans l'archive
+    compressed_size: int
+    output_offset: int      # position dans le fichier décompressé
+    size: int
+
+
+class ZHeader(NamedTuple):
+    """Table des blocs d'une archive .z"""
+    chunk_size: int
+    compressed_size: int
+    size: int
+    chunks: List[ZChunk]
+
+
+def _pread_exact(fd: int, size: int, offset: int) -> bytes:
+    data = os.pread(fd, size, offset)
+    if len(data) != size:
+        raise ValueError(f"archive tronquée (offset {offset})")
+    return data
+
+
+def read_header(fd: int) -> ZHeader:
+    """
+    Lit l'en-tête et la table des blocs d'une archive .z
+    
+    Args:
+        fd: Descripteur de l'archive ouverte en lecture
+    
+    Returns:
+        ZHeader
+    
+    Raises:
+        ValueError: Signature invalide ou archive tronquée
+    """
+    signature, chunk_size, compressed_size, size = _HEADER.unpack(_pread_exact(fd, _HEADER.size, 0))
+    if signature != Z_SIGNATURE:
+        raise ValueError(f"signature .z invalide ({signature:#x})")
+    if chunk_size <= 0 or size < 0:
+        raise ValueError("en-tête .z invalide")
+    
+    # Une paire (compressé, décompressé) par bloc : leur nombre se déduit de la taille totale
+    count = -(-size // chunk_size) if size else 0
+    table = _pread_exact(fd, count * _PAIR.size, _HEADER.size)
+    
+    chunks = []
+    offset = _HEADER.size + len(table)
+    output_offset = 0
+    for chunk_compressed, chunk_size_out in _PAIR.iter_unpack(table):
+        chunks.append(ZChunk(offset, chunk_compressed, output_offset, chunk_size_out))
+        offset += chunk_compressed
+        output_offset += chunk_size_out
+    
+    if output_offset != size:
+        raise ValueError("table des blocs incohérente")
+    
+    return ZHeader(chunk_size, compressed_size, size, chunks)
+
+
+def pack(data: bytes, chunk_size: int = Z_CHUNK_SIZE) -> bytes:
+    """
+    Construit une archive .z (format du devkit ARK)
+    
+    Args:
+        data: Contenu décompressé
+        chunk_size: Taille des blocs décompressés
+    
+    Returns:
+        Contenu de l'archive
+    """
+    blocks = [zlib.compress(data[start:start + chunk_size]) for start in range(0, len(data), chunk_size)]
+    sizes = [min(chunk_size, len(data) - start) for start in range(0, len(data), chunk_size)]
+    header = _HEADER.pack(Z_SIGNATURE, chunk_size, sum(map(len, blocks)), len(data))
+    table = b"".join(_PAIR.pack(len(block), size) for block, size in zip(blocks, sizes))
+    return header + table + b"".join(blocks)
+
+
+def _inflate_chunk(src_fd: int, dst_fd: int, chunk: ZChunk) -> None:
+    """Décompresse un bloc et l'écrit à sa position (exécuté dans le pool)"""
+    try:
+        data = zlib.decompress(_pread_exact(src_fd, chunk.compressed_size, chunk.offset))
+    except zlib.error as e:
+        raise ValueError(f"bloc à l'offset {chunk.offset} corrompu: {e}")
+    if len(data) != chunk.size:
+        raise ValueError(f"bloc à l'offset {chunk.offset}: {len(data)} octets au lieu de {chunk.size}")
+    view = memoryview(data)
+    offset = chunk.output_offset
+    while view:
+        count = os.pwrite(dst_fd, view, offset)
+        view = view[count:]
+        offset += count
+
+
+class _ZJob:
+    """Extraction en cours d'une archive : blocs soumis au pool, finalisée par finish()"""
+    
+    def __init__(self, src: str, dst: str, executor: Executor):
+        self.src_stat = os.stat(src)
+        self.dst = dst
+        self.tmp = f"{dst}.tmp"
+        self.src_fd = os.open(src, os.O_RDONLY)
+        self.dst_fd: Optional[int] = None
+        self.futures: List[Future] = []
+        try:
+            header = read_header(self.src_fd)
+            self.dst_fd = os.open(self.tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            if header.size:
+                # Taille finale réservée d'emblée : les blocs s'écrivent dans n'importe quel ordre
+                if hasattr(os, "posix_fallocate"):
+                    os.posix_fallocate(self.dst_fd, 0, header.size)
+                else:
+                    os.ftruncate(self.dst_fd, header.size)
+            self.futures = [executor.submit(_inflate_chunk, self.src_fd, self.dst_fd, chunk)
+                            for chunk in header.chunks]
+        except BaseException:
+            self.abort()
+            raise
+    
+    def _close(self) -> None:
+        for fd in (self.src_fd, self.dst_fd):
+            if fd is not None:
+                os.close(fd)
+        self.src_fd = self.dst_fd = None
+    
+    def abort(self) -> None:
+        for future in self.futures:
+            future.cancel()
+        for future in self.futures:
+            if not future.cancelled():
+                future.exception()
+        self._close()
+        try:
+            os.unlink(self.tmp)
+        except FileNotFoundError:
+            pass
+    
+    def finish(self) -> None:
+        """Attend les blocs puis remplace atomiquement la cible"""
+        try:
+            for future in self.futures:
+                future.result()
+        except BaseException:
+            self.abort()
+            raise
+        self._close()
+        os.utime(self.tmp, ns=(self.src_stat.st_atime_ns, self.src_stat.st_mtime_ns))
+        os.replace(self.tmp, self.dst)
+
+
+def _expected_size(src: str) -> Optional[int]:
+    """Taille décompressée d'une archive, lue dans <fichier>.z.uncompressed_size si présent"""
+    try:
+        with open(f"{src}.uncompressed_size", 'r') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        pass
+    try:
+        fd = os.open(src, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        signature, _, _, size = _HEADER.unpack(_pread_exact(fd, _HEADER.size, 0))
+        return size if signature == Z_SIGNATURE else None
+    except (OSError, ValueError, struct.error):
+        return None
+    finally:
+        os.close(fd)
+
+
+def _up_to_date(dst: str, size: Optional[int], src_stat: os.stat_result) -> bool:
+    """La cible a la taille attendue et la date de la source (posée à l'extraction)"""
+    try:
+        st = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    return st.st_size == size and st.st_mtime_ns == src_stat.st_mtime_ns
+
+
+def extract_tree(src_dir: str, dst_dir: str, executor: Executor) -> Dict[str, int]:
+    """
+    Extrait un dossier de mod du workshop vers ShooterGame/Content/Mods/<id>
+    
+    Les .z sont décompressés, les autres fichiers copiés ; un fichier dont la
+    taille et la date correspondent déjà à la source est ignoré. Les fichiers
+    de la cible absents de la source sont supprimés.
+    
+    Args:
+        src_dir: Dossier source (WindowsNoEditor du mod)
+        dst_dir: Dossier cible
+        executor: Pool de threads pour la décompression des blocs
+    
+    Returns:
+        Dict avec: extracted, copied, skipped, removed
+    
+    Raises:
+        OSError, ValueError: Source illisible ou archive corrompue
+    """
+    stats = {"extracted": 0, "copied": 0, "skipped": 0, "removed": 0}
+    expected = set()
+    active: deque = deque()
+    
+    try:
+        for root, _, files in os.walk(src_dir):
+            target_root = os.path.normpath(os.path.join(dst_dir, os.path.relpath(root, src_dir)))
+            os.makedirs(target_root, exist_ok=True)
+            
+            for name in files:
+                if name.endswith(".z.uncompressed_size"):
+                    continue
+                
+                src = os.path.join(root, name)
+                src_stat = os.stat(src)
+                compressed = name.endswith(".z")
+                dst = os.path.join(target_root, name[:-2] if compressed else name)
+                expected.add(dst)
+                
+                size = _expected_size(src) if compressed else src_stat.st_size
+                if _up_to_date(dst, size, src_stat):
+                    stats["skipped"] += 1
+                    continue
+                
+                if not compressed:
+                    shutil.copyfile(src, dst)
+                    os.utime(dst, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+                    stats["copied"] += 1
+                    continue
+                
+                if len(active) >= MAX_OPEN_FILES:
+                    active.popleft().finish()
+                active.append(_ZJob(src, dst, executor))
+                stats["extracted"] += 1
+        
+        while active:
+            active.popleft().finish()
+    except BaseException:
+        while active:
+            active.popleft().abort()
+        raise
+    
+    for root, _, files in os.walk(dst_dir):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if file_path not in expected:
+                os.unlink(file_path)
+                stats["removed"] += 1
+    
+    return stats
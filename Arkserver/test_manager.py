@@ -157,6 +157,1766 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
+print()
+
+# Test 6: Parser INI - Index des clés
+print("TEST 6: Parser INI - Index (section, clé)")
+print("-" * 60)
+try:
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write("[ServerSettings]\n")
+            f.write("XPMultiplier=2.0\n")
+            f.write("; commentaire=ignoré\n")
+            f.write("\n")
+            f.write("[/script/shootergame.shootergamemode]\n")
+            f.write("OverrideEngramEntries=(EngramIndex=0)\n")
+            f.write("OverrideEngramEntries=(EngramIndex=1)\n")
+        
+        parser = ArkINIParser(ini_path)
+        parser.read()
+        
+        assert parser.get_value('ServerSettings', 'XPMultiplier') == '2.0'
+        assert parser.get_value('ServerSettings', 'commentaire') is None
+        assert parser.get_all_values('/script/shootergame.shootergamemode', 'OverrideEngramEntries') == [
+            '(EngramIndex=0)', '(EngramIndex=1)'
+        ]
+        print("✅ get_value / get_all_values via l'index")
+        
+        # Ajout d'une clé : les indices de la section suivante doivent suivre
+        parser.set_value('ServerSettings', 'MaxPlayers', '20')
+        assert parser.get_value('ServerSettings', 'MaxPlayers') == '20'
+        assert parser.get_all_values('/script/shootergame.shootergamemode', 'OverrideEngramEntries')[1] == '(EngramIndex=1)'
+        print("✅ Index à jour après set_value (insertion)")
+        
+        parser.ensure_key('SessionSettings', 'SessionName', 'Test')
+        assert 'SessionSettings' in parser.sections
+        assert parser.get_value('SessionSettings', 'SessionName') == 'Test'
+        print("✅ Index à jour après ensure_key / add_section")
+        
+        # Relecture : l'index est reconstruit, pas cumulé
+        parser.write()
+        parser.read()
+        parser.read()
+        assert parser.get_all_values('/script/shootergame.shootergamemode', 'OverrideEngramEntries') == [
+            '(EngramIndex=0)', '(EngramIndex=1)'
+        ]
+        print("✅ Relecture sans doublons dans l'index")
+    
+    print("\n✅ Index du parser INI fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 7: Transactions et écriture atomique
+print("TEST 7: Transactions INI et écriture atomique")
+print("-" * 60)
+try:
+    import tempfile
+    from utils.ini_parser import read_simple_config, write_simple_config
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'GameUserSettings.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write("[ServerSettings]\nXPMultiplier=1.0\n\n[SessionSettings]\nSessionName=Test\n")
+        
+        parser = ArkINIParser(ini_path)
+        with parser.transaction():
+            for n in range(300):
+                parser.set_value('ServerSettings', f'Key{n}', str(n))
+        
+        parser.read()
+        assert parser.get_value('ServerSettings', 'Key299') == '299'
+        print("✅ 300 clés appliquées en une transaction")
+        
+        # Une exception annule l'écriture
+        try:
+            with parser.transaction():
+                parser.set_value('ServerSettings', 'XPMultiplier', '9.9')
+                raise RuntimeError("abandon")
+        except RuntimeError:
+            pass
+        assert parser.get_value('ServerSettings', 'XPMultiplier') == '1.0'
+        assert not [name for name in os.listdir(tmp_dir) if name.endswith('.tmp')]
+        print("✅ Transaction annulée sans écriture ni fichier temporaire")
+        
+        # SettingsManager.set_settings : tout ou rien
+        original_ini = paths.GAME_USER_SETTINGS_INI
+        paths.GAME_USER_SETTINGS_INI = ini_path
+        try:
+            settings_mgr = SettingsManager()
+            result = settings_mgr.set_settings({
+                'ServerSettings': {'XPMultiplier': '3.0'},
+                'Absente': {'Foo': 'bar'}
+            })
+            assert not result["success"]
+            assert settings_mgr.get_setting('ServerSettings', 'XPMultiplier') == '1.0'
+            
+            result = settings_mgr.set_setting('ServerSettings', 'XPMultiplier', '3.0')
+            assert result["success"]
+            assert settings_mgr.get_setting('ServerSettings', 'XPMultiplier') == '3.0'
+        finally:
+            paths.GAME_USER_SETTINGS_INI = original_ini
+        print("✅ SettingsManager.set_settings (tout ou rien)")
+        
+        conf_path = os.path.join(tmp_dir, 'settings.conf')
+        write_simple_config(conf_path, {'SESSION_NAME': 'Mon Serveur', 'MAX_PLAYERS': '20'}, "test")
+        assert read_simple_config(conf_path) == {'SESSION_NAME': 'Mon Serveur', 'MAX_PLAYERS': '20'}
+        print("✅ write_simple_config atomique")
+    
+    print("\n✅ Transactions INI fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 8: Cache de parsing validé par stat
+print("TEST 8: Cache de parsing (inode, taille, mtime_ns)")
+print("-" * 60)
+try:
+    import tempfile
+    from utils.parse_cache import PARSE_CACHE
+    from utils.ini_parser import load_ini
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'GameUserSettings.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write("[ServerSettings]\nMaxPlayers=10\n\n[SessionSettings]\nSessionName=Test\n")
+        
+        original_ini = paths.GAME_USER_SETTINGS_INI
+        paths.GAME_USER_SETTINGS_INI = ini_path
+        try:
+            settings_mgr = SettingsManager()
+            before = PARSE_CACHE.stats()
+            settings_mgr.get_setting('SessionSettings', 'SessionName')
+            settings_mgr.get_setting('ServerSettings', 'MaxPlayers')
+            settings_mgr.get_setting('ServerSettings', 'ServerPassword')
+            after = PARSE_CACHE.stats()
+            assert after["misses"] - before["misses"] == 1
+            assert after["hits"] - before["hits"] == 2
+            print("✅ 3 lectures = 1 parsing + 2 hits")
+            
+            # Écriture par le manager : le parser en cache reste valide
+            settings_mgr.set_setting('ServerSettings', 'MaxPlayers', '20')
+            before = PARSE_CACHE.stats()
+            assert settings_mgr.get_setting('ServerSettings', 'MaxPlayers') == '20'
+            assert PARSE_CACHE.stats()["hits"] - before["hits"] == 1
+            print("✅ Cache revalidé après écriture du manager")
+            
+            # Modification externe : nouveau parsing
+            with open(ini_path, 'a', encoding='utf-8') as f:
+                f.write("ServerAdminPassword=secret\n")
+            assert settings_mgr.get_setting('SessionSettings', 'ServerAdminPassword') == 'secret'
+            assert load_ini(ini_path) is settings_mgr.parser
+            print("✅ Modification externe détectée")
+        finally:
+            paths.GAME_USER_SETTINGS_INI = original_ini
+    
+    print("\n✅ Cache de parsing fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 9: Parser INI - Mode lazy (mmap)
+print("TEST 9: Parser INI - Sections décodées à la demande (mmap)")
+print("-" * 60)
+try:
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        # Section d'overrides en CRLF avec un octet non UTF-8 : doit être recopiée telle quelle
+        overrides = b"[/script/shootergame.shootergamemode]\r\n" + b"".join(
+            b"ConfigOverrideItemMaxQuantity=(ItemClassString=\"Item_%d\")\r\n" % n for n in range(1000)
+        ) + b"Comment=caf\xe9\r\n"
+        with open(ini_path, 'wb') as f:
+            f.write(b"[ServerSettings]\nXPMultiplier=1.0\n\n" + overrides)
+        
+        parser = ArkINIParser(ini_path, lazy=True)
+        parser.read()
+        assert parser.section_names() == ['ServerSettings', '/script/shootergame.shootergamemode']
+        assert parser.get_value('ServerSettings', 'XPMultiplier') == '1.0'
+        assert parser._blocks[2] is None
+        print("✅ Seule la section demandée est décodée")
+        
+        with parser.transaction(reload=False):
+            parser.set_value('ServerSettings', 'XPMultiplier', '2.0')
+        parser.close()
+        
+        with open(ini_path, 'rb') as f:
+            content = f.read()
+        assert content == b"[ServerSettings]\nXPMultiplier=2.0\n\n" + overrides
+        print("✅ Sections non modifiées réécrites octet pour octet")
+        
+        # Mode compact : mêmes valeurs, même contenu réécrit
+        with open(ini_path, 'wb') as f:
+            f.write(b"[ServerSettings]\r\nXPMultiplier=2.0\r\n[Engrams]\nOverrideEngramEntries=(EngramIndex=0)\n")
+        compact = ArkINIParser(ini_path, compact=True)
+        compact.read()
+        assert compact.get_value('ServerSettings', 'XPMultiplier') == '2.0'
+        compact.set_value('ServerSettings', 'XPMultiplier', '3.0')
+        compact.set_value('ServerSettings', 'MaxPlayers', '20')
+        compact.set_all_values('Engrams', 'OverrideEngramEntries', ['(EngramIndex=1)', '(EngramIndex=2)'])
+        compact.write()
+        with open(ini_path, 'rb') as f:
+            assert f.read() == (b"[ServerSettings]\r\nXPMultiplier=3.0\nMaxPlayers=20\n[Engrams]\n"
+                                b"OverrideEngramEntries=(EngramIndex=1)\nOverrideEngramEntries=(EngramIndex=2)\n")
+        print("✅ Mode compact (buffer d'octets + offsets)")
+    
+    print("\n✅ Mode lazy fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 10: Valeurs structurées ARK
+print("TEST 10: Décodage des tuples ARK (ConfigOverride*)")
+print("-" * 60)
+try:
+    import tempfile
+    from utils.ark_values import ArkTuple, decode_ark_value
+    
+    raw = ('(ItemClassString="PrimalItem_WeaponBow_C",BaseCraftingResourceRequirements=('
+           '(ResourceItemTypeString="PrimalItemResource_Wood_C",BaseResourceRequirement=2.0,'
+           'bCraftingRequireExactResourceType=false),'
+           '(ResourceItemTypeString="PrimalItemResource_Fibers_C",BaseResourceRequirement=20.0)))')
+    value = decode_ark_value(raw)
+    assert value['ItemClassString'] == 'PrimalItem_WeaponBow_C'
+    requirements = value['BaseCraftingResourceRequirements']
+    assert len(requirements) == 2 and not requirements.is_struct
+    assert requirements[1]['BaseResourceRequirement'] == '20.0'
+    assert value.to_ark() == raw
+    print("✅ Décodage imbriqué et resérialisation à l'identique")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        section = '/script/shootergame.shootergamemode'
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(f"[{section}]\n")
+            for n in range(3):
+                f.write(f'ConfigOverrideItemCraftingCosts=(ItemClassString="Item_{n}",'
+                        f'BaseCraftingResourceRequirements=((ResourceItemTypeString="Wood",BaseResourceRequirement={n}.0)))\n')
+        
+        parser = ArkINIParser(ini_path)
+        parser.read()
+        costs = parser.get_structs(section, 'ConfigOverrideItemCraftingCosts')
+        assert parser.get_structs(section, 'ConfigOverrideItemCraftingCosts')[0] is costs[0]
+        print("✅ Valeurs décodées mises en cache par ligne")
+        
+        costs[1]['BaseCraftingResourceRequirements'][0]['BaseResourceRequirement'] = '10.0'
+        assert parser.store_structs(section, 'ConfigOverrideItemCraftingCosts') == 1
+        values = parser.get_all_values(section, 'ConfigOverrideItemCraftingCosts')
+        assert 'BaseResourceRequirement=10.0' in values[1]
+        assert 'BaseResourceRequirement=0.0' in values[0]
+        print("✅ Seule l'entrée modifiée est réécrite")
+    
+    print("\n✅ Tuples ARK fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 11: Itération en flux sur les entrées INI
+print("TEST 11: iter_entries (lecture en flux)")
+print("-" * 60)
+try:
+    import io
+    import tempfile
+    from utils.ini_parser import iter_entries
+    
+    content = "[ServerSettings]\nXPMultiplier=2.0\n; MaxPlayers=1\n\n[SessionSettings]\nSessionName=Test\n"
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'GameUserSettings.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        entries = list(iter_entries(ini_path))
+        assert entries == [
+            ('ServerSettings', 'XPMultiplier', '2.0', 2),
+            ('SessionSettings', 'SessionName', 'Test', 6)
+        ]
+        print("✅ Entrées (section, clé, valeur, ligne) depuis un chemin")
+    
+    # Objet fichier binaire (ex: membre d'archive de backup)
+    entries = list(iter_entries(io.BytesIO(content.encode('utf-8')), section='SessionSettings'))
+    assert entries == [('SessionSettings', 'SessionName', 'Test', 6)]
+    print("✅ Filtre par section depuis un objet fichier")
+    
+    print("\n✅ iter_entries fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 12: Écriture partielle et modifications concurrentes
+print("TEST 12: Écriture en place et fusion 3-way")
+print("-" * 60)
+try:
+    import tempfile
+    from utils.ini_parser import ArkINIParser, IniMergeConflict
+    from utils.fileio import write_changed
+    
+    content = "[ServerSettings]\nMaxPlayers=10\nXPMultiplier=1.0\n\n[SessionSettings]\nSessionName=Test\n"
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        
+        for lazy, compact in ((False, False), (True, False), (False, True)):
+            with open(ini_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            parser = ArkINIParser(ini_path, lazy=lazy, compact=compact)
+            parser.read()
+            
+            # Même taille : seule la ligne modifiée est écrite
+            parser.set_value('ServerSettings', 'MaxPlayers', '20')
+            assert parser.write_in_place() == len("MaxPlayers=20\n")
+            
+            # Taille différente : réécriture depuis la ligne modifiée + truncate
+            parser.set_value('ServerSettings', 'XPMultiplier', '2.5')
+            parser.set_value('SessionSettings', 'SessionName', 'Mon serveur')
+            parser.write_in_place()
+            parser.close()
+            with open(ini_path, encoding='utf-8') as f:
+                assert f.read() == content.replace('=10', '=20').replace('1.0', '2.5').replace('=Test', '=Mon serveur')
+        print("✅ write_in_place n'écrit que les zones modifiées (normal, lazy, compact)")
+        
+        # Modification concurrente sur une autre clé : fusion
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        parser = ArkINIParser(ini_path)
+        parser.read()
+        parser.set_value('ServerSettings', 'MaxPlayers', '30')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(content.replace('XPMultiplier=1.0', 'XPMultiplier=3.0'))
+        parser.write()
+        with open(ini_path, encoding='utf-8') as f:
+            merged = f.read()
+        assert 'MaxPlayers=30' in merged and 'XPMultiplier=3.0' in merged
+        print("✅ Modification concurrente d'une autre clé fusionnée")
+        
+        # Même clé modifiée des deux côtés : conflit, fichier intact
+        parser.set_value('ServerSettings', 'MaxPlayers', '40')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(merged.replace('MaxPlayers=30', 'MaxPlayers=50'))
+        try:
+            parser.write()
+            assert False, "conflit non détecté"
+        except IniMergeConflict as e:
+            assert e.conflicts[0]['key'] == 'MaxPlayers' and e.conflicts[0]['theirs'] == '50'
+        with open(ini_path, encoding='utf-8') as f:
+            assert 'MaxPlayers=50' in f.read()
+        print("✅ Conflit détecté sans écraser le fichier")
+        
+        # Diff d'un fichier texte simple
+        list_path = os.path.join(tmp_dir, 'mods.list')
+        assert write_changed(list_path, "1|A\n2|B\n") == 8
+        assert write_changed(list_path, "1|A\n2|B\n") == 0
+        assert write_changed(list_path, "1|A\n2|C\n") == 1
+        with open(list_path) as f:
+            assert f.read() == "1|A\n2|C\n"
+        print("✅ write_changed ne réécrit que la différence")
+    
+    print("\n✅ Écriture partielle fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 13: Schéma de configuration
+print("TEST 13: Validation par schéma typé")
+print("-" * 60)
+try:
+    from modules.config.schema import CONFIG_SCHEMA, GUS, GAME, CONF, validate_config
+    
+    report = validate_config({
+        GUS: [
+            ("ServerSettings", "ServerAdminPassword", "admin", 2),
+            ("ServerSettings", "RCONPort", "80", 3),
+            ("ServerSettings", "XPMultiplier", "abc", 4),
+            ("ServerSettings", "MaxPlayers", "20", 5),
+            ("ServerSettings", "UnknownKey", "x", 6),
+        ],
+        GAME: [
+            ("/script/shootergame.shootergamemode", "ConfigOverrideItemCraftingCosts", "(ItemClassString=\"A\"", 1),
+        ],
+        CONF: [
+            (None, "GAME_PORT", "7777", 1),
+            (None, "QUERY_PORT", "7778", 2),
+            (None, "RCON_ENABLED", "true", 3),
+        ],
+    })
+    assert not report["success"]
+    assert report["checked"] == 8
+    messages = [issue["message"] for issue in report["errors"]]
+    assert any("RCONPort trop petit" in m for m in messages)
+    assert any("XPMultiplier invalide" in m for m in messages)
+    assert any(issue["key"] == "ConfigOverrideItemCraftingCosts" and issue["line"] == 1 for issue in report["errors"])
+    assert any("GAME_PORT+1" in m for m in messages)
+    warnings = [issue["message"] for issue in report["warnings"]]
+    assert any("faible" in m for m in warnings)
+    assert any("RCON activé" in m for m in warnings)
+    print(f"✅ Rapport structuré ({len(report['errors'])} erreur(s), {report['duration_ms']} ms)")
+    
+    assert CONFIG_SCHEMA.check_value(GUS, "serversettings", "maxplayers", "abc") is not None
+    assert CONFIG_SCHEMA.check_value(GUS, "ServerSettings", "MaxPlayers", "5000.000000") is not None
+    assert CONFIG_SCHEMA.check_value(GUS, "ServerSettings", "MaxPlayers", "70") is None
+    print("✅ Contrôle d'une valeur avant sauvegarde (insensible à la casse)")
+    
+    print("\n✅ Schéma de configuration fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 14: Profils de paramètres
+print("TEST 14: Profils de paramètres (diff + écriture groupée)")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config.profiles import ProfilesManager
+    
+    saved_paths = (paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.PROFILES_DIR, paths.REVISIONS_DIR)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.GAME_USER_SETTINGS_INI = os.path.join(tmp_dir, 'GameUserSettings.ini')
+            paths.GAME_INI = os.path.join(tmp_dir, 'Game.ini')
+            paths.PROFILES_DIR = os.path.join(tmp_dir, 'profiles')
+            paths.REVISIONS_DIR = os.path.join(tmp_dir, 'revisions')
+            with open(paths.GAME_USER_SETTINGS_INI, 'w', encoding='utf-8') as f:
+                f.write("[ServerSettings]\nXPMultiplier=1.0\nTamingSpeedMultiplier=1.0\nMaxPlayers=20\n")
+            with open(paths.GAME_INI, 'w', encoding='utf-8') as f:
+                f.write("[/script/shootergame.shootergamemode]\nConfigOverrideItemCraftingCosts=(A)\n")
+            
+            manager = ProfilesManager()
+            result = manager.save_profile("event", {
+                "GameUserSettings.ini": {"ServerSettings": {"XPMultiplier": "3.0", "TamingSpeedMultiplier": "1.0"}},
+                "Game.ini": {"/script/shootergame.shootergamemode": {"ConfigOverrideItemCraftingCosts": ["(B)", "(C)"]}},
+            })
+            assert result["success"], result
+            assert manager.list_profiles()["profiles"] == ["event"]
+            
+            changes = manager.compile_profile("event")["changes"]
+            assert [(c["file"], c["key"]) for c in changes] == [
+                ("GameUserSettings.ini", "XPMultiplier"), ("Game.ini", "ConfigOverrideItemCraftingCosts")
+            ]
+            assert changes[0]["lines"] == [2] and changes[0]["before"] == ["1.0"]
+            preview = manager.preview_profile("event")
+            assert "- L2: XPMultiplier=1.0" in preview and "+ XPMultiplier=3.0" in preview
+            print("✅ Diff minimal et aperçu ligne par ligne")
+            
+            dry = manager.apply_profile("event", dry_run=True)
+            assert dry["success"] and len(dry["changes"]) == 2
+            with open(paths.GAME_USER_SETTINGS_INI, encoding='utf-8') as f:
+                assert "XPMultiplier=1.0" in f.read()
+            print("✅ Dry-run sans écriture")
+            
+            result = manager.apply_profile("event")
+            assert result["success"], result
+            with open(paths.GAME_USER_SETTINGS_INI, encoding='utf-8') as f:
+                assert f.read() == "[ServerSettings]\nXPMultiplier=3.0\nTamingSpeedMultiplier=1.0\nMaxPlayers=20\n"
+            with open(paths.GAME_INI, encoding='utf-8') as f:
+                assert f.read().count("ConfigOverrideItemCraftingCosts=") == 2
+            assert manager.compile_profile("event")["changes"] == []
+            print("✅ Profil appliqué, plus aucun changement ensuite")
+            
+            manager.save_profile("bad", {"GameUserSettings.ini": {"ServerSettings": {"MaxPlayers": "beaucoup"}}})
+            result = manager.apply_profile("bad")
+            assert not result["success"] and result["error"] == "Valeur invalide"
+            print("✅ Profil invalide refusé avant écriture")
+        finally:
+            paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.PROFILES_DIR, paths.REVISIONS_DIR = saved_paths
+    
+    print("\n✅ Profils de paramètres fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 15: Historique des révisions
+print("TEST 15: Révisions de la configuration")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config.settings import SettingsManager
+    
+    tracked = ('GAME_USER_SETTINGS_INI', 'GAME_INI', 'SETTINGS_CONF', 'MODS_LIST', 'CURRENT_MAP_FILE', 'REVISIONS_DIR')
+    saved_paths = {name: getattr(paths, name) for name in tracked}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            for name in tracked:
+                setattr(paths, name, os.path.join(tmp_dir, name.lower()))
+            with open(paths.GAME_USER_SETTINGS_INI, 'w', encoding='utf-8') as f:
+                f.write("[ServerSettings]\nXPMultiplier=1.0\n")
+            with open(paths.CURRENT_MAP_FILE, 'w') as f:
+                f.write("TheIsland\n")
+            
+            manager = SettingsManager()
+            first = manager.backup_settings("initial")
+            assert first["success"] and first["created"]
+            again = manager.backup_settings()
+            assert again["revision"] == first["revision"] and not again["created"]
+            print("✅ Révision identique non dupliquée")
+            
+            with open(paths.CURRENT_MAP_FILE, 'w') as f:
+                f.write("Ragnarok\n")
+            second = manager.backup_settings("map")
+            assert second["created"] and second["revision"] != first["revision"]
+            objects = [name for _, _, files in os.walk(os.path.join(paths.REVISIONS_DIR, 'objects')) for name in files]
+            assert len(objects) == 3  # GameUserSettings.ini stocké une seule fois
+            revisions = manager.list_backups()["revisions"]
+            assert [r["id"] for r in revisions] == [second["revision"], first["revision"]]
+            print("✅ Contenus dédupliqués entre révisions")
+            
+            result = manager.restore_backup(first["revision"], ["current_map"])
+            assert result["success"], result
+            with open(paths.CURRENT_MAP_FILE) as f:
+                assert f.read() == "TheIsland\n"
+            assert not manager.restore_backup("inconnue")["success"]
+            print("✅ Restauration d'une révision")
+        finally:
+            for name, value in saved_paths.items():
+                setattr(paths, name, value)
+    
+    print("\n✅ Révisions fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 16: Instantané de configuration
+print("TEST 16: ConfigSnapshot (chargement unique)")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config.snapshot import ConfigSnapshot, config_operation, load_snapshot
+    from modules.config.maps import MapsManager
+    from modules.config.mods import ModsManager
+    from modules.config.settings import SettingsManager
+    
+    tracked = ('GAME_USER_SETTINGS_INI', 'GAME_INI', 'SETTINGS_CONF', 'MODS_LIST', 'CURRENT_MAP_FILE')
+    saved_paths = {name: getattr(paths, name) for name in tracked}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            for name in tracked:
+                setattr(paths, name, os.path.join(tmp_dir, name.lower()))
+            with open(paths.GAME_USER_SETTINGS_INI, 'w', encoding='utf-8') as f:
+                f.write("[SessionSettings]\nSessionName=Test\n")
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("731604991|Structures Plus\n")
+            with open(paths.CURRENT_MAP_FILE, 'w') as f:
+                f.write("Ragnarok\n")
+            with open(paths.SETTINGS_CONF, 'w') as f:
+                f.write('SESSION_NAME="Mon serveur"\n')
+            
+            snapshot = load_snapshot(parallel=True)
+            assert snapshot.map_name == "Ragnarok"
+            assert snapshot.mods == (("731604991", "Structures Plus", 1),)
+            assert snapshot.get_conf("SESSION_NAME") == "Mon serveur"
+            assert snapshot.missing == ("Game.ini",)
+            assert load_snapshot() is snapshot
+            assert {snapshot: "cache"}[load_snapshot()] == "cache"
+            try:
+                snapshot.map_name = "TheIsland"
+                assert False, "instantané modifiable"
+            except AttributeError:
+                pass
+            print("✅ Chargement unique, immuable et hashable")
+            
+            with config_operation() as pinned:
+                assert pinned is snapshot
+                # Les fichiers ne sont plus relus pendant l'opération
+                with open(paths.CURRENT_MAP_FILE, 'w') as f:
+                    f.write("TheIsland\n")
+                assert MapsManager().get_current_map()["map_name"] == "Ragnarok"
+                assert ModsManager().read_mods_list()["mods"][0]["name"] == "Structures Plus"
+                assert SettingsManager().get_setting("SessionSettings", "SessionName") == "Test"
+            assert MapsManager().get_current_map()["map_name"] == "TheIsland"
+            
+            changed = load_snapshot()
+            assert changed != snapshot and changed.digest != snapshot.digest
+            print("✅ Partagé par les managers pendant une opération, digest = clé de cache")
+        finally:
+            for name, value in saved_paths.items():
+                setattr(paths, name, value)
+    
+    print("\n✅ ConfigSnapshot fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 17: Registre des mods
+print("TEST 17: Registre des mods (lots, ordre, doublons)")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config.mods import ModsManager, load_mods_registry
+    
+    saved_mods_list = paths.MODS_LIST
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("# commentaire\n731604991|Structures Plus\n1404697612|Awesome Spyglass\n731604991|Structures Plus\n")
+            
+            manager = ModsManager()
+            assert manager.find_duplicates()["duplicates"] == {"731604991": [2, 4]}
+            assert [mod["id"] for mod in manager.read_mods_list()["mods"]] == ["731604991", "1404697612"]
+            assert "en double" in manager.format_mods_list()
+            print("✅ Doublons détectés avec leurs lignes")
+            
+            registry = load_mods_registry()
+            assert load_mods_registry() is registry
+            result = manager.add_mods([("111", "Mod A"), ("222", "Mod B"), ("731604991", "Structures Plus")])
+            assert result["added"] == ["111", "222"] and result["skipped"] == ["731604991"]
+            result = manager.remove_mods(["1404697612", "999"])
+            assert [mod["id"] for mod in result["removed"]] == ["1404697612"] and result["missing"] == ["999"]
+            assert manager.reorder_mods(["222", "111"])["success"]
+            with open(paths.MODS_LIST) as f:
+                assert f.read() == "222|Mod B\n111|Mod A\n731604991|Structures Plus\n"
+            assert load_mods_registry() is registry
+            assert manager.find_duplicates()["duplicates"] == {}
+            print("✅ Ajout/suppression/réordonnancement par lot, registre conservé en cache")
+            
+            assert not manager.add_mod("731604991", "Structures Plus")["success"]
+            assert not manager.add_mods([("333", "Mod C"), ("abc", "Invalide")])["success"]
+            assert "333" not in load_mods_registry()
+            assert manager.remove_mod("111")["success"]
+            print("✅ add_mod/remove_mod passent par le registre")
+            
+            os.unlink(paths.MODS_LIST)
+            result = manager.add_mod("444", "Mod D")
+            assert not result["success"] and "introuvable" in result["error"], result
+            assert not manager.add_mods([("444", "Mod D")])["success"]
+            assert not os.path.exists(paths.MODS_LIST)
+            print("✅ mods.list absent : erreur explicite, fichier non créé")
+        finally:
+            paths.MODS_LIST = saved_mods_list
+    
+    print("\n✅ Registre des mods fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 18: Vérification du workshop
+print("TEST 18: Mods installés (scandir + pool de threads)")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config.mods import ModsManager
+    
+    saved_paths = (paths.MODS_LIST, paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.WORKSHOP_DIR = os.path.join(tmp_dir, 'workshop')
+            paths.MODS_DIR = os.path.join(tmp_dir, 'Mods')
+            paths.MODS_FINGERPRINTS = os.path.join(tmp_dir, 'mods_fingerprints.json')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Complet\n222|Sans modmeta\n333|Corrompu\n444|Manquant\n")
+            
+            for mod_id, files in (("111", ("mod.info", "modmeta.info")), ("222", ("mod.info",)),
+                                  ("333", ()), ("555", ("mod.info",))):
+                content = os.path.join(paths.WORKSHOP_DIR, mod_id, "WindowsNoEditor")
+                os.makedirs(content)
+                for name in files:
+                    with open(os.path.join(content, name), 'wb') as f:
+                        f.write(b"data")
+            os.makedirs(paths.MODS_DIR)
+            for mod_id in ("111", "222"):
+                with open(os.path.join(paths.MODS_DIR, f"{mod_id}.mod"), 'wb') as f:
+                    f.write(b"data")
+            
+            result = ModsManager().check_installed_mods()
+            assert result["success"], result
+            assert [(mod["id"], mod["issues"]) for mod in result["installed"]] == [
+                ("111", []), ("222", ["modmeta.info manquant"])
+            ]
+            assert [mod["id"] for mod in result["corrupt"]] == ["333"]
+            assert "mod.info manquant" in result["corrupt"][0]["issues"]
+            assert [mod["id"] for mod in result["missing"]] == ["444"]
+            assert result["orphaned"] == ["555"]
+            print("✅ installed / missing / corrupt / orphaned en un appel")
+        finally:
+            paths.MODS_LIST, paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS = saved_paths
+    
+    print("\n✅ Vérification du workshop fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 19: Téléchargement workshop par lots
+print("TEST 19: Téléchargement workshop (SteamCMD factice)")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.updates import UpdateManager
+    
+    saved_paths = (paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_MANIFEST, paths.MODS_INSTALLED)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.STEAMCMD = os.path.join(tmp_dir, 'steamcmd.sh')
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.WORKSHOP_MANIFEST = os.path.join(tmp_dir, 'appworkshop_346110.acf')
+            paths.MODS_INSTALLED = os.path.join(tmp_dir, 'mods_installed.json')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Ok\n222|Echec puis ok\n333|Toujours en echec\n444|Bloque\n")
+            
+            # 222 échoue au premier essai, 333 échoue toujours, 444 ne répond jamais
+            with open(paths.STEAMCMD, 'w') as f:
+                f.write(f"""#!/bin/bash
+echo "$*" >> "{tmp_dir}/sessions.log"
+echo "Logging in user 'anonymous' to Steam Public...OK"
+while [[ $# -gt 0 ]]; do
+    if [[ "$1" == "+workshop_download_item" ]]; then
+        ID="$3"
+        shift 3
+        case "$ID" in
+            222) if [[ -f "{tmp_dir}/222.seen" ]]; then
+                     echo "Success. Downloaded item 222 to \\"{tmp_dir}/222\\" (42 bytes)"
+                 else
+                     touch "{tmp_dir}/222.seen"
+                     echo "ERROR! Download item 222 failed (Failure)."
+                 fi ;;
+            333) echo "ERROR! Download item 333 failed (File Not Found)." ;;
+            444) sleep 5 ;;
+            *) printf 'Downloading item %s ...\\rSuccess. Downloaded item %s to "{tmp_dir}/%s" (10 bytes)\\n' "$ID" "$ID" "$ID" ;;
+        esac
+    fi
+    shift
+done
+""")
+            os.chmod(paths.STEAMCMD, 0o755)
+            
+            result = UpdateManager().download_mods(sessions=2, item_timeout=1, retries=1)
+            assert not result["success"], result
+            assert result["downloaded"] == ["111", "222"], result["downloaded"]
+            assert result["results"]["111"]["attempts"] == 1
+            assert result["results"]["111"]["bytes"] == 10
+            assert result["results"]["222"]["attempts"] == 2
+            assert result["results"]["222"]["path"] == os.path.join(tmp_dir, "222")
+            failed = {mod["id"]: mod["message"] for mod in result["failed"]}
+            assert "File Not Found" in failed["333"], failed
+            assert failed["444"].startswith("Timeout"), failed
+            print("✅ Succès, échec, nouvelle tentative et timeout par mod")
+            
+            with open(os.path.join(tmp_dir, 'sessions.log')) as f:
+                sessions = f.read().splitlines()
+            # 2 sessions au premier passage, 2 pour les 3 mods à retenter
+            assert len(sessions) == 4, sessions
+            assert all(line.count("+login anonymous") == 1 for line in sessions)
+            assert sessions[0].count("+workshop_download_item") == 2
+            print("✅ Plusieurs mods par session, un seul login")
+        finally:
+            paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_MANIFEST, paths.MODS_INSTALLED = saved_paths
+    
+    print("\n✅ Téléchargement workshop fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 20: Mises à jour incrémentales des mods
+print("TEST 20: Manifeste workshop (VDF) et mises à jour incrémentales")
+print("-" * 60)
+try:
+    import json
+    import struct
+    import tempfile
+    from utils import vdf
+    from modules.updates import UpdateManager
+    
+    document = vdf.parse('''
+// commentaire
+"AppWorkshop"
+{
+    "appid"     "346110"
+    "Note"      "guillemet \\" et \\\\"
+    "Win"       "1"     [$WIN32]
+    "Empty"
+    {
+    }
+}
+''')
+    assert document == {"AppWorkshop": {"appid": "346110", "Note": 'guillemet " et \\', "Win": "1", "Empty": {}}}, document
+    try:
+        vdf.parse('"a" { "b" "c"')
+        assert False, "document incomplet accepté"
+    except ValueError:
+        pass
+    print("✅ Parser VDF (échappements, commentaires, conditions)")
+    
+    saved_paths = (paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_DIR, paths.WORKSHOP_MANIFEST,
+                   paths.MODS_INSTALLED, paths.MODS_DIR, paths.MODS_FINGERPRINTS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.STEAMCMD = os.path.join(tmp_dir, 'steamcmd.sh')
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.WORKSHOP_DIR = os.path.join(tmp_dir, 'workshop')
+            paths.WORKSHOP_MANIFEST = os.path.join(tmp_dir, 'appworkshop_346110.acf')
+            paths.MODS_INSTALLED = os.path.join(tmp_dir, 'mods_installed.json')
+            paths.MODS_DIR = os.path.join(tmp_dir, 'Mods')
+            paths.MODS_FINGERPRINTS = os.path.join(tmp_dir, 'mods_fingerprints.json')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|A jour\n222|Jamais enregistre\n333|Absent\n444|MAJ Steam\n555|Modifie\n")
+            for mod_id in ("111", "222", "444", "555"):
+                os.makedirs(os.path.join(paths.WORKSHOP_DIR, mod_id))
+            
+            items = {"111": ("10", "100", "m1"), "222": ("20", "200", "m2"),
+                     "444": ("40", "400", "m4"), "555": ("50", "500", "m5")}
+            with open(paths.WORKSHOP_MANIFEST, 'w') as f:
+                f.write('"AppWorkshop"\n{\n\t"appid"\t\t"346110"\n\t"WorkshopItemsInstalled"\n\t{\n')
+                for mod_id, (size, time_updated, manifest) in items.items():
+                    f.write(f'\t\t"{mod_id}"\n\t\t{{\n\t\t\t"size"\t\t"{size}"\n'
+                            f'\t\t\t"timeupdated"\t\t"{time_updated}"\n\t\t\t"manifest"\t\t"{manifest}"\n\t\t}}\n')
+                f.write('\t}\n\t"WorkshopItemDetails"\n\t{\n\t\t"444"\n\t\t{\n\t\t\t"manifest"\t\t"m4-new"\n\t\t}\n\t}\n}\n')
+            with open(paths.MODS_INSTALLED, 'w') as f:
+                json.dump({"111": {"manifest": "m1", "timeupdated": 100, "size": 10},
+                           "444": {"manifest": "m4", "timeupdated": 400, "size": 40},
+                           "555": {"manifest": "m5-old", "timeupdated": 499, "size": 50}}, f)
+            
+            manager = UpdateManager()
+            plan = manager.plan_mod_updates()
+            assert plan["up_to_date"] == ["111"], plan
+            assert [mod["id"] for mod in plan["scheduled"]] == ["222", "333", "444", "555"], plan
+            assert plan["scheduled"][1]["reason"] == "absent du manifeste workshop"
+            assert plan["scheduled"][2]["reason"] == "mise à jour signalée par Steam"
+            print("✅ Seuls les mods absents ou modifiés sont planifiés")
+            
+            with open(paths.STEAMCMD, 'w') as f:
+                f.write(f"""#!/bin/bash
+echo "$*" >> "{tmp_dir}/sessions.log"
+while [[ $# -gt 0 ]]; do
+    if [[ "$1" == "+workshop_download_item" ]]; then
+        echo "Success. Downloaded item $3 to \\"{tmp_dir}/$3\\" (1 bytes)"
+        shift 3
+    fi
+    shift
+done
+""")
+            os.chmod(paths.STEAMCMD, 0o755)
+            
+            # Seul 222 a un mod.info : les autres mods téléchargés ne s'extraient pas
+            mod_info_path = os.path.join(paths.WORKSHOP_DIR, "222", "mod.info")
+            with open(mod_info_path, 'wb') as f:
+                f.write(struct.pack('<i', 4) + b"Mod\0" + struct.pack('<i', 0))
+            
+            result = manager.update_mods()
+            assert result["success"] and "avertissements" in result["message"], result
+            assert "555: mod.info manquant" in result["error"], result
+            with open(os.path.join(tmp_dir, 'sessions.log')) as f:
+                requested = f.read().split()
+            assert "111" not in requested and "222" in requested and "333" in requested, requested
+            
+            # 222 est enregistré ; 555 (non extrait) garde son ancien enregistrement,
+            # 444 reste signalé par Steam, 333 absent du manifeste
+            plan = manager.plan_mod_updates()
+            assert plan["up_to_date"] == ["111", "222"], plan
+            assert [mod["id"] for mod in plan["scheduled"]] == ["333", "444", "555"], plan
+            assert plan["scheduled"][2]["reason"] == "modifié depuis la dernière installation"
+            print("✅ Installation enregistrée après extraction réussie, mods non extraits replanifiés")
+            
+            os.remove(mod_info_path)
+            with open(paths.MODS_INSTALLED) as f:
+                records = json.load(f)
+            result = manager.update_mods(force=True)
+            assert not result["success"], result
+            with open(paths.MODS_INSTALLED) as f:
+                assert json.load(f) == records
+            print("✅ Échec si aucune extraction ne réussit, rien n'est enregistré")
+        finally:
+            (paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_DIR, paths.WORKSHOP_MANIFEST,
+             paths.MODS_INSTALLED, paths.MODS_DIR, paths.MODS_FINGERPRINTS) = saved_paths
+    
+    print("\n✅ Mises à jour incrémentales fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 21: Extraction des mods (.z) et fichier .mod
+print("TEST 21: Extraction parallèle des archives .z")
+print("-" * 60)
+try:
+    import struct
+    import tempfile
+    from utils import zarchive
+    from utils.arkmod import build_mod_file, read_mod_info, read_modmeta
+    from modules.config.mods import ModsManager
+    
+    def ue4(value):
+        return struct.pack('<i', len(value) + 1) + value.encode() + b'\0'
+    
+    mod_info = ue4("Mon Mod") + struct.pack('<i', 2) + ue4("MaCarte") + ue4("")
+    modmeta = struct.pack('<i', 1) + ue4("ModType") + ue4("2")
+    assert read_mod_info(mod_info) == ("Mon Mod", ["MaCarte"])
+    assert read_modmeta(modmeta) == {"ModType": "2"}
+    
+    mod_file = build_mod_file("999", "Mon Mod", ["MaCarte"], {"ModType": "2"})
+    assert mod_file.startswith(struct.pack('<Q', 999) + ue4("Mon Mod") + ue4("../../../ShooterGame/Content/Mods/999")
+                               + struct.pack('<i', 1) + ue4("MaCarte"))
+    assert mod_file.endswith(struct.pack('<IiB', 4280483635, 2, 1) + struct.pack('<i', 1) + ue4("ModType") + ue4("2"))
+    print("✅ mod.info / modmeta.info / .mod")
+    
+    saved_paths = (paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.WORKSHOP_DIR = os.path.join(tmp_dir, 'workshop')
+            paths.MODS_DIR = os.path.join(tmp_dir, 'Mods')
+            paths.MODS_FINGERPRINTS = os.path.join(tmp_dir, 'mods_fingerprints.json')
+            content = os.path.join(paths.WORKSHOP_DIR, '999', 'WindowsNoEditor')
+            os.makedirs(os.path.join(content, 'Maps'))
+            
+            data = os.urandom(1000) * 700 + b"fin"
+            files = {
+                'mod.info': mod_info,
+                'modmeta.info': modmeta,
+                'Maps/MaCarte.umap.z': zarchive.pack(data, chunk_size=65536),
+                'Maps/MaCarte.umap.z.uncompressed_size': str(len(data)).encode(),
+                'Maps/Vide.uasset.z': zarchive.pack(b""),
+                'readme.txt': b"texte",
+            }
+            for name, value in files.items():
+                with open(os.path.join(content, name), 'wb') as f:
+                    f.write(value)
+            os.makedirs(os.path.join(paths.MODS_DIR, '999'))
+            with open(os.path.join(paths.MODS_DIR, '999', 'obsolete.uasset'), 'wb') as f:
+                f.write(b"ancien")
+            
+            manager = ModsManager()
+            result = manager.install_mods(["999"], max_workers=4)
+            assert result["success"], result
+            stats = result["installed"][0]
+            assert (stats["extracted"], stats["copied"], stats["skipped"], stats["removed"]) == (2, 3, 0, 1), stats
+            with open(os.path.join(paths.MODS_DIR, '999', 'Maps', 'MaCarte.umap'), 'rb') as f:
+                assert f.read() == data
+            assert os.path.getsize(os.path.join(paths.MODS_DIR, '999', 'Maps', 'Vide.uasset')) == 0
+            assert not os.path.exists(os.path.join(paths.MODS_DIR, '999', 'obsolete.uasset'))
+            with open(os.path.join(paths.MODS_DIR, '999.mod'), 'rb') as f:
+                assert f.read() == mod_file
+            print("✅ Archives décompressées, fichiers copiés, .mod généré")
+            
+            result = manager.install_mods(["999"])
+            stats = result["installed"][0]
+            assert (stats["extracted"], stats["copied"], stats["skipped"]) == (0, 0, 5), stats
+            print("✅ Fichiers déjà à jour ignorés (taille + date)")
+            
+            with open(os.path.join(content, 'Maps', 'MaCarte.umap.z'), 'r+b') as f:
+                f.seek(-10, os.SEEK_END)
+                f.write(b"\xff" * 10)
+            result = manager.install_mods(["999", "123"])
+            assert not result["success"]
+            assert [mod["id"] for mod in result["failed"]] == ["999", "123"], result
+            with open(os.path.join(paths.MODS_DIR, '999', 'Maps', 'MaCarte.umap'), 'rb') as f:
+                assert f.read() == data
+            assert not [name for name in os.listdir(os.path.join(paths.MODS_DIR, '999', 'Maps')) if name.endswith('.tmp')]
+            print("✅ Archive corrompue : cible conservée, aucun fichier temporaire")
+        finally:
+            paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS = saved_paths
+    
+    print("\n✅ Extraction des mods fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 22: Empreintes des mods
+print("TEST 22: Empreintes Merkle et cache de validation des mods")
+print("-" * 60)
+try:
+    import struct
+    import tempfile
+    from utils.fingerprint import FingerprintCache, load_fingerprint_cache
+    from modules.config.mods import ModsManager
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        root = os.path.join(tmp_dir, 'arbre')
+        os.makedirs(os.path.join(root, 'a', 'b'))
+        for name in ('x.bin', 'a/y.bin', 'a/b/z.bin'):
+            with open(os.path.join(root, name), 'wb') as f:
+                f.write(b"data")
+        
+        cache_path = os.path.join(tmp_dir, 'fingerprints.json')
+        cache = FingerprintCache(cache_path)
+        first = cache.fingerprint("arbre", root)
+        assert cache.save()
+        
+        cache = FingerprintCache.from_file(cache_path)
+        scanned = []
+        scan_dir = cache._scan_dir
+        cache._scan_dir = lambda path, cached, content: scanned.append(path) or scan_dir(path, cached, content)
+        assert cache.fingerprint("arbre", root) == first
+        assert scanned == [] and not cache.save()
+        print("✅ Arborescence inchangée : aucun dossier relu, cache non réécrit")
+        
+        with open(os.path.join(root, 'a', 'b', 'nouveau.bin'), 'wb') as f:
+            f.write(b"+")
+        second = cache.fingerprint("arbre", root)
+        assert second != first
+        assert scanned == [os.path.join(root, 'a', 'b')], scanned
+        print("✅ Seul le sous-dossier modifié est relu")
+        
+        with open(os.path.join(root, 'x.bin'), 'r+b') as f:
+            f.write(b"DATA")
+        st = os.stat(os.path.join(root, 'x.bin'))
+        with_content = cache.fingerprint("contenu", root, content=True)
+        os.utime(root, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        with open(os.path.join(root, 'x.bin'), 'r+b') as f:
+            f.write(b"data")
+        os.utime(os.path.join(root, 'x.bin'), ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert cache.fingerprint("contenu", root, content=True) == with_content
+        os.unlink(os.path.join(root, 'x.bin'))
+        with open(os.path.join(root, 'x.bin'), 'wb') as f:
+            f.write(b"DATA")
+        os.utime(os.path.join(root, 'x.bin'), ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert cache.fingerprint("contenu", root, content=True) == with_content
+        print("✅ Mode contenu : hash réutilisé si taille et date inchangées")
+    
+    saved_paths = (paths.MODS_LIST, paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.WORKSHOP_DIR = os.path.join(tmp_dir, 'workshop')
+            paths.MODS_DIR = os.path.join(tmp_dir, 'Mods')
+            paths.MODS_FINGERPRINTS = os.path.join(tmp_dir, 'mods_fingerprints.json')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Mod\n")
+            content = os.path.join(paths.WORKSHOP_DIR, '111', 'WindowsNoEditor')
+            os.makedirs(content)
+            with open(os.path.join(content, 'mod.info'), 'wb') as f:
+                f.write(struct.pack('<i', 4) + b"Mod\0" + struct.pack('<i', 0))
+            with open(os.path.join(content, 'modmeta.info'), 'wb') as f:
+                f.write(struct.pack('<i', 0))
+            
+            manager = ModsManager()
+            assert manager.install_mods(["111"])["success"]
+            
+            result = manager.check_installed_mods()
+            assert [(mod["id"], mod["cached"], mod["issues"]) for mod in result["installed"]] == [("111", False, [])]
+            result = manager.check_installed_mods()
+            assert [(mod["id"], mod["cached"]) for mod in result["installed"]] == [("111", True)], result
+            print("✅ Validation reprise du cache au second passage")
+            
+            with open(os.path.join(content, 'nouveau.uasset'), 'wb') as f:
+                f.write(b"maj")
+            result = manager.check_installed_mods()
+            mod = result["installed"][0]
+            assert not mod["cached"] and mod["issues"] == ["modifié dans le workshop depuis l'extraction"], mod
+            assert load_fingerprint_cache(paths.MODS_FINGERPRINTS).get_data("111")["validated"]
+            for _ in range(2):
+                mod = manager.check_installed_mods()["installed"][0]
+                assert mod["cached"] and mod["issues"] == ["modifié dans le workshop depuis l'extraction"], mod
+            assert load_fingerprint_cache(paths.MODS_FINGERPRINTS).get_data("111")["issues"] == []
+            print("✅ Modification du workshop depuis l'extraction détectée (signalée une seule fois)")
+            
+            assert manager.install_mods(["111"])["success"]
+            mod = manager.check_installed_mods()["installed"][0]
+            assert mod["issues"] == [], mod
+            print("✅ Avertissement levé après une nouvelle extraction")
+        finally:
+            paths.MODS_LIST, paths.WORKSHOP_DIR, paths.MODS_DIR, paths.MODS_FINGERPRINTS = saved_paths
+    
+    print("\n✅ Empreintes des mods fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 23: Index des cartes
+print("TEST 23: Index des cartes (scandir + mtime des dossiers)")
+print("-" * 60)
+try:
+    import subprocess
+    import tempfile
+    from modules.config import map_index
+    
+    saved_paths = (paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE)
+    saved_scan = map_index._scan
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.CONTENT_DIR = os.path.join(tmp_dir, 'Content')
+            paths.MODS_DIR = os.path.join(paths.CONTENT_DIR, 'Mods')
+            paths.MAP_INDEX_FILE = os.path.join(tmp_dir, 'map_index')
+            for directory in ('Maps/TheIsland', 'Maps/ScorchedEarthSubMaps', 'Ragnarok', 'Mods/Valguero'):
+                os.makedirs(os.path.join(paths.CONTENT_DIR, directory))
+            
+            scans = []
+            map_index._scan = lambda directory: scans.append(directory) or saved_scan(directory)
+            
+            maps_mgr = MapsManager()
+            assert maps_mgr.get_all_map_names() == ["TheIsland", "Ragnarok", "ScorchedEarth", "Valguero"]
+            assert maps_mgr.is_valid_map("ScorchedEarthSubMaps") and not maps_mgr.is_valid_map("Aberration")
+            maps_mgr.format_maps_list()
+            assert len(scans) == 3, scans
+            print("✅ Un seul scan des 3 dossiers pour liste + validation + affichage")
+            
+            os.makedirs(os.path.join(paths.CONTENT_DIR, 'Maps', 'Aberration'))
+            assert maps_mgr.is_valid_map("Aberration")
+            assert len(scans) == 6, scans
+            print("✅ Index reconstruit quand un dossier change")
+            
+            with open(paths.MAP_INDEX_FILE) as f:
+                lines = f.read().splitlines()
+            assert "maps\tAberration" in lines and "submaps\tScorchedEarth" in lines and "mods\tValguero" in lines
+            with open(os.path.join(os.path.dirname(__file__), 'ark-core.sh')) as f:
+                awk = [line.split("awk ", 1)[1].split(' "$MAP_INDEX"')[0] for line in f if 'awk -F' in line][0]
+            for map_name, expected in (("ScorchedEarth", 0), ("Aberration", 0), ("Valguero", 1)):
+                rc = subprocess.run(["bash", "-c", f'MAP_NAME={map_name}; awk {awk} "$1"', "_", paths.MAP_INDEX_FILE]).returncode
+                assert (rc != 0) == bool(expected), (map_name, rc)
+            print("✅ Fichier map_index lisible par ark-core.sh")
+        finally:
+            map_index._scan = saved_scan
+            paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE = saved_paths
+    
+    print("\n✅ Index des cartes fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 24: Cartes fournies par les mods
+print("TEST 24: Index persistant des cartes de mods (.umap)")
+print("-" * 60)
+try:
+    import struct
+    import tempfile
+    from modules.config import map_index
+    
+    saved_paths = (paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE, paths.MOD_MAPS_INDEX)
+    saved_scandir = os.scandir
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.CONTENT_DIR = os.path.join(tmp_dir, 'Content')
+            paths.MODS_DIR = os.path.join(paths.CONTENT_DIR, 'Mods')
+            paths.MAP_INDEX_FILE = os.path.join(tmp_dir, 'map_index')
+            paths.MOD_MAPS_INDEX = os.path.join(tmp_dir, 'mod_maps.json')
+            
+            files = {
+                '111/Maps/Valguero/Valguero_P.umap': 3 * 1024 * 1024,
+                '111/Maps/Valguero/Sub/Valguero_Rivers.umap': 10,
+                '111/Textures/rock.uasset': 10,
+                '222/Maps/CustomMap.umap': 20,
+            }
+            for name, size in files.items():
+                os.makedirs(os.path.dirname(os.path.join(paths.MODS_DIR, name)), exist_ok=True)
+                with open(os.path.join(paths.MODS_DIR, name), 'wb') as f:
+                    f.truncate(size)
+            with open(os.path.join(paths.MODS_DIR, '222', 'mod.info'), 'wb') as f:
+                f.write(struct.pack('<i', 4) + b"Mod\0" + struct.pack('<i', 1) + struct.pack('<i', 10) + b"CustomMap\0")
+            
+            maps_mgr = MapsManager()
+            assert not maps_mgr.is_valid_map("Valguero_P")
+            thread = map_index.refresh_mod_maps()
+            thread.join()
+            
+            mod_maps = map_index.load_mod_maps_index().maps()
+            assert [(m.name, m.mod_id, m.size) for m in mod_maps] == [
+                ("CustomMap", "222", 20), ("Valguero_P", "111", 3 * 1024 * 1024)
+            ], mod_maps
+            assert mod_maps[1].path == "111/Maps/Valguero/Valguero_P.umap"
+            assert maps_mgr.is_valid_map("Valguero_P") and not maps_mgr.is_valid_map("Valguero_Rivers")
+            assert maps_mgr.get_all_map_names() == ["CustomMap", "Valguero_P"]
+            assert "🧩 CARTES DE MODS" in maps_mgr.format_maps_list()
+            with open(paths.MAP_INDEX_FILE) as f:
+                assert "modmap\tValguero_P" in f.read().splitlines()
+            print("✅ Niveaux persistants indexés en arrière-plan (_P et mod.info)")
+            
+            reloaded = map_index.ModMapsIndex.from_file(paths.MOD_MAPS_INDEX)
+            assert reloaded.maps() == mod_maps
+            print("✅ Index sauvegardé sur disque")
+            
+            scanned = []
+            os.scandir = lambda path='.': scanned.append(path) or saved_scandir(path)
+            index = map_index.load_mod_maps_index()
+            assert not index.refresh()
+            assert scanned == [paths.MODS_DIR], scanned
+            
+            with open(os.path.join(paths.MODS_DIR, '111', 'Maps', 'Valguero', 'Sub', 'Extra_P.umap'), 'wb') as f:
+                f.write(b"x")
+            scanned.clear()
+            assert index.refresh()
+            assert scanned == [paths.MODS_DIR, os.path.join(paths.MODS_DIR, '111', 'Maps', 'Valguero', 'Sub')], scanned
+            assert "Extra_P" in index.names()
+            print("✅ Mise à jour incrémentale : seul le dossier modifié est relu")
+        finally:
+            os.scandir = saved_scandir
+            paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE, paths.MOD_MAPS_INDEX = saved_paths
+    
+    print("\n✅ Cartes de mods fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+
+# Test 25: Préchargement de la carte et des mods
+print("TEST 25: Préchargement dans le cache de pages")
+print("-" * 60)
+try:
+    import tempfile
+    from utils import prewarm as prewarm_mod
+    
+    saved_paths = (paths.CONTENT_DIR, paths.MODS_DIR, paths.MODS_LIST, paths.MOD_MAPS_INDEX,
+                   paths.MAP_INDEX_FILE, paths.CURRENT_MAP_FILE)
+    saved_resident = prewarm_mod.resident_bytes
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.CONTENT_DIR = os.path.join(tmp_dir, 'Content')
+            paths.MODS_DIR = os.path.join(paths.CONTENT_DIR, 'Mods')
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.MOD_MAPS_INDEX = os.path.join(tmp_dir, 'mod_maps.json')
+            paths.MAP_INDEX_FILE = os.path.join(tmp_dir, 'map_index')
+            paths.CURRENT_MAP_FILE = os.path.join(tmp_dir, 'current_map')
+            
+            files = {
+                'Maps/TheIsland/TheIsland.umap': 8192,
+                'Maps/TheIsland/Notes.txt': 100,
+                'Maps/TheIslandSubMaps/Sub.umap': 4096,
+                'Maps/Ragnarok/Ragnarok.umap': 4096,
+                'Mods/111/Dino.uasset': 4096,
+                'Mods/111/Dino.ubulk': 12288,
+                'Mods/222/Unused.uasset': 4096,
+            }
+            for name, size in files.items():
+                os.makedirs(os.path.dirname(os.path.join(paths.CONTENT_DIR, name)), exist_ok=True)
+                with open(os.path.join(paths.CONTENT_DIR, name), 'wb') as f:
+                    f.write(b"x" * size)
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Dinos\n")
+            
+            maps_mgr = MapsManager()
+            result = maps_mgr.prewarm_assets("TheIsland")
+            assert result["success"], result
+            report = result["report"]
+            assert report["files"] == 4 and report["bytes_total"] == 8192 + 4096 + 4096 + 12288, report
+            if report["bytes_resident"] is not None:
+                assert 0 <= report["bytes_resident"] <= report["bytes_total"]
+            print(f"✅ Carte + mods actifs: {report['files']} fichiers, "
+                  f"{report['bytes_resident']} octets déjà résidents (mincore)")
+            
+            with open(os.path.join(paths.CONTENT_DIR, 'Mods/111/Dino.ubulk'), 'rb') as f:
+                resident = prewarm_mod.resident_bytes(f.fileno(), 12288)
+            assert resident is None or 0 <= resident <= 12288
+            
+            # Rien en mémoire : le budget limite les fichiers demandés, dans l'ordre de priorité
+            prewarm_mod.resident_bytes = lambda fd, size: 0
+            report = maps_mgr.prewarm_assets("TheIsland", budget_mb=0)["report"]
+            assert report["bytes_requested"] == 0 and report["skipped"] == 4, report
+            ordered = list(maps_mgr._asset_files("TheIsland"))
+            assert ordered[0].endswith("TheIsland.umap") and ordered[-1].endswith("Dino.ubulk"), ordered
+            report = prewarm_mod.prewarm(ordered, budget=16384)
+            assert report["bytes_requested"] == 16384 and report["skipped"] == 1, report
+            print("✅ Budget mémoire respecté (priorité à la carte)")
+            
+            assert maps_mgr.set_map("Ragnarok")["success"]
+            assert not maps_mgr.prewarm_assets("Inconnue", background=True)["report"]
+            print("✅ Préchargement en arrière-plan au changement de carte")
+        finally:
+            prewarm_mod.resident_bytes = saved_resident
+            (paths.CONTENT_DIR, paths.MODS_DIR, paths.MODS_LIST, paths.MOD_MAPS_INDEX,
+             paths.MAP_INDEX_FILE, paths.CURRENT_MAP_FILE) = saved_paths
+    
+    print("\n✅ Préchargement fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+
+# Test 26: Statistiques des sauvegardes par carte
+print("TEST 26: Statistiques des sauvegardes par carte")
+print("-" * 60)
+try:
+    import tempfile
+    
+    saved_paths = (paths.SAVED_DIR, paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE)
+    saved_scandir = os.scandir
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.SAVED_DIR = os.path.join(tmp_dir, 'Saved')
+            paths.CONTENT_DIR = os.path.join(tmp_dir, 'Content')
+            paths.MODS_DIR = os.path.join(paths.CONTENT_DIR, 'Mods')
+            paths.MAP_INDEX_FILE = os.path.join(tmp_dir, 'map_index')
+            saved_arks = os.path.join(paths.SAVED_DIR, 'SavedArks')
+            files = {
+                'SavedArks/TheIsland.ark': 2048,
+                'SavedArks/TheIsland_17.10.2026_12.00.00.ark': 1024,
+                'SavedArks/TheIsland_18.10.2026_12.00.00.ark': 1000,
+                'SavedArks/Ragnarok.ark': 512,
+                'Cluster/Valguero_P.ark': 4096,
+                'Cluster/1.arktribe': 1,
+                'Config/LinuxServer/Game.ark': 1,
+            }
+            for name, size in files.items():
+                os.makedirs(os.path.dirname(os.path.join(paths.SAVED_DIR, name)), exist_ok=True)
+                with open(os.path.join(paths.SAVED_DIR, name), 'wb') as f:
+                    f.truncate(size)
+            for player in range(500):
+                open(os.path.join(saved_arks, f"7656119{player:010d}.arkprofile"), 'wb').close()
+            open(os.path.join(saved_arks, '1234.arktribe'), 'wb').close()
+            os.utime(os.path.join(saved_arks, 'TheIsland.ark'), (1790000000, 1790000000))
+            
+            maps_mgr = MapsManager()
+            result = maps_mgr.get_save_stats()
+            assert result["success"], result
+            stats = {(s["name"], s["directory"]): s for s in result["stats"]}
+            assert list(stats) == [("Ragnarok", "SavedArks"), ("TheIsland", "SavedArks"), ("Valguero_P", "Cluster")], list(stats)
+            island = stats[("TheIsland", "SavedArks")]
+            assert (island["ark_size"], island["profiles"], island["tribes"]) == (2048, 500, 1), island
+            assert (island["backups"], island["backups_size"]) == (2, 2024), island
+            assert island["last_save"].timestamp() == 1790000000
+            assert stats[("Valguero_P", "Cluster")]["profiles"] == 0 and stats[("Valguero_P", "Cluster")]["tribes"] == 1
+            assert "💾 SAUVEGARDES" in maps_mgr.format_maps_list()
+            print("✅ Taille, profils, tribus et copies par carte (Config ignoré)")
+            
+            scanned = []
+            os.scandir = lambda path='.': scanned.append(path) or saved_scandir(path)
+            assert maps_mgr.get_save_stats()["stats"] == result["stats"]
+            assert scanned == [], scanned
+            print("✅ Aucun parcours tant que les dossiers sont inchangés")
+            
+            open(os.path.join(saved_arks, 'new.arkprofile'), 'wb').close()
+            os.utime(saved_arks, ns=(0, os.stat(saved_arks).st_mtime_ns + 1))
+            island = [s for s in maps_mgr.get_save_stats()["stats"] if s["name"] == "TheIsland"][0]
+            assert island["profiles"] == 501 and scanned == [saved_arks], scanned
+            print("✅ Seul le dossier modifié est relu")
+        finally:
+            os.scandir = saved_scandir
+            paths.SAVED_DIR, paths.CONTENT_DIR, paths.MODS_DIR, paths.MAP_INDEX_FILE = saved_paths
+    
+    print("\n✅ Statistiques des sauvegardes fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+
+# Test 27: Snapshots fast (rsync --link-dest)
+print("TEST 27: Taille des snapshots à liens physiques")
+print("-" * 60)
+try:
+    import tempfile
+    from datetime import datetime
+    from utils import snapshots as snapshots_mod
+    
+    saved_fast_dir = paths.BACKUP_FAST_DIR
+    saved_scan_snapshot = snapshots_mod.scan_snapshot
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.BACKUP_FAST_DIR = os.path.join(tmp_dir, 'fast')
+            
+            def make_snapshot(name, previous=None, changed=()):
+                """Copie rsync --link-dest simulée : fichiers inchangés liés au snapshot précédent"""
+                root = os.path.join(paths.BACKUP_FAST_DIR, name)
+                os.makedirs(os.path.join(root, 'SavedArks'))
+                for rel in ('SavedArks/TheIsland.ark', 'SavedArks/1.arkprofile', 'SavedArks/2.arkprofile'):
+                    if previous is None or rel in changed:
+                        with open(os.path.join(root, rel), 'wb') as f:
+                            f.write(os.urandom(8192 if rel.endswith('.ark') else 4096))
+                    else:
+                        os.link(os.path.join(paths.BACKUP_FAST_DIR, previous, rel), os.path.join(root, rel))
+                latest = os.path.join(paths.BACKUP_FAST_DIR, 'latest')
+                if os.path.islink(latest):
+                    os.unlink(latest)
+                os.symlink(name, latest)
+                return root
+            
+            def disk(path):
+                return os.stat(path).st_blocks * 512
+            
+            first = make_snapshot('20261018-1000')
+            second = make_snapshot('20261018-1005', '20261018-1000', {'SavedArks/TheIsland.ark'})
+            third = make_snapshot('20261018-1010', '20261018-1005', {'SavedArks/1.arkprofile'})
+            # rsync -a recopie le mtime de Saved : le plus récent a le mtime le plus ancien
+            for age, root in enumerate((third, second, first)):
+                os.utime(root, (1790000000 + age, 1790000000 + age))
+            
+            scanned = []
+            snapshots_mod.scan_snapshot = lambda path: scanned.append(path) or saved_scan_snapshot(path)
+            
+            backup_mgr = BackupManager()
+            info = backup_mgr.list_backups("fast")["backups"]["fast"]
+            assert info["error"] is None and info["count"] == 3, info
+            by_name = {f["name"]: f for f in info["files"]}
+            full = sum(disk(os.path.join(first, 'SavedArks', n)) for n in ('TheIsland.ark', '1.arkprofile', '2.arkprofile'))
+            assert all(f["snapshot"] and f["files"] == 3 and f["size"] == 16384 for f in info["files"])
+            assert by_name['20261018-1000']["incremental_size"] == full
+            assert by_name['20261018-1005']["incremental_size"] == disk(os.path.join(second, 'SavedArks', 'TheIsland.ark'))
+            assert by_name['20261018-1010']["incremental_size"] == disk(os.path.join(third, 'SavedArks', '1.arkprofile'))
+            assert info["total_size"] == sum(f["incremental_size"] for f in info["files"]) < info["apparent_size"] == 3 * 16384
+            assert [f["name"] for f in info["files"]] == ['20261018-1010', '20261018-1005', '20261018-1000']
+            assert by_name['20261018-1005']["mtime"] == datetime(2026, 10, 18, 10, 5), by_name['20261018-1005']
+            assert "Taille apparente" in backup_mgr.get_backups_summary()
+            assert "Nouveaux octets" in backup_mgr.get_detailed_list("fast")
+            print(f"✅ 3 snapshots: {info['apparent_size']} octets apparents, {info['total_size']} octets réels")
+            
+            scanned.clear()
+            assert backup_mgr.list_backups("fast")["backups"]["fast"] == info
+            assert scanned == [], scanned
+            print("✅ Snapshots terminés mémorisés (aucun reparcours)")
+            
+            # Snapshot en cours d'écriture (plus récent que "latest") : relu à chaque fois
+            os.makedirs(os.path.join(paths.BACKUP_FAST_DIR, '20261018-1015', 'SavedArks'))
+            backup_mgr.list_backups("fast")
+            backup_mgr.list_backups("fast")
+            in_progress = os.path.join(paths.BACKUP_FAST_DIR, '20261018-1015')
+            assert scanned == [in_progress, in_progress], scanned
+            
+            # Rotation : le plus ancien disparaît, ses fichiers restent comptés dans le suivant
+            import shutil
+            shutil.rmtree(first)
+            shutil.rmtree(in_progress)
+            scanned.clear()
+            info = backup_mgr.list_backups("fast")["backups"]["fast"]
+            assert scanned == [] and info["count"] == 2, scanned
+            oldest = [f for f in info["files"] if f["name"] == '20261018-1005'][0]
+            assert oldest["incremental_size"] == sum(disk(os.path.join(second, 'SavedArks', n))
+                                                     for n in ('TheIsland.ark', '1.arkprofile', '2.arkprofile'))
+            print("✅ Snapshot en cours relu, rotation prise en compte sans reparcours")
+        finally:
+            snapshots_mod.scan_snapshot = saved_scan_snapshot
+            paths.BACKUP_FAST_DIR = saved_fast_dir
+    
+    print("\n✅ Snapshots fast fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 28: Stockage des lignes par blocs de section
+print("TEST 28: Parser INI - Blocs par section et vues en lecture seule")
+print("-" * 60)
+try:
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'GameUserSettings.ini')
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write("[ServerSettings]\nXPMultiplier=2.0\n\n[SessionSettings]\nSessionName=Test\n")
+        
+        parser = ArkINIParser(ini_path)
+        parser.read()
+        
+        lines = parser.lines
+        lines.append("Injected=1\n")
+        lines[0] = "XPMultiplier=99\n"
+        sections = parser.sections
+        sections['ServerSettings'].clear()
+        sections['Fantome'] = [0]
+        assert parser.lines == ["[ServerSettings]\n", "XPMultiplier=2.0\n", "\n",
+                                "[SessionSettings]\n", "SessionName=Test\n"], parser.lines
+        assert parser.sections['ServerSettings'] and 'Fantome' not in parser.sections
+        assert parser.get_value('ServerSettings', 'XPMultiplier') == '2.0'
+        assert parser.get_value('ServerSettings', 'Injected') is None
+        print("✅ Modifier les copies lines/sections ne change pas le parser")
+        
+        for n in range(500):
+            parser.set_value('ServerSettings', f'Key{n}', str(n))
+        assert parser.get_value('ServerSettings', 'Key499') == '499'
+        assert parser.get_value('SessionSettings', 'SessionName') == 'Test'
+        flat = parser.lines
+        assert flat.index("[SessionSettings]\n") == flat.index("Key499=499\n") + 1
+        print("✅ 500 insertions dans une section sans décaler la suivante")
+        
+        parser.write()
+        reread = ArkINIParser(ini_path)
+        reread.read()
+        assert reread.lines == flat
+        print("✅ Relecture identique après écriture")
+    
+    print("\n✅ Blocs de section fonctionnent!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 29: Remplacement en bloc d'une clé répétée
+print("TEST 29: set_all_values (arrays ARK)")
+print("-" * 60)
+try:
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ini_path = os.path.join(tmp_dir, 'Game.ini')
+        section = '/script/shootergame.shootergamemode'
+        with open(ini_path, 'w', encoding='utf-8') as f:
+            f.write(f"[{section}]\n")
+            f.write("OverrideEngramEntries=(EngramIndex=0)\n")
+            f.write("MaxTamedDinos=5000\n")
+            f.write("OverrideEngramEntries=(EngramIndex=1)\n")
+            f.write("[ServerSettings]\nXPMultiplier=2.0\n")
+        
+        parser = ArkINIParser(ini_path)
+        parser.read()
+        
+        assert parser.set_all_values(section, 'OverrideEngramEntries', ['(A)', '(B)', '(C)'])
+        assert parser.get_all_values(section, 'OverrideEngramEntries') == ['(A)', '(B)', '(C)']
+        assert parser.get_value(section, 'MaxTamedDinos') == '5000'
+        assert parser.lines[1:5] == ['OverrideEngramEntries=(A)\n', 'OverrideEngramEntries=(B)\n',
+                                     'OverrideEngramEntries=(C)\n', 'MaxTamedDinos=5000\n']
+        print("✅ Valeurs remplacées à la place de la première occurrence")
+        
+        assert parser.set_all_values(section, 'OverrideNamedEngramEntries', ['(X)'])
+        assert parser.get_value(section, 'OverrideNamedEngramEntries') == '(X)'
+        assert parser.get_value('ServerSettings', 'XPMultiplier') == '2.0'
+        assert not parser.set_all_values('Inconnue', 'Key', ['1'])
+        print("✅ Clé absente ajoutée en fin de section, section inconnue refusée")
+        
+        assert parser.set_all_values(section, 'OverrideEngramEntries', [])
+        assert parser.get_all_values(section, 'OverrideEngramEntries') == []
+        
+        values = [f"(EngramIndex={n})" for n in range(5000)]
+        parser.set_all_values(section, 'OverrideEngramEntries', values)
+        parser.write()
+        reread = ArkINIParser(ini_path)
+        reread.read()
+        assert reread.get_all_values(section, 'OverrideEngramEntries') == values
+        assert reread.get_value(section, 'OverrideNamedEngramEntries') == '(X)'
+        print("✅ Liste vidée puis régénérée (5000 entrées) et relue à l'identique")
+    
+    print("\n✅ set_all_values fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 30: Validation des fichiers UTF-16 (BOM)
+print("TEST 30: Validation d'un GameUserSettings.ini UTF-16 avec BOM")
+print("-" * 60)
+try:
+    import contextlib
+    import io
+    import tempfile
+    import preflight
+    from modules.config.schema import validate_config
+    
+    saved_paths = (paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.SETTINGS_CONF)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.GAME_USER_SETTINGS_INI = os.path.join(os.path.dirname(__file__), 'GameUserSettings.ini')
+            paths.GAME_INI = os.path.join(tmp_dir, 'Game.ini')
+            paths.SETTINGS_CONF = os.path.join(tmp_dir, 'settings.conf')
+            
+            report = validate_config()
+            assert report["checked"] > 0, report
+            assert not any("illisible" in issue["message"] for issue in report["warnings"] + report["errors"]), report
+            print(f"✅ Fichier d'exemple (UTF-16 LE + BOM) validé: {report['checked']} entrée(s)")
+            
+            paths.GAME_USER_SETTINGS_INI = os.path.join(tmp_dir, 'GameUserSettings.ini')
+            with open(paths.GAME_USER_SETTINGS_INI, 'w', encoding='utf-16') as f:
+                f.write("[ServerSettings]\r\nXPMultiplier=abc\r\n")
+            with open(paths.SETTINGS_CONF, 'wb') as f:
+                f.write(b'\xef\xbb\xbfGAME_PORT="7777"\n')
+            report = validate_config()
+            assert any(issue["key"] == "XPMultiplier" and issue["line"] == 2 for issue in report["errors"]), report
+            assert report["checked"] == 2, report
+            print("✅ UTF-16 et UTF-8 avec BOM décodés (erreurs détectées à la bonne ligne)")
+            
+            # UTF-16 tronqué : signalé sans bloquer le démarrage
+            with open(paths.GAME_USER_SETTINGS_INI, 'wb') as f:
+                f.write(b'\xff\xfe[\x00S\x00]')
+            report = validate_config()
+            assert report["success"] and not report["errors"], report
+            assert any("illisible" in issue["message"] for issue in report["warnings"]), report
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert preflight.main([]) == 1
+            print("✅ Fichier illisible = avertissement (preflight exit 1)")
+        finally:
+            paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.SETTINGS_CONF = saved_paths
+    
+    print("\n✅ Validation UTF-16 fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 31: Profil appliqué en partie
+print("TEST 31: Retour arrière d'un profil appliqué en partie")
+print("-" * 60)
+try:
+    import tempfile
+    from modules.config import profiles as profiles_mod
+    
+    saved_paths = (paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.PROFILES_DIR, paths.REVISIONS_DIR)
+    saved_load_ini = profiles_mod.load_ini
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.GAME_USER_SETTINGS_INI = os.path.join(tmp_dir, 'GameUserSettings.ini')
+            paths.GAME_INI = os.path.join(tmp_dir, 'Game.ini')
+            paths.PROFILES_DIR = os.path.join(tmp_dir, 'profiles')
+            paths.REVISIONS_DIR = os.path.join(tmp_dir, 'revisions')
+            gus = "[ServerSettings]\nXPMultiplier=1.0\n"
+            with open(paths.GAME_USER_SETTINGS_INI, 'w', encoding='utf-8') as f:
+                f.write(gus)
+            with open(paths.GAME_INI, 'w', encoding='utf-8') as f:
+                f.write("[/script/shootergame.shootergamemode]\nConfigOverrideItemCraftingCosts=(A)\n")
+            
+            manager = profiles_mod.ProfilesManager()
+            manager.save_profile("event", {
+                "GameUserSettings.ini": {"ServerSettings": {"XPMultiplier": "3.0"}},
+                "Game.ini": {"/script/shootergame.shootergamemode": {"ConfigOverrideItemCraftingCosts": ["(B)"]}},
+            })
+            
+            def failing_load_ini(file_path):
+                if file_path == paths.GAME_INI:
+                    raise OSError("disque plein")
+                return saved_load_ini(file_path)
+            # Diff compilé (et mis en cache) avant la panne : seule l'écriture échoue
+            assert len(manager.compile_profile("event")["changes"]) == 2
+            profiles_mod.load_ini = failing_load_ini
+            
+            result = manager.apply_profile("event")
+            assert not result["success"] and result["error"] == "disque plein", result
+            assert "restaurés: GameUserSettings.ini" in result["message"], result
+            with open(paths.GAME_USER_SETTINGS_INI, encoding='utf-8') as f:
+                assert f.read() == gus
+            print("✅ GameUserSettings.ini restauré après l'échec de Game.ini")
+            
+            profiles_mod.load_ini = saved_load_ini
+            assert manager.apply_profile("event")["success"]
+            with open(paths.GAME_USER_SETTINGS_INI, encoding='utf-8') as f:
+                assert "XPMultiplier=3.0" in f.read()
+            print("✅ Profil réappliqué ensuite sans reste de l'échec")
+        finally:
+            profiles_mod.load_ini = saved_load_ini
+            paths.GAME_USER_SETTINGS_INI, paths.GAME_INI, paths.PROFILES_DIR, paths.REVISIONS_DIR = saved_paths
+    
+    print("\n✅ Retour arrière des profils fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
+print()
+
+# Test 32: Vérification des mods au démarrage (preflight.py --mods)
+print("TEST 32: Vérification des mods au démarrage (preflight --mods)")
+print("-" * 60)
+try:
+    import io
+    import json
+    import tempfile
+    from contextlib import redirect_stdout
+    import preflight
+    
+    def run_preflight(*args):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = preflight.main(list(args))
+        lines = output.getvalue().splitlines()
+        assert len(lines) == 1, lines
+        return code, json.loads(lines[0])
+    
+    saved_paths = (paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_DIR, paths.WORKSHOP_MANIFEST,
+                   paths.MODS_INSTALLED, paths.MODS_DIR, paths.MODS_FINGERPRINTS)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            paths.STEAMCMD = os.path.join(tmp_dir, 'steamcmd.sh')
+            paths.MODS_LIST = os.path.join(tmp_dir, 'mods.list')
+            paths.WORKSHOP_DIR = os.path.join(tmp_dir, 'workshop')
+            paths.WORKSHOP_MANIFEST = os.path.join(tmp_dir, 'appworkshop_346110.acf')
+            paths.MODS_INSTALLED = os.path.join(tmp_dir, 'mods_installed.json')
+            paths.MODS_DIR = os.path.join(tmp_dir, 'Mods')
+            paths.MODS_FINGERPRINTS = os.path.join(tmp_dir, 'mods_fingerprints.json')
+            os.makedirs(os.path.join(paths.WORKSHOP_DIR, "111"))
+            os.makedirs(paths.MODS_DIR)
+            for file_path in (os.path.join(paths.WORKSHOP_DIR, "111", "mod.info"),
+                              os.path.join(paths.WORKSHOP_DIR, "111", "modmeta.info"),
+                              os.path.join(paths.MODS_DIR, "111.mod")):
+                with open(file_path, 'wb') as f:
+                    f.write(b'\x01')
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Valide\n222|Absent\n")
+            
+            # 222 absent du workshop, SteamCMD introuvable : avertissement, démarrage autorisé
+            code, report = run_preflight("--mods")
+            assert code == 1, report
+            assert report["status"] == "warning" and report["missing"] == ["222"], report
+            assert report["installed"] == 1 and "steamcmd.sh" in report["update_error"], report
+            print("✅ Mod manquant non téléchargeable = avertissement (exit 1)")
+            
+            with open(paths.MODS_LIST, 'w') as f:
+                f.write("111|Valide\n")
+            code, report = run_preflight("--mods")
+            assert code == 0 and report["status"] == "ok", report
+            assert report["cached"] == 1, report
+            print("✅ Mods valides repris du cache d'empreintes (exit 0)")
+            
+            os.remove(paths.MODS_LIST)
+            code, report = run_preflight("--mods")
+            assert code == 2 and report["status"] == "error", report
+            assert preflight.main(["--inconnu"]) == 2
+            print("✅ mods.list illisible ou option inconnue = erreur (exit 2)")
+        finally:
+            (paths.STEAMCMD, paths.MODS_LIST, paths.WORKSHOP_DIR, paths.WORKSHOP_MANIFEST,
+             paths.MODS_INSTALLED, paths.MODS_DIR, paths.MODS_FINGERPRINTS) = saved_paths
+    
+    print("\n✅ Vérification des mods au démarrage fonctionne!")
+except Exception as e:
+    print(f"\n❌ Erreur: {e}")
+    import traceback
+    traceback.print_exc()
+
 print()
 print("=" * 60)
 print("  RÉSUMÉ DES TESTS")
@@ -168,6 +1928,33 @@ print("   • Parser INI")
 print("   • Logique de formatage")
 print("   • Validation des cartes")
 print("   • Lecture mods.list")
+print("   • Index du parser INI")
+print("   • Transactions INI")
+print("   • Cache de parsing")
+print("   • Parser INI lazy (mmap)")
+print("   • Tuples ARK")
+print("   • Lecture INI en flux")
+print("   • Écriture partielle et fusion INI")
+print("   • Schéma de configuration")
+print("   • Profils de paramètres")
+print("   • Révisions de la configuration")
+print("   • Instantané de configuration")
+print("   • Registre des mods")
+print("   • Vérification du workshop")
+print("   • Téléchargement workshop par lots")
+print("   • Mises à jour incrémentales des mods")
+print("   • Extraction des mods (.z)")
+print("   • Empreintes des mods")
+print("   • Index des cartes")
+print("   • Cartes de mods")
+print("   • Préchargement des cartes et mods")
+print("   • Statistiques des sauvegardes")
+print("   • Snapshots fast (liens physiques)")
+print("   • Blocs de section du parser INI")
+print("   • Remplacement en bloc des clés répétées")
+print("   • Validation des fichiers UTF-16")
+print("   • Retour arrière des profils")
+print("   • Vérification des mods au démarrage")
 print()
 print("⚠️  Tests impossibles sans VM:")
 print("   • Appels systemctl/pgrep")